@@ -1,16 +1,21 @@
 """FastAPI dependency injection."""
 
-from typing import Annotated
+from typing import Annotated, Callable, Optional, Type
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, status
+from pydantic import BaseModel
 
+from app.core.config import get_settings
 from app.core.supabase_auth import verify_supabase_token
 from app.schemas.group import GroupSchema
 from app.schemas.member import MemberSchema
+from app.schemas.photocard import PhotocardSchema
 from app.services.data_loader import (
     get_group_by_id_async,
     get_member_by_id_async,
+    get_photocard_by_id_async,
 )
+from app.services.fieldsets import FieldSet
 
 # Limit path param length to reduce abuse (e.g. very long strings in URLs)
 PATH_PARAM_MAX_LENGTH = 200
@@ -49,6 +54,38 @@ async def get_member_or_404(group_id: str, member_id: str) -> MemberSchema:
     return member
 
 
+async def get_photocard_or_404(photocard_id: str) -> PhotocardSchema:
+    """Dependency: resolve photocard by id or raise 404."""
+    _validate_path_param(photocard_id, "photocard_id")
+    photocard = await get_photocard_by_id_async(photocard_id)
+    if not photocard:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Photocard not found: {photocard_id}",
+        )
+    return photocard
+
+
+def sparse_fields(model: Type[BaseModel]) -> Callable[..., Optional[FieldSet]]:
+    """Dependency factory: the ``fields=`` query parameter parsed against model's JSON names (400 if unknown)."""
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            max_length=1000,
+            description="Comma-separated fields to return, e.g. id,imageUrl,memberName,version (default: all)",
+        ),
+    ) -> Optional[FieldSet]:
+        if fields is None:
+            return None
+        try:
+            return FieldSet.parse(model, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return dependency
+
+
 # Type aliases for use in route signatures
 GroupDep = Annotated[GroupSchema, Depends(get_group_or_404)]
 
@@ -89,3 +126,18 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     return user
+
+
+async def get_current_moderator(
+    user: Annotated[dict, Depends(get_current_user)],
+) -> dict:
+    """
+    Dependency: require an authenticated user listed in MODERATOR_EMAILS. Raises 403 otherwise.
+    """
+    email = (user.get("email") or "").strip().lower()
+    if not email or email not in get_settings().moderator_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Moderator access required",
+        )
+    return user
@@ -0,0 +1,36 @@
+"""Home page bootstrap API."""
+
+from fastapi import APIRouter, Query, Request, Response, status
+
+from app.schemas.bootstrap import BootstrapSchema
+from app.services.bootstrap import bootstrap_body
+from app.services.data_loader import catalog_version
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+# Clients may keep the body but must revalidate it (ETag) before reuse
+CACHE_CONTROL = "no-cache"
+
+
+def _etag(version: str, per_group: int) -> str:
+    return f'"{version}-{per_group}"'
+
+
+@router.get("", response_model=BootstrapSchema)
+async def bootstrap(
+    request: Request,
+    per_group: int = Query(12, ge=0, le=40, description="Photocards per group"),
+) -> Response:
+    """All groups with members, photocard counts and each group's first photocards (home page, one request).
+
+    Served from a cache per catalog version; the ETag changes with the catalog, so a matching
+    If-None-Match gets a 304."""
+    version = catalog_version()
+    if version is not None and _etag(version, per_group) in request.headers.get("if-none-match", ""):
+        headers = {"Cache-Control": CACHE_CONTROL, "ETag": _etag(version, per_group)}
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    version, body = await bootstrap_body(per_group)
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if version is not None:
+        headers["ETag"] = _etag(version, per_group)
+    return Response(body, media_type="application/json", headers=headers)
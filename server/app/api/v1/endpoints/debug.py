@@ -0,0 +1,74 @@
+"""Debug endpoints (mounted only when DEBUG=true)."""
+
+from fastapi import APIRouter
+
+from app.core.db import command_stats, connection_info
+from app.services.bootstrap import bootstrap_cache_stats
+from app.services.data_loader import search_cache_stats, single_flight_stats, submission_batch_stats
+from app.services.duplicates import duplicate_index_stats
+from app.services.image_meta import image_meta_stats
+from app.services.jobs import job_queue_stats
+from app.services.thumbnails import image_proxy_stats
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/search-cache")
+async def search_cache() -> dict:
+    """Search result cache size, hit rate and approximate memory footprint."""
+    return search_cache_stats()
+
+
+@router.get("/bootstrap")
+async def bootstrap() -> dict:
+    """Cached /bootstrap bodies for the current catalog version and hit rate."""
+    return bootstrap_cache_stats()
+
+
+@router.get("/single-flight")
+async def single_flight() -> dict:
+    """Coalesced MongoDB reads: total calls and how many joined an in-flight query."""
+    return single_flight_stats()
+
+
+@router.get("/image-cache")
+async def image_cache() -> dict:
+    """Image variant cache (this process): entries, bytes, hit rate, evictions and coalesced renders."""
+    return image_proxy_stats()
+
+
+@router.get("/image-meta")
+async def image_meta() -> dict:
+    """Image dimension/placeholder pipeline: workers, queue length, processed and failed counts."""
+    return image_meta_stats()
+
+
+@router.get("/duplicates")
+async def duplicates() -> dict:
+    """Near-duplicate index size and submission check counts (this process)."""
+    return duplicate_index_stats()
+
+
+@router.get("/jobs")
+async def jobs() -> dict:
+    """Background job queue (this process): workers, queued and running jobs, results by kind."""
+    return job_queue_stats()
+
+
+@router.get("/submission-batches")
+async def submission_batches() -> dict:
+    """Submission write coalescing (this process): inserts, batches, average and largest batch."""
+    return submission_batch_stats()
+
+
+@router.get("/mongodb")
+async def mongodb() -> dict:
+    """Connection pool, compression, catalog read preference and replica set members."""
+    return connection_info()
+
+
+@router.get("/mongodb/queries")
+async def mongodb_queries() -> list[dict]:
+    """Per query-shape MongoDB command stats (count, failures, docs, total/max and p50/p95/p99 ms, callers),
+    most total time first."""
+    return command_stats()
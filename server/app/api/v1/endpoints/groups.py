@@ -2,22 +2,31 @@
 
 from fastapi import APIRouter, Depends
 
-from app.api.deps import get_group_or_404
+from app.api.deps import get_group_or_404, sparse_fields
+from app.core.responses import ModelJSONResponse
 from app.schemas.group import GroupSchema
 from app.services.data_loader import get_groups_async
+from app.services.fieldsets import FieldSet
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
 
 @router.get("", response_model=list[GroupSchema])
-async def list_groups() -> list[GroupSchema]:
-    """List all groups with their members."""
-    return await get_groups_async()
+async def list_groups(
+    fields: FieldSet | None = Depends(sparse_fields(GroupSchema)),
+) -> ModelJSONResponse:
+    """List all groups with their members (only the given fields, e.g. id,name,members.name)."""
+    return ModelJSONResponse(
+        await get_groups_async(fields),
+        model=list[GroupSchema],
+        include={"__all__": fields.include()} if fields is not None else None,
+    )
 
 
 @router.get("/{group_id}", response_model=GroupSchema)
 async def get_group(
     group: GroupSchema = Depends(get_group_or_404),
-) -> GroupSchema:
+    fields: FieldSet | None = Depends(sparse_fields(GroupSchema)),
+) -> ModelJSONResponse:
     """Get a single group by id."""
-    return group
+    return ModelJSONResponse(group, model=GroupSchema, include=fields.include() if fields is not None else None)
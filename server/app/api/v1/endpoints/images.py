@@ -0,0 +1,70 @@
+"""Image proxy API: resized photocard images."""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from app.api.deps import get_photocard_or_404
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.core.metrics import RATE_LIMITED
+from app.core.rate_limit import client_ip, rate_limit_exceeded
+from app.schemas.photocard import PhotocardSchema
+from app.services.thumbnails import (
+    FORMATS,
+    ImageUnavailable,
+    cached_variant,
+    negotiate_format,
+    pick_width,
+    render_variant_to_cache,
+    variant_key,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+# Variants are keyed by origin URL, so a photocard whose image changes gets a new ETag
+CACHE_CONTROL = "public, max-age=604800, stale-while-revalidate=86400"
+
+
+@router.get(
+    "/{photocard_id}",
+    response_class=Response,
+    responses={200: {"content": {mime: {} for mime in FORMATS.values()}}, 502: {"description": "Origin image unavailable"}},
+)
+async def photocard_image(
+    request: Request,
+    photocard: PhotocardSchema = Depends(get_photocard_or_404),
+    w: int = Query(400, ge=1, le=4096, description="Wanted width (rounded up to a served width)"),
+    side: Literal["front", "back"] = Query("front"),
+    format: Optional[Literal["webp", "jpeg"]] = Query(None, description="Default: WebP if accepted, else JPEG"),
+) -> Response:
+    """Photocard image resized to one of IMAGE_WIDTHS, as WebP or JPEG."""
+    url = photocard.image_url if side == "front" else photocard.back_image_url
+    if not url:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No {side} image for {photocard.id}")
+    width = pick_width(w)
+    fmt = format or negotiate_format(request.headers.get("accept", ""))
+    etag = f'"{variant_key(url, width, fmt)[:32]}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag, "Vary": "Accept"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    data = await cached_variant(url, width, fmt)
+    if data is not None:
+        return Response(content=data, media_type=FORMATS[fmt], headers=headers)
+    # A miss fetches the origin and renders: limited separately from (cheap) cached requests
+    settings = get_settings()
+    if rate_limit_exceeded("image_renders", client_ip(request), settings.image_render_rate_limit_requests):
+        RATE_LIMITED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many image requests. Please try again later.",
+            headers={"Retry-After": str(settings.rate_limit_window_seconds)},
+        )
+    try:
+        data = await render_variant_to_cache(url, width, fmt)
+    except ImageUnavailable as e:
+        logger.info("Image for %s unavailable: %s", photocard.id, e)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Image unavailable")
+    return Response(content=data, media_type=FORMATS[fmt], headers=headers)
@@ -2,11 +2,13 @@
 
 from fastapi import APIRouter, Depends
 
-from app.api.deps import get_group_or_404, get_member_or_404
+from app.api.deps import get_group_or_404, get_member_or_404, sparse_fields
+from app.core.responses import ModelJSONResponse
 from app.schemas.group import GroupSchema
 from app.schemas.member import MemberSchema
 from app.schemas.photocard import PhotocardSchema
 from app.services.data_loader import get_photocards_by_member_async
+from app.services.fieldsets import FieldSet
 
 router = APIRouter(prefix="/groups/{group_id}/members", tags=["members"])
 
@@ -14,22 +16,27 @@ router = APIRouter(prefix="/groups/{group_id}/members", tags=["members"])
 @router.get("", response_model=list[MemberSchema])
 async def list_members(
     group: GroupSchema = Depends(get_group_or_404),
-) -> list[MemberSchema]:
+) -> ModelJSONResponse:
     """List all members of a group."""
-    return group.members
+    return ModelJSONResponse(group.members, model=list[MemberSchema])
 
 
 @router.get("/{member_id}", response_model=MemberSchema)
 async def get_member(
     member: MemberSchema = Depends(get_member_or_404),
-) -> MemberSchema:
+) -> ModelJSONResponse:
     """Get a single member by group id and member id."""
-    return member
+    return ModelJSONResponse(member, model=MemberSchema)
 
 
 @router.get("/{member_id}/photocards", response_model=list[PhotocardSchema])
 async def list_member_photocards(
     member: MemberSchema = Depends(get_member_or_404),
-) -> list[PhotocardSchema]:
-    """List photocards for a member."""
-    return await get_photocards_by_member_async(member.id)
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
+    """List photocards for a member (only the given fields, if any)."""
+    return ModelJSONResponse(
+        await get_photocards_by_member_async(member.id),
+        model=list[PhotocardSchema],
+        include={"__all__": fields.include()} if fields is not None else None,
+    )
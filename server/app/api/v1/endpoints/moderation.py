@@ -0,0 +1,56 @@
+"""Moderation API – review and accept/reject pending submissions in bulk."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.deps import get_current_moderator
+from app.core.db import is_connected
+from app.schemas.moderation import MAX_PENDING_LIST, ModerationRequestSchema, ModerationResultSchema
+from app.schemas.submission import ModeratorSubmissionSchema
+from app.services.data_loader import get_pending_submissions_async, moderate_submissions_async
+from app.services.image_meta import enqueue_image_meta
+
+router = APIRouter(prefix="/moderation", tags=["moderation"])
+
+
+@router.get("/submissions", response_model=list[ModeratorSubmissionSchema])
+async def list_pending_submissions(
+    limit: int = Query(50, ge=1, le=MAX_PENDING_LIST),
+    user: dict = Depends(get_current_moderator),
+) -> list[ModeratorSubmissionSchema]:
+    """Pending submissions, oldest first, with their near-duplicates. Requires moderator and MongoDB."""
+    if not is_connected():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Moderation requires MongoDB (MONGODB_URI not configured)",
+        )
+    return await get_pending_submissions_async(limit)
+
+
+@router.post("/submissions", response_model=ModerationResultSchema)
+async def moderate_submissions(
+    payload: ModerationRequestSchema,
+    user: dict = Depends(get_current_moderator),
+) -> ModerationResultSchema:
+    """Accept and/or reject pending submissions. Accepted ones become photocards. Requires moderator and MongoDB."""
+    if not is_connected():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Moderation requires MongoDB (MONGODB_URI not configured)",
+        )
+    if not payload.accept and not payload.reject:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide submission ids to accept and/or reject",
+        )
+    result = await moderate_submissions_async(
+        accept_ids=payload.accept,
+        reject_ids=payload.reject,
+        reviewer_email=user.get("email") or "",
+    )
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Failed to moderate submissions",
+        )
+    enqueue_image_meta(result["photocards"])
+    return ModerationResultSchema(**result)
@@ -1,30 +1,45 @@
 """Photocards API."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.api.deps import get_current_user, get_group_or_404
+from app.api.deps import get_current_user, get_group_or_404, sparse_fields
 from app.core.db import is_connected
+from app.core.responses import ModelJSONResponse
 from app.schemas.group import GroupSchema
 from app.schemas.photocard import (
+    MAX_IDS_PER_REQUEST,
+    MAX_STRING_LEN,
     GroupPhotocardsResponseSchema,
     PhotocardCreateSchema,
+    PhotocardIdsSchema,
     PhotocardSchema,
+    PhotocardsByIdsResponseSchema,
 )
 from app.schemas.submission import SubmissionSchema
 from app.services.data_loader import (
+    DuplicateSubmission,
     get_photocards_async,
     get_photocards_by_group_async,
     get_photocards_by_group_paginated_async,
+    get_photocards_by_ids_async,
     insert_submission_async,
 )
+from app.services.duplicates import enqueue_duplicate_check
+from app.services.fieldsets import FieldSet
 
 router = APIRouter(prefix="/photocards", tags=["photocards"])
 
 
 @router.get("", response_model=list[PhotocardSchema])
-async def list_photocards() -> list[PhotocardSchema]:
-    """List all photocards."""
-    return await get_photocards_async()
+async def list_photocards(
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
+    """List all photocards (only the given fields, if any)."""
+    return ModelJSONResponse(
+        await get_photocards_async(fields),
+        model=list[PhotocardSchema],
+        include={"__all__": fields.include()} if fields is not None else None,
+    )
 
 
 @router.get("/by-group/{group_id}", response_model=GroupPhotocardsResponseSchema)
@@ -32,45 +47,124 @@ async def list_photocards_by_group(
     group: GroupSchema = Depends(get_group_or_404),
     limit: int = Query(40, ge=1, le=100, description="Page size"),
     offset: int = Query(0, ge=0, description="Offset"),
-) -> GroupPhotocardsResponseSchema:
-    """List photocards for a group (paginated)."""
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
+    """List photocards for a group (paginated; fields selects photocard fields)."""
     result = await get_photocards_by_group_paginated_async(
         group.id, limit=limit, offset=offset
     )
-    return GroupPhotocardsResponseSchema(
-        photocards=result["photocards"],
-        total_photocards=result["total_photocards"],
+    return ModelJSONResponse(
+        GroupPhotocardsResponseSchema.model_construct(
+            photocards=result["photocards"],
+            total_photocards=result["total_photocards"],
+        ),
+        model=GroupPhotocardsResponseSchema,
+        include=(
+            {"photocards": {"__all__": fields.include()}, "total_photocards": True}
+            if fields is not None
+            else None
+        ),
+    )
+
+
+async def _photocards_by_ids(ids: list[str], fields: FieldSet | None) -> ModelJSONResponse:
+    # Request order, each id once
+    wanted = list(dict.fromkeys(i.strip() for i in ids if i.strip()))
+    if not wanted or len(wanted) > MAX_IDS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must name 1-{MAX_IDS_PER_REQUEST} photocards",
+        )
+    if any(len(i) > MAX_STRING_LEN for i in wanted):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must be at most {MAX_STRING_LEN} characters",
+        )
+    found = await get_photocards_by_ids_async(wanted, fields)
+    return ModelJSONResponse(
+        PhotocardsByIdsResponseSchema.model_construct(
+            photocards=[found[i] for i in wanted if i in found],
+            missing=[i for i in wanted if i not in found],
+        ),
+        model=PhotocardsByIdsResponseSchema,
+        include=(
+            {"photocards": {"__all__": fields.include()}, "missing": True}
+            if fields is not None
+            else None
+        ),
     )
 
 
+@router.get("/by-ids", response_model=PhotocardsByIdsResponseSchema)
+async def get_photocards_by_ids(
+    ids: str = Query(
+        ...,
+        max_length=MAX_IDS_PER_REQUEST * (MAX_STRING_LEN + 1),
+        description=f"Comma-separated photocard ids (at most {MAX_IDS_PER_REQUEST})",
+    ),
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
+    """Photocards for a list of ids, in request order; ids that don't exist are listed in missing."""
+    return await _photocards_by_ids(ids.split(","), fields)
+
+
+@router.post("/by-ids", response_model=PhotocardsByIdsResponseSchema)
+async def post_photocards_by_ids(
+    payload: PhotocardIdsSchema,
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
+    """Same as GET /photocards/by-ids, with the ids in the body (for lists too long for a URL)."""
+    return await _photocards_by_ids(payload.ids, fields)
+
+
 @router.post("", response_model=SubmissionSchema, status_code=status.HTTP_201_CREATED)
 async def create_photocard(
     payload: PhotocardCreateSchema,
+    response: Response,
     user: dict = Depends(get_current_user),
 ) -> SubmissionSchema:
-    """Create a new submission (pending). Requires authentication and MongoDB."""
+    """Create a new submission (pending). Requires authentication and MongoDB.
+
+    Resubmitting the same card (same content key) returns the user's existing submission with 200;
+    a card that is already a photocard, or pending from another user, is a 409 naming it.
+    Returns right after the insert: near-duplicates of its image are looked up by a background job
+    and shown to moderators (GET /moderation/submissions), not to the submitter."""
     if not is_connected():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Photocard creation requires MongoDB (MONGODB_URI not configured)",
         )
     user_email = user.get("email") or ""
-    submission = await insert_submission_async(
-        member_name=payload.member_name,
-        group_name=payload.group_name,
-        album=payload.album,
-        version=payload.version,
-        year=payload.year,
-        type_=payload.type,
-        image_url=payload.image_url,
-        back_image_url=payload.back_image_url,
-        user_email=user_email,
-        photocard_id=None,
-        status="pending",
-    )
+    try:
+        submission = await insert_submission_async(
+            member_name=payload.member_name,
+            group_name=payload.group_name,
+            album=payload.album,
+            version=payload.version,
+            year=payload.year,
+            type_=payload.type,
+            image_url=payload.image_url,
+            back_image_url=payload.back_image_url,
+            user_email=user_email,
+            photocard_id=None,
+            status="pending",
+        )
+    except DuplicateSubmission as e:
+        if e.submission is not None and e.submission.user_email == user_email:
+            response.status_code = status.HTTP_200_OK
+            return e.submission
+        if e.photocard is not None:
+            detail = {
+                "message": "This photocard is already in the catalog",
+                "photocard": e.photocard.model_dump(mode="json", by_alias=True),
+            }
+        else:
+            detail = {"message": "This photocard has already been submitted", "submissionId": e.submission.id}
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
     if submission is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Failed to create submission",
         )
+    await enqueue_duplicate_check(submission)
     return submission
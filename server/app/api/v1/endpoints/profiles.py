@@ -0,0 +1,23 @@
+"""Saved request profiles (mounted when DEBUG=true or PROFILING_SAMPLE_RATE > 0)."""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import list_profiles, read_profile
+
+router = APIRouter(prefix="/debug/profiles", tags=["debug"])
+
+
+@router.get("")
+async def profiles() -> list[dict]:
+    """Saved profile reports, newest first."""
+    return list_profiles()
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def profile(profile_id: str) -> str:
+    """Text report for one profile (top functions or allocation sites)."""
+    text = read_profile(profile_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return text
@@ -2,22 +2,40 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.api.deps import sparse_fields
 from app.core.config import get_settings
-from app.schemas.search import SearchResultSchema
-from app.services.data_loader import search_catalog_async
+from app.core.responses import ModelJSONResponse
+from app.schemas.photocard import PhotocardSchema
+from app.schemas.search import SearchResultSchema, SuggestResultSchema
+from app.services.data_loader import search_catalog_async, suggest_catalog
+from app.services.fieldsets import FieldSet
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/search", tags=["search"])
 
 
-def _build_search_result(result: dict) -> SearchResultSchema:
-    return SearchResultSchema(
-        groups=result["groups"],
-        members=result["members"],
-        photocards=result["photocards"],
-        total_photocards=result["total_photocards"],
+def _search_response(result: dict, fields: FieldSet | None = None) -> ModelJSONResponse:
+    # The lists hold validated models already: construct without validating, serialize once.
+    # fields narrows the photocards; groups and members stay whole.
+    include = None
+    if fields is not None:
+        include = {
+            "groups": True,
+            "members": True,
+            "photocards": {"__all__": fields.include()},
+            "total_photocards": True,
+        }
+    return ModelJSONResponse(
+        SearchResultSchema.model_construct(
+            groups=result["groups"],
+            members=result["members"],
+            photocards=result["photocards"],
+            total_photocards=result["total_photocards"],
+        ),
+        model=SearchResultSchema,
+        include=include,
     )
 
 
@@ -35,11 +53,15 @@ async def search(
     ),
     pc_limit: int = Query(40, ge=1, le=100, description="Page size for photocards"),
     pc_offset: int = Query(0, ge=0, description="Offset for photocards"),
-) -> SearchResultSchema:
+    fuzzy: bool = Query(False, description="Also match names and albums with 1-2 typos"),
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
     """Search groups, members, and photocards by query string."""
     try:
-        result = await search_catalog_async(q, pc_limit=pc_limit, pc_offset=pc_offset)
-        return _build_search_result(result)
+        result = await search_catalog_async(
+            q, pc_limit=pc_limit, pc_offset=pc_offset, fuzzy=fuzzy
+        )
+        return _search_response(result, fields)
     except Exception as e:
         logger.exception("Search failed for q=%r: %s", q, e)
         settings = get_settings()
@@ -47,15 +69,30 @@ async def search(
         raise HTTPException(status_code=500, detail=detail)
 
 
+@router.get("/suggest", response_model=SuggestResultSchema)
+async def suggest(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=SEARCH_QUERY_MAX_LENGTH,
+        description="Prefix typed so far",
+    ),
+    limit: int = Query(8, ge=1, le=20, description="Maximum number of suggestions"),
+) -> ModelJSONResponse:
+    """Autocomplete group names, member names and albums for a prefix."""
+    return ModelJSONResponse(SuggestResultSchema(suggestions=suggest_catalog(q, limit)), model=SuggestResultSchema)
+
+
 @router.get("/all", response_model=SearchResultSchema)
 async def search_all(
     pc_limit: int = Query(40, ge=1, le=100, description="Page size for photocards"),
     pc_offset: int = Query(0, ge=0, description="Offset for photocards"),
-) -> SearchResultSchema:
+    fields: FieldSet | None = Depends(sparse_fields(PhotocardSchema)),
+) -> ModelJSONResponse:
     """Return all groups, members, and photocards (empty query)."""
     try:
         result = await search_catalog_async("", pc_limit=pc_limit, pc_offset=pc_offset)
-        return _build_search_result(result)
+        return _search_response(result, fields)
     except Exception as e:
         logger.exception("Search all failed: %s", e)
         settings = get_settings()
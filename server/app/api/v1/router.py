@@ -1,8 +1,22 @@
 """Aggregate API v1 routes."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import auth, health, groups, members, photocards, search, submissions
+from app.api.deps import get_current_moderator
+from app.api.v1.endpoints import (
+    auth,
+    bootstrap,
+    debug,
+    groups,
+    health,
+    images,
+    members,
+    moderation,
+    photocards,
+    profiles,
+    search,
+    submissions,
+)
 from app.core.config import get_settings
 
 api_router = APIRouter()
@@ -10,8 +24,20 @@ settings = get_settings()
 
 api_router.include_router(auth.router)
 api_router.include_router(health.router)
+api_router.include_router(bootstrap.router)
 api_router.include_router(groups.router)
 api_router.include_router(members.router)
 api_router.include_router(photocards.router)
+api_router.include_router(images.router)
 api_router.include_router(search.router)
 api_router.include_router(submissions.router)
+api_router.include_router(moderation.router)
+
+if settings.debug:
+    api_router.include_router(debug.router)
+if settings.profiling_enabled:
+    # Sampled profiles in production are only visible to moderators
+    api_router.include_router(
+        profiles.router,
+        dependencies=[] if settings.debug else [Depends(get_current_moderator)],
+    )
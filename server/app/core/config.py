@@ -36,6 +36,29 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # Rate limit per client IP (sliding window). 0 requests disables the limiter.
+    rate_limit_requests: int = 100
+    rate_limit_window_seconds: int = 60
+    # Image proxy, per client IP and window: all image requests (grids load dozens per page), and cache
+    # misses, which fetch the origin and render a variant. 0 disables either.
+    image_rate_limit_requests: int = 600
+    image_render_rate_limit_requests: int = 60
+
+    # Prometheus text metrics at /metrics (per process). They expose route latencies, query shapes and
+    # cache/job internals: when enabled, set METRICS_TOKEN so scrapers must send "Authorization: Bearer <token>".
+    metrics_enabled: bool = False
+    metrics_token: str = ""
+
+    # Per-request profiling (app/core/profiling.py). With DEBUG, requests opt in via X-Profile: cpu|mem
+    # or ?__profile=cpu|mem; in any mode a fraction of requests (0-1) can be cpu-profiled.
+    profiling_sample_rate: float = Field(default=0, ge=0, le=1)
+    profiling_dir: str = "profiles"
+    profiling_max_files: int = 200
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return self.debug or self.profiling_sample_rate > 0
+
     # API
     api_v1_prefix: str = "/api/v1"
     # Store as str so .env is never JSON-parsed; allowed_origins (list) is computed below
@@ -50,11 +73,100 @@ class Settings(BaseSettings):
     # Leave empty to use file/hardcoded data instead of MongoDB
     mongodb_uri: str = ""
     mongodb_database_name: str = "katalog"
+    # Connection pool per process (pre-fork workers each have their own). 0 = driver default.
+    mongodb_max_pool_size: int = 0
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: int = 0
+    # Wire compression, in preference order, e.g. "zlib" (stdlib) or "zstd,zlib" (zstd needs pymongo[zstd],
+    # not in requirements.txt). Empty = off.
+    mongodb_compressors: str = ""
+    # Catalog reads (groups, photocards, search read model) may go to secondaries; submissions stay
+    # on the primary. Max staleness must be >= 90 s per the driver; -1 = no bound.
+    mongodb_catalog_read_preference: str = "secondaryPreferred"
+    mongodb_catalog_max_staleness_seconds: int = 90
+    # Per query-shape command stats (GET /api/v1/debug/mongodb/queries with DEBUG) and slow-query log
+    mongodb_command_monitoring: bool = True
+    mongodb_slow_query_ms: float = 200
+
+    # Catalog source file (relative to server/). Empty: data/data.json, then the client's copy.
+    # Also seeds an empty MongoDB.
+    catalog_data_path: str = ""
+    # File mode: prebuilt binary catalog snapshot (relative to server/). Empty disables.
+    # Build with: python -m app.services.snapshot
+    catalog_snapshot_path: str = "data/catalog.snapshot"
+    # File mode: poll data.json every N seconds and hot-swap the catalog on change.
+    # MongoDB mode: rebuild the catalog read model from the database every N seconds, changed or not
+    # (catches in-place edits made directly in the database). 0 disables.
+    catalog_reload_interval_seconds: float = 0
+    # MongoDB mode: every N seconds, check a cheap change signal (counts, newest _id, API write revision)
+    # and rebuild the read model when it changed, e.g. after another worker's moderation. 0 disables.
+    catalog_change_poll_seconds: float = 5
+    # Searches whose full match lists are kept for paging (LRU, per catalog version). 0 disables.
+    search_cache_size: int = 256
+
+    # Image proxy (GET /api/v1/images/{photocard_id}?w=): resized WebP/JPEG variants of origin images
+    # Allowed widths; a request is served at the smallest one >= w (or the largest)
+    image_widths: str = "200,400,800"
+    # On-disk LRU of rendered variants (relative to server/), bounded per process
+    image_cache_dir: str = "cache/images"
+    image_cache_max_mb: int = 512
+    image_origin_timeout_seconds: float = 10
+    image_origin_max_bytes: int = 20_000_000
+    image_origin_max_connections: int = 20
+    # Origins are fetched only from public addresses. Optionally also only from these hosts (and their
+    # subdomains), comma-separated, e.g. "i.pinimg.com,cdn.discordapp.com". Empty = any public host.
+    image_origin_allowed_hosts: str = ""
+    # Local development only: allow loopback/private origins (e.g. python -m http.server)
+    image_origin_allow_private: bool = False
+    # Add thumbnailUrl (variant of this width) to photocard JSON. 0 = off.
+    image_thumbnail_width: int = 0
+    # Photocard width/height and an inline LQIP placeholder, computed from the front image in the
+    # background by this many workers per process. New photocards from moderation are queued. 0 disables.
+    image_meta_workers: int = 4
+    # Also queue every photocard still missing them at startup (enable on one process only, or run
+    # python -m app.services.image_meta instead)
+    image_meta_backfill: bool = False
+    # File mode: computed values keyed by image URL (relative to server/), merged into the catalog on load
+    image_meta_path: str = "data/image_meta.json"
+    # Photocards whose image could not be fetched or decoded are retried after this long
+    image_meta_retry_hours: float = 24
+    # Placeholder size (longest side, px)
+    image_placeholder_size: int = 16
+    # Near-duplicate check of new submissions: perceptual-hash Hamming distance (of 64 bits) at or
+    # below which another photocard/submission is flagged. 0 disables the check.
+    duplicate_max_distance: int = 6
+    # Write-behind batching of submission inserts: wait up to this many ms (or SUBMISSION_BATCH_MAX
+    # inserts) and write them with one group lookup and one insert_many. 0 = each insert writes alone.
+    submission_batch_ms: float = 0
+    submission_batch_max: int = 100
+    # Background jobs (submission post-processing): workers and queue bound per process, attempts
+    # before a job is marked failed. With MongoDB, jobs are stored in the jobs collection and polled
+    # every JOB_POLL_SECONDS (retries, overflow, leftovers). Shutdown waits JOB_DRAIN_TIMEOUT_SECONDS.
+    job_workers: int = 4
+    job_queue_size: int = 1000
+    job_max_attempts: int = 3
+    job_poll_seconds: float = 10
+    job_drain_timeout_seconds: float = 10
+
+    @property
+    def image_width_choices(self) -> List[int]:
+        return sorted({int(w) for w in self.image_widths.split(",") if w.strip()})
+
+    @property
+    def image_origin_allowed_host_list(self) -> List[str]:
+        return [h.strip().lower().rstrip(".") for h in self.image_origin_allowed_hosts.split(",") if h.strip()]
 
     # Optional: future auth (must be overridden in production)
     secret_key: str = INSECURE_SECRET_PLACEHOLDER
     access_token_expire_minutes: int = 30
 
+    # Comma-separated emails allowed to accept/reject submissions
+    moderator_emails_raw: str = Field(default="", alias="moderator_emails")
+
+    @property
+    def moderator_emails(self) -> set[str]:
+        return {x.strip().lower() for x in self.moderator_emails_raw.split(",") if x.strip()}
+
     # Supabase Auth – JWT verification
     # SUPABASE_URL: required for JWKS (new signing keys). Same as client VITE_SUPABASE_URL.
     supabase_url: str = ""
@@ -78,6 +190,16 @@ class Settings(BaseSettings):
             )
         return self
 
+    @model_validator(mode="after")
+    def check_catalog_max_staleness(self) -> "Settings":
+        """MongoDB rejects maxStalenessSeconds below 90 only when it selects a server; fail at startup instead."""
+        staleness = self.mongodb_catalog_max_staleness_seconds
+        if staleness != -1 and staleness < 90:
+            raise ValueError(
+                f"MONGODB_CATALOG_MAX_STALENESS_SECONDS must be -1 (no bound) or at least 90, not {staleness}"
+            )
+        return self
+
     @property
     def mongodb_configured(self) -> bool:
         """True if a MongoDB URI is set (and thus DB should be used)."""
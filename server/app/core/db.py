@@ -3,17 +3,61 @@ MongoDB connection (async via Motor).
 
 - Connection string is read from settings (.env); never logged or exposed.
 - Connect only when MONGODB_URI is set; otherwise the app uses file/hardcoded data.
+- Catalog reads use get_catalog_database() (secondary reads allowed); everything else uses
+  get_database() (primary).
 """
 
-from typing import Optional
+from typing import Optional, Union
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
 
 from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from app.core.mongo_monitor import CommandMonitor
 
 logger = get_logger(__name__)
 _client: Optional[AsyncIOMotorClient] = None
+_monitor: Optional[CommandMonitor] = None
+
+ReadPreference = Union[Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest]
+
+_READ_PREFERENCES = {
+    "primarypreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondarypreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def _client_options() -> dict:
+    """Pool and compression options from settings (unset ones keep driver defaults)."""
+    settings = get_settings()
+    options: dict = {}
+    if settings.mongodb_max_pool_size > 0:
+        options["maxPoolSize"] = settings.mongodb_max_pool_size
+    if settings.mongodb_min_pool_size > 0:
+        options["minPoolSize"] = settings.mongodb_min_pool_size
+    if settings.mongodb_max_idle_time_ms > 0:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_compressors.strip():
+        options["compressors"] = settings.mongodb_compressors.strip()
+    return options
+
+
+def catalog_read_preference() -> ReadPreference:
+    """Read preference for catalog queries (groups, photocards) from settings."""
+    settings = get_settings()
+    mode = _READ_PREFERENCES.get(settings.mongodb_catalog_read_preference.strip().lower())
+    if mode is None:
+        return Primary()
+    return mode(max_staleness=settings.mongodb_catalog_max_staleness_seconds)
 
 
 async def connect_mongodb() -> bool:
@@ -22,17 +66,26 @@ async def connect_mongodb() -> bool:
     Call on app startup only when MONGODB_URI is set.
     Returns True if connected successfully. On failure, logs the error and re-raises.
     """
-    global _client
+    global _client, _monitor
     settings = get_settings()
     if not settings.mongodb_configured:
         return False
+    if settings.mongodb_command_monitoring and _monitor is None:
+        _monitor = CommandMonitor(settings.mongodb_slow_query_ms)
     try:
         _client = AsyncIOMotorClient(
             settings.mongodb_uri,
             serverSelectionTimeoutMS=10000,
             connectTimeoutMS=10000,
+            event_listeners=[_monitor] if _monitor is not None else [],
+            **_client_options(),
         )
         await _client.admin.command("ping")
+        logger.info(
+            "MongoDB connected (options=%s, catalog reads=%s)",
+            _client_options() or "driver defaults",
+            catalog_read_preference().document,
+        )
         return True
     except Exception as e:
         _client = None
@@ -62,6 +115,43 @@ def get_database() -> Optional[AsyncIOMotorDatabase]:
     return _client[settings.mongodb_database_name]
 
 
+def get_catalog_database() -> Optional[AsyncIOMotorDatabase]:
+    """
+    Like get_database(), but reads use the catalog read preference (MONGODB_CATALOG_READ_PREFERENCE).
+    Use only for catalog data that may be slightly stale; never for submissions or read-after-write.
+    """
+    db = get_database()
+    if db is None:
+        return None
+    return db.with_options(read_preference=catalog_read_preference())
+
+
+def connection_info() -> dict:
+    """Pool, compression and topology details for the debug endpoint (no credentials)."""
+    if _client is None:
+        return {"connected": False}
+    opts = _client.options
+    topology = _client.topology_description
+    return {
+        "connected": True,
+        "topology_type": topology.topology_type_name,
+        "servers": [
+            {"address": f"{host}:{port}", "type": sd.server_type_name}
+            for (host, port), sd in topology.server_descriptions().items()
+        ],
+        "max_pool_size": opts.pool_options.max_pool_size,
+        "min_pool_size": opts.pool_options.min_pool_size,
+        "max_idle_time_seconds": opts.pool_options.max_idle_time_seconds,
+        "compressors": _client_options().get("compressors", ""),
+        "catalog_read_preference": catalog_read_preference().document,
+    }
+
+
+def command_stats() -> list[dict]:
+    """Per query-shape command stats (empty when MONGODB_COMMAND_MONITORING is off)."""
+    return _monitor.stats() if _monitor is not None else []
+
+
 def is_connected() -> bool:
     """True if MongoDB client is connected."""
     return _client is not None
@@ -71,3 +161,6 @@ def is_connected() -> bool:
 GROUPS_COLLECTION = "groups"
 PHOTOCARDS_COLLECTION = "photocards"
 SUBMISSIONS_COLLECTION = "submissions"
+JOBS_COLLECTION = "jobs"
+# {_id: "catalog", revision}: bumped on every catalog write made through the API (change signal)
+CATALOG_META_COLLECTION = "catalog_meta"
@@ -0,0 +1,223 @@
+"""
+In-process metrics registry with Prometheus text exposition (GET /metrics).
+
+Kept dependency-free and cheap: each observation is a dict update under a lock. Label values
+must come from bounded sets (route templates, function names, status codes), never from raw
+paths or ids. Metrics are per process; with the pre-fork launcher each worker reports its own.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, TypeVar
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        out = self._header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = f'le="{_fmt(bound)}"'
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return out
+
+
+class CallbackMetric(_Metric):
+    """Counter or gauge whose values are read at scrape time (e.g. from a cache's own stats)."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        kind: str,
+        collect: Callable[[], Dict[LabelValues, float]],
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self) -> List[str]:
+        items = sorted(self._collect().items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items
+        ]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # A failing callback must not break the whole scrape
+                continue
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "katalog_http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "katalog_http_requests_in_flight",
+    "HTTP requests currently being served.",
+))
+RATE_LIMITED = REGISTRY.register(Counter(
+    "katalog_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter.",
+))
+MONGODB_QUERY_SECONDS = REGISTRY.register(Histogram(
+    "katalog_mongodb_query_duration_seconds",
+    "MongoDB query time by data_loader function.",
+    ("function",),
+))
+JWT_VERIFY_SECONDS = REGISTRY.register(Histogram(
+    "katalog_jwt_verify_duration_seconds",
+    "Supabase JWT verification time by result (valid/invalid).",
+    ("result",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+))
+IMAGE_ORIGIN_FETCH_SECONDS = REGISTRY.register(Histogram(
+    "katalog_image_origin_fetch_seconds",
+    "Image proxy origin download time by result (ok/error).",
+    ("result",),
+))
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,194 @@
+"""
+MongoDB command monitoring: per query-shape stats and a slow-query log.
+
+A pymongo CommandListener (registered in connect_mongodb) times every command and groups it by
+shape: command, collection and filter with values replaced by "?" ({"id": "?"},
+{"id": {"$in": "?"}}). getMore commands count towards the find/aggregate that opened the cursor.
+Per shape it keeps counts, documents returned and a rolling window of durations for percentiles.
+Reply sizes are not measured: the driver only hands listeners the decoded reply, and re-encoding
+every reply on the driver thread costs more than the metric is worth. Commands slower than
+MONGODB_SLOW_QUERY_MS are logged with the data_loader function that issued them (set by
+data_loader's _mongo_timed; Motor copies the context into its threads).
+"""
+
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional
+
+from pymongo import monitoring
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# data_loader function currently talking to MongoDB
+current_caller: ContextVar[Optional[str]] = ContextVar("mongodb_caller", default=None)
+
+_IGNORED_COMMANDS = frozenset(
+    {"ping", "hello", "ismaster", "isMaster", "buildinfo", "buildInfo", "endSessions",
+     "saslStart", "saslContinue", "killCursors"}
+)
+_FILTER_KEYS = {"find": "filter", "count": "query", "delete": "deletes", "update": "updates"}
+_WINDOW = 1000
+_MAX_SHAPES = 500
+_MAX_OPEN_CURSORS = 10_000
+
+
+def _shape(value: Any, depth: int = 0) -> Any:
+    """Filter with values replaced by "?" (keys and operators kept)."""
+    if isinstance(value, dict) and depth < 6:
+        return {k: _shape(v, depth + 1) for k, v in sorted(value.items())}
+    if isinstance(value, list) and value and all(isinstance(v, dict) for v in value) and depth < 6:
+        # $and / $or branches keep their structure
+        return [_shape(v, depth + 1) for v in value]
+    return "?"
+
+
+def _command_shape(name: str, command: dict) -> str:
+    collection = command.get(name)
+    if name == "aggregate":
+        stages = [next(iter(stage), "?") for stage in command.get("pipeline", [])]
+        detail: Any = stages
+    elif name in ("update", "delete"):
+        ops = command.get(_FILTER_KEYS[name]) or [{}]
+        detail = _shape(ops[0].get("q", {}))
+    elif name == "insert":
+        detail = None
+    else:
+        detail = _shape(command.get(_FILTER_KEYS.get(name, "filter"), {}))
+    base = f"{name} {collection}"
+    return base if detail is None else f"{base} {detail}"
+
+
+def _documents(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+def _percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+class _ShapeStats:
+    __slots__ = ("count", "failures", "documents", "total_ms", "max_ms", "durations", "callers")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failures = 0
+        self.documents = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.durations: Deque[float] = deque(maxlen=_WINDOW)
+        self.callers: set[str] = set()
+
+    def to_dict(self, shape: str) -> dict:
+        window = sorted(self.durations)
+        return {
+            "shape": shape,
+            "count": self.count,
+            "failures": self.failures,
+            "documents": self.documents,
+            "total_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(_percentile(window, 50), 3),
+            "p95_ms": round(_percentile(window, 95), 3),
+            "p99_ms": round(_percentile(window, 99), 3),
+            "callers": sorted(self.callers),
+        }
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Aggregates command durations by shape and logs slow commands."""
+
+    def __init__(self, slow_ms: float) -> None:
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        # (connection id, request id) -> (shape, caller, getMore cursor id or None)
+        self._pending: Dict[tuple, tuple] = {}
+        # cursor id -> shape of the command that opened it
+        self._cursors: Dict[int, str] = {}
+        self._stats: Dict[str, _ShapeStats] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command_name
+        if name in _IGNORED_COMMANDS:
+            return
+        cursor_id = event.command.get("getMore") if name == "getMore" else None
+        with self._lock:
+            if cursor_id is not None:
+                shape = self._cursors.get(cursor_id, f"getMore {event.command.get('collection')}")
+            else:
+                shape = _command_shape(name, event.command)
+            self._pending[(event.connection_id, event.request_id)] = (shape, current_caller.get(), cursor_id)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        shape, caller, get_more_cursor = pending
+        reply = event.reply
+        ms = event.duration_micros / 1000
+        docs = _documents(reply)
+        cursor = reply.get("cursor")
+        open_cursor = cursor.get("id") if isinstance(cursor, dict) else None
+        with self._lock:
+            if get_more_cursor is not None and not open_cursor:
+                # Cursor exhausted
+                self._cursors.pop(get_more_cursor, None)
+            elif get_more_cursor is None and open_cursor and len(self._cursors) < _MAX_OPEN_CURSORS:
+                self._cursors[open_cursor] = shape
+            self._record(shape, caller, ms, docs, failed=False)
+        if ms >= self.slow_ms:
+            logger.warning(
+                "Slow MongoDB %s: %.1f ms, %d docs (caller=%s, shape=%s)",
+                event.command_name, ms, docs, caller or "?", shape,
+            )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            shape, caller, get_more_cursor = pending
+            if get_more_cursor is not None:
+                self._cursors.pop(get_more_cursor, None)
+            self._record(shape, caller, event.duration_micros / 1000, 0, failed=True)
+        logger.warning(
+            "MongoDB %s failed after %.1f ms (caller=%s, shape=%s): %s",
+            event.command_name, event.duration_micros / 1000, caller or "?", shape, event.failure,
+        )
+
+    def _record(self, shape: str, caller: Optional[str], ms: float, docs: int, failed: bool) -> None:
+        stats = self._stats.get(shape)
+        if stats is None:
+            if len(self._stats) >= _MAX_SHAPES:
+                shape = "other"
+                stats = self._stats.setdefault(shape, _ShapeStats())
+            else:
+                stats = self._stats[shape] = _ShapeStats()
+        stats.count += 1
+        stats.failures += failed
+        stats.documents += docs
+        stats.total_ms += ms
+        stats.max_ms = max(stats.max_ms, ms)
+        stats.durations.append(ms)
+        if caller and len(stats.callers) < 20:
+            stats.callers.add(caller)
+
+    def stats(self) -> list[dict]:
+        """Per-shape stats, most total time first."""
+        with self._lock:
+            items = [s.to_dict(shape) for shape, s in self._stats.items()]
+        return sorted(items, key=lambda d: d["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
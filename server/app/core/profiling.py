@@ -0,0 +1,197 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when DEBUG is on and it asks for it (``X-Profile: cpu|mem`` header or
+``?__profile=cpu|mem``), or, in any mode, for a PROFILING_SAMPLE_RATE fraction of requests (cpu).
+
+- cpu: cProfile over the request; the report lists the top functions by cumulative time and a
+  ``.prof`` file is kept for snakeviz/pstats.
+- mem: tracemalloc snapshot diff; the report lists the top allocation sites.
+
+Only one request is profiled at a time per process (cProfile and tracemalloc are process-wide);
+others run unprofiled. The profiler sees the whole event loop thread, so work from concurrent
+requests can show up in a cpu profile: profile on a quiet worker when precision matters.
+Reports go to PROFILING_DIR; the newest PROFILING_MAX_FILES reports are kept. The response
+carries ``X-Profile-Id`` naming the report.
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_KINDS = ("cpu", "mem")
+_TOP_FUNCTIONS = 40
+_TOP_ALLOCATIONS = 30
+_SERVER_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Held while a request is being profiled
+_busy = threading.Lock()
+
+
+def profiles_dir() -> Path:
+    path = Path(get_settings().profiling_dir)
+    return path if path.is_absolute() else _SERVER_DIR / path
+
+
+def _requested_kind(scope: Scope) -> Optional[str]:
+    settings = get_settings()
+    if settings.debug:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile":
+                kind = value.decode("latin-1").strip().lower()
+                return kind if kind in PROFILE_KINDS else None
+        match = re.search(rb"(?:^|&)__profile=(cpu|mem)(?:&|$)", scope.get("query_string", b""))
+        if match:
+            return match.group(1).decode()
+    rate = settings.profiling_sample_rate
+    if rate > 0 and random.random() < rate:
+        return "cpu"
+    return None
+
+
+def _profile_id(scope: Scope, kind: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope.get("path", "")).strip("-")[:60] or "root"
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{int(time.time_ns() % 1_000_000)}-{slug}-{kind}"
+
+
+def _header(scope: Scope, kind: str, elapsed: float, status: int) -> str:
+    query = scope.get("query_string", b"").decode("latin-1")
+    target = scope.get("path", "") + (f"?{query}" if query else "")
+    return f"{scope.get('method', '')} {target}\nkind={kind} status={status} elapsed={elapsed * 1000:.2f}ms\n\n"
+
+
+def _cpu_report(profile: cProfile.Profile) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profile, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_TOP_FUNCTIONS)
+    out.write("\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(_TOP_FUNCTIONS // 2)
+    return out.getvalue()
+
+
+def _mem_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> str:
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    total = sum(d.size_diff for d in diff)
+    lines = [f"net allocated: {total / 1024:.1f} KiB", "", "top allocation sites (size diff, count diff):"]
+    lines.extend(str(d) for d in diff[:_TOP_ALLOCATIONS])
+    return "\n".join(lines) + "\n"
+
+
+def _save(profile_id: str, text: str, profile: Optional[cProfile.Profile]) -> None:
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{profile_id}.txt").write_text(text, encoding="utf-8")
+    if profile is not None:
+        profile.dump_stats(directory / f"{profile_id}.prof")
+    _prune(directory, get_settings().profiling_max_files)
+
+
+def _prune(directory: Path, keep: int) -> None:
+    reports = sorted(directory.glob("*.txt"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in reports[keep:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles() -> List[dict]:
+    """Saved reports, newest first."""
+    directory = profiles_dir()
+    if not directory.is_dir():
+        return []
+    out = []
+    for path in sorted(directory.glob("*.txt"), key=lambda p: p.stat().st_mtime, reverse=True):
+        st = path.stat()
+        out.append({
+            "id": path.stem,
+            "kind": path.stem.rsplit("-", 1)[-1],
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(st.st_mtime)),
+            "size_bytes": st.st_size,
+            "has_pstats": path.with_suffix(".prof").exists(),
+        })
+    return out
+
+
+def read_profile(profile_id: str) -> Optional[str]:
+    """Report text for a saved profile id, or None (ids are validated against the listing)."""
+    if not re.fullmatch(r"[A-Za-z0-9-]+", profile_id):
+        return None
+    path = profiles_dir() / f"{profile_id}.txt"
+    return path.read_text(encoding="utf-8") if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """Profile opted-in or sampled requests and save a report (see module docstring)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        kind = _requested_kind(scope)
+        if kind is None or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profiled(scope, receive, send, kind)
+        finally:
+            _busy.release()
+
+    async def _profiled(self, scope: Scope, receive: Receive, send: Send, kind: str) -> None:
+        profile_id = _profile_id(scope, kind)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profile: Optional[cProfile.Profile] = None
+        before: Optional[tracemalloc.Snapshot] = None
+        started_tracing = False
+        if kind == "cpu":
+            profile = cProfile.Profile()
+            profile.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                body = _cpu_report(profile)
+            else:
+                after = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                body = _mem_report(before, after)
+            text = _header(scope, kind, elapsed, status) + body
+            try:
+                await asyncio.to_thread(_save, profile_id, text, profile)
+            except OSError as e:
+                logger.warning("Could not save profile %s: %s", profile_id, e)
@@ -0,0 +1,39 @@
+"""
+In-memory sliding-window rate limiting per client IP (RATE_LIMIT_WINDOW_SECONDS).
+
+Limits are kept in separate buckets: "api" for the API (RATE_LIMIT_REQUESTS), "images" for image proxy
+requests (IMAGE_RATE_LIMIT_REQUESTS) and "image_renders" for image proxy cache misses, which fetch the
+origin and render a variant (IMAGE_RENDER_RATE_LIMIT_REQUESTS). A limit of 0 disables its bucket.
+"""
+
+import time
+from collections import defaultdict
+
+from starlette.requests import Request
+
+from app.core.config import get_settings
+
+_rate_limit_store: dict[tuple[str, str], list[float]] = defaultdict(list)
+
+
+def client_ip(request: Request) -> str:
+    """Get client IP, considering X-Forwarded-For when behind a proxy."""
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_exceeded(bucket: str, ip: str, limit: int) -> bool:
+    """Check if IP has exceeded limit requests in bucket (and count this one if not). Uses sliding window."""
+    if limit <= 0:
+        return False
+    now = time.monotonic()
+    window_start = now - get_settings().rate_limit_window_seconds
+    key = (bucket, ip)
+    timestamps = [t for t in _rate_limit_store[key] if t > window_start]
+    _rate_limit_store[key] = timestamps
+    if len(timestamps) >= limit:
+        return True
+    timestamps.append(now)
+    return False
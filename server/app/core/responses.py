@@ -0,0 +1,53 @@
+"""
+JSON responses for already-validated Pydantic models.
+
+Routes that declare a response_model and return models otherwise pay for the response to be validated
+again and, on FastAPI versions without the dump_json fast path, turned into dicts and run through
+json.dumps. ModelJSONResponse is returned directly from the route (FastAPI passes Response objects
+through untouched), so the body is produced in one pass by Pydantic's Rust serializer, with
+camelCase aliases and computed fields such as thumbnailUrl. Keep response_model on the route for
+the OpenAPI schema.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class ModelJSONResponse(Response):
+    """Serialize content by alias without re-validating it.
+
+    Pass ``model`` (the route's response_model, e.g. ``list[PhotocardSchema]``) for the fastest
+    path; without it the serializer is inferred per value. ``include`` (Pydantic include, by field
+    name) limits the serialized fields, e.g. for ``fields=``.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+        *,
+        model: Any = None,
+        include: Any = None,
+    ) -> None:
+        self.model = model
+        self.include = include
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        if self.model is not None:
+            return _adapter(self.model).dump_json(content, by_alias=True, include=self.include)
+        return to_json(content, by_alias=True, include=self.include)
@@ -4,6 +4,7 @@ Supabase Auth – verify JWT tokens issued by Supabase.
 Supports both legacy HS256 (JWT secret) and new signing keys (ES256/RS256 via JWKS).
 """
 
+import time
 from typing import Any
 
 import jwt
@@ -12,6 +13,7 @@ from jwt import PyJWKClient
 
 from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from app.core.metrics import JWT_VERIFY_SECONDS
 
 logger = get_logger(__name__)
 
@@ -74,6 +76,15 @@ def verify_supabase_token(token: str) -> dict[str, Any] | None:
 
     Tries JWKS (ES256/RS256) first, then legacy secret (HS256).
     """
+    start = time.perf_counter()
+    payload = _verify_supabase_token(token)
+    JWT_VERIFY_SECONDS.observe(
+        time.perf_counter() - start, "valid" if payload is not None else "invalid"
+    )
+    return payload
+
+
+def _verify_supabase_token(token: str) -> dict[str, Any] | None:
     settings = get_settings()
     if not settings.supabase_jwks_url and not settings.supabase_jwt_secret:
         logger.warning(
@@ -1,12 +1,13 @@
 """FastAPI application factory and lifecycle."""
 
 import asyncio
+import secrets
 import time
-from collections import defaultdict
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,37 +16,31 @@ from app.api.v1 import api_router
 from app.core.config import get_settings
 from app.core.db import close_mongodb, connect_mongodb
 from app.core.logging_config import setup_logging, get_logger
-from app.services.data_loader import load_data, seed_mongodb_if_empty
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import client_ip, rate_limit_exceeded
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, RATE_LIMITED, render_metrics
+from app.services.catalog_watcher import start_catalog_watcher, stop_catalog_watcher
+from app.services.data_loader import (
+    close_submission_batcher,
+    ensure_mongodb_indexes,
+    is_data_loaded,
+    load_catalog_from_mongodb,
+    load_data,
+    seed_mongodb_if_empty,
+    start_content_key_backfill,
+    stop_content_key_backfill,
+)
+from app.services.image_meta import start_image_meta_pipeline, stop_image_meta_pipeline
+from app.services.jobs import start_job_queue, stop_job_queue
+from app.services.thumbnails import check_origin_guard, close_image_client
 
 logger = get_logger(__name__)
 
 # Max time to wait for MongoDB connect + seed when MongoDB is required
 STARTUP_MONGODB_TIMEOUT_SECONDS = 20
 
-# Rate limit: 100 requests per minute per client IP
-RATE_LIMIT_REQUESTS = 100
-RATE_LIMIT_WINDOW_SEC = 60
-_rate_limit_store: dict[str, list[float]] = defaultdict(list)
-
-
-def _get_client_ip(request: Request) -> str:
-    """Get client IP, considering X-Forwarded-For when behind a proxy."""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
-
-
-def _rate_limit_exceeded(ip: str) -> bool:
-    """Check if IP has exceeded rate limit. Uses sliding window."""
-    now = time.monotonic()
-    window_start = now - RATE_LIMIT_WINDOW_SEC
-    timestamps = _rate_limit_store[ip]
-    _rate_limit_store[ip] = [t for t in timestamps if t > window_start]
-    if len(_rate_limit_store[ip]) >= RATE_LIMIT_REQUESTS:
-        return True
-    _rate_limit_store[ip].append(now)
-    return False
+# Image proxy requests have their own (higher) limit; their cache misses are also limited in images.py
+_IMAGES_PREFIX = f"{get_settings().api_v1_prefix}/images/"
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -54,16 +49,63 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         if request.method == "OPTIONS":
             return await call_next(request)
-        ip = _get_client_ip(request)
-        if _rate_limit_exceeded(ip):
+        settings = get_settings()
+        if request.url.path.startswith(_IMAGES_PREFIX):
+            bucket, limit = "images", settings.image_rate_limit_requests
+        else:
+            bucket, limit = "api", settings.rate_limit_requests
+        if rate_limit_exceeded(bucket, client_ip(request), limit):
+            RATE_LIMITED.inc()
             return JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Please try again later."},
-                headers={"Retry-After": str(RATE_LIMIT_WINDOW_SEC)},
+                headers={"Retry-After": str(settings.rate_limit_window_seconds)},
             )
         return await call_next(request)
 
 
+def _route_template(scope: Scope) -> str:
+    """Matched route's path template (e.g. /api/v1/groups/{group_id}), so ids don't become label values."""
+    route = scope.get("route")
+    if route is None or scope.get("endpoint") is None:
+        return "unmatched"
+    template = route.path
+    # Routes of included routers carry their path without the include prefix (/api/v1); the prefix is
+    # the leading segments of the request path that the template doesn't cover
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[: len(segments) - template.count("/")])
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram and in-flight gauge (plain ASGI: no extra task per request)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, scope["method"], _route_template(scope), status
+            )
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security-related HTTP headers to all responses."""
 
@@ -90,7 +132,10 @@ async def _startup_mongodb_or_fallback() -> None:
     settings = get_settings()
     if not settings.mongodb_configured:
         logger.info("MongoDB not configured (using file/hardcoded data)")
-        load_data()
+        # Already loaded when started via the pre-fork launcher (python -m app.serve)
+        if not is_data_loaded():
+            load_data()
+        start_catalog_watcher()
         return
 
     async def _connect_and_seed() -> None:
@@ -100,6 +145,10 @@ async def _startup_mongodb_or_fallback() -> None:
             await seed_mongodb_if_empty()
         except Exception as e:
             logger.warning("MongoDB seed failed: %s", e)
+        try:
+            await ensure_mongodb_indexes()
+        except Exception as e:
+            logger.warning("MongoDB index setup failed: %s", e)
 
     try:
         await asyncio.wait_for(_connect_and_seed(), timeout=STARTUP_MONGODB_TIMEOUT_SECONDS)
@@ -115,6 +164,16 @@ async def _startup_mongodb_or_fallback() -> None:
         # db.connect_mongodb() already logged the error and re-raised; propagate so server fails to start
         raise
 
+    # Read model for indexed by-group/by-member lists and search (preloaded by app.serve when pre-forking)
+    if not is_data_loaded():
+        try:
+            await load_catalog_from_mongodb(primary=True)
+        except Exception as e:
+            logger.warning("Catalog read model load failed (falling back to per-request queries): %s", e)
+    start_catalog_watcher()
+    # Outside the startup timeout: it touches every photocard the first time
+    start_content_key_backfill()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -122,7 +181,16 @@ async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Starting %s", get_settings().app_name)
     await _startup_mongodb_or_fallback()
+    await check_origin_guard()
+    start_image_meta_pipeline()
+    await start_job_queue()
     yield
+    await stop_catalog_watcher()
+    await stop_content_key_backfill()
+    await stop_job_queue()
+    await stop_image_meta_pipeline()
+    await close_submission_batcher()
+    await close_image_client()
     await close_mongodb()
     logger.info("Shutdown complete")
 
@@ -142,8 +210,11 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
     app.add_middleware(SecurityHeadersMiddleware)
-    app.add_middleware(RateLimitMiddleware)
+    if settings.rate_limit_requests > 0 or settings.image_rate_limit_requests > 0:
+        app.add_middleware(RateLimitMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
@@ -151,6 +222,8 @@ def create_app() -> FastAPI:
         allow_methods=["GET", "POST", "OPTIONS"],
         allow_headers=["*"],
     )
+    # Outermost, so latency includes the other middlewares and 429s are counted too
+    app.add_middleware(MetricsMiddleware)
 
     app.include_router(api_router, prefix=settings.api_v1_prefix)
 
@@ -161,6 +234,18 @@ def create_app() -> FastAPI:
             out["docs"] = "/docs"
         return out
 
+    if settings.metrics_enabled:
+        if not settings.metrics_token:
+            logger.warning("/metrics is enabled without METRICS_TOKEN: anyone who can reach the server can read it")
+
+        @app.get("/metrics", include_in_schema=False)
+        def metrics(request: Request) -> PlainTextResponse:
+            if settings.metrics_token and not secrets.compare_digest(
+                request.headers.get("authorization", ""), f"Bearer {settings.metrics_token}"
+            ):
+                return PlainTextResponse("Unauthorized", status_code=401, headers={"WWW-Authenticate": "Bearer"})
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
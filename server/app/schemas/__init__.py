@@ -2,14 +2,19 @@
 
 from app.schemas.group import GroupDataSchema, GroupSchema
 from app.schemas.member import MemberDataSchema, MemberSchema
+from app.schemas.moderation import ModerationRequestSchema, ModerationResultSchema
 from app.schemas.photocard import PhotocardSchema
-from app.schemas.search import SearchResultSchema
+from app.schemas.search import SearchResultSchema, SuggestionSchema, SuggestResultSchema
 
 __all__ = [
     "GroupDataSchema",
     "GroupSchema",
     "MemberDataSchema",
     "MemberSchema",
+    "ModerationRequestSchema",
+    "ModerationResultSchema",
     "PhotocardSchema",
     "SearchResultSchema",
+    "SuggestionSchema",
+    "SuggestResultSchema",
 ]
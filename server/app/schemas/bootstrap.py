@@ -0,0 +1,25 @@
+"""Home page bootstrap response schema."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.group import GroupSchema
+from app.schemas.photocard import PhotocardSchema
+
+
+class BootstrapGroupSchema(GroupSchema):
+    """Group with members, its photocard count and its first page of photocards."""
+
+    total_photocards: int = Field(..., alias="totalPhotocards")
+    photocards: List[PhotocardSchema]
+
+
+class BootstrapSchema(BaseModel):
+    """Everything the home page needs for first paint."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    # Catalog version the response was built from (None when no in-process catalog is loaded)
+    catalog_version: Optional[str] = Field(None, alias="catalogVersion")
+    groups: List[BootstrapGroupSchema]
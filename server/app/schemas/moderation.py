@@ -0,0 +1,34 @@
+"""Moderation schemas – bulk accept/reject of pending submissions."""
+
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.photocard import PhotocardSchema
+
+# Max submission ids per moderation request
+MAX_MODERATION_BATCH = 500
+MAX_ID_LEN = 200
+# Most pending submissions per GET /moderation/submissions
+MAX_PENDING_LIST = 200
+
+
+class ModerationRequestSchema(BaseModel):
+    """Submission ids to accept (promote to photocards) and to reject."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    accept: List[str] = Field(default_factory=list, max_length=MAX_MODERATION_BATCH)
+    reject: List[str] = Field(default_factory=list, max_length=MAX_MODERATION_BATCH)
+
+
+class ModerationResultSchema(BaseModel):
+    """Outcome per submission id, plus the photocards created for accepted submissions."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    accepted: List[str]
+    rejected: List[str]
+    # Unknown, no longer pending, or claimed by a concurrent moderation request
+    skipped: List[str]
+    photocards: List[PhotocardSchema]
@@ -1,13 +1,19 @@
 """Photocard-related Pydantic schemas."""
 
+from datetime import datetime
 from typing import List, Literal, Optional
+from urllib.parse import quote
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+
+from app.core.config import get_settings
 
 
 # Max lengths to prevent DoS and storage abuse
 MAX_STRING_LEN = 200
 MAX_URL_LEN = 2048
+# Most ids in one /photocards/by-ids request
+MAX_IDS_PER_REQUEST = 300
 
 
 def _validate_https_url(v: str, max_len: int = MAX_URL_LEN) -> str:
@@ -56,12 +62,28 @@ class GroupPhotocardsResponseSchema(BaseModel):
     total_photocards: int = Field(..., alias="totalPhotocards")
 
 
+class PhotocardIdsSchema(BaseModel):
+    """Photocard ids to fetch (POST /photocards/by-ids)."""
+
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_IDS_PER_REQUEST)
+
+
+class PhotocardsByIdsResponseSchema(BaseModel):
+    """Photocards in request order, plus the requested ids that don't exist."""
+
+    photocards: List["PhotocardSchema"]
+    missing: List[str]
+
+
 class PhotocardSchema(BaseModel):
     """Photocard schema (matches client Photocard)."""
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
     id: str
+    # MongoDB: the document's stored "id" when the API id is its _id. Older links use it, so lookups by
+    # id accept it too (catalog.photocard_id_keys); not sent to clients
+    legacy_id: Optional[str] = Field(None, alias="legacyId", exclude=True)
     member_id: str = Field(..., alias="memberId")
     member_name: str = Field(..., alias="memberName")
     group_id: str = Field(..., alias="groupId")
@@ -72,3 +94,22 @@ class PhotocardSchema(BaseModel):
     type: Literal["album", "pob", "fansign", "special"]
     image_url: str = Field(..., alias="imageUrl")
     back_image_url: Optional[str] = Field(None, alias="backImageUrl")
+    # Front image size in pixels and a tiny blurred preview (data: URI), filled in by image_meta.py
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    # 64-bit perceptual hash (hex) of the front image for near-duplicate checks; not sent to clients
+    image_hash: Optional[str] = Field(None, alias="imageHash", exclude=True)
+    # Last failed metadata attempt (image_meta.py retries after IMAGE_META_RETRY_HOURS); not sent to clients
+    image_meta_failed_at: Optional[datetime] = Field(None, alias="imageMetaFailedAt", exclude=True)
+
+    # Computed (not a wrap model_serializer, ~2.5x slower per photocard) so responses serialize in
+    # Pydantic's Rust core. Stored documents exclude it.
+    @computed_field(alias="thumbnailUrl", exclude_if=lambda v: v is None)
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        """Image proxy URL of the front image at IMAGE_THUMBNAIL_WIDTH (absent when not configured)."""
+        settings = get_settings()
+        if not settings.image_thumbnail_width:
+            return None
+        return f"{settings.api_v1_prefix}/images/{quote(self.id, safe='')}?w={settings.image_thumbnail_width}"
@@ -1,6 +1,6 @@
 """Search response schema."""
 
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -18,3 +18,17 @@ class SearchResultSchema(BaseModel):
     members: List[MemberSchema]
     photocards: List[PhotocardSchema]
     total_photocards: int = Field(..., alias="totalPhotocards")
+
+
+class SuggestionSchema(BaseModel):
+    """Autocomplete entry: a group, member or album name."""
+
+    type: Literal["group", "member", "album"]
+    id: Optional[str] = None
+    label: str
+
+
+class SuggestResultSchema(BaseModel):
+    """Autocomplete suggestions for a prefix, most photocards first."""
+
+    suggestions: List[SuggestionSchema]
@@ -1,11 +1,19 @@
 """Submission schema – user photocard submissions with status."""
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 
+class NearDuplicateSchema(BaseModel):
+    """Existing photocard or submission whose image looks like a submission's."""
+
+    kind: Literal["photocard", "submission"]
+    id: str
+    distance: int
+
+
 class SubmissionSchema(BaseModel):
     """Submission record: photocard fields + user email, timestamp, status."""
 
@@ -26,3 +34,12 @@ class SubmissionSchema(BaseModel):
     submitted_at: datetime = Field(..., alias="submittedAt")
     status: Literal["accepted", "rejected", "pending"]
     photocard_id: Optional[str] = Field(None, alias="photocardId")
+    reviewed_at: Optional[datetime] = Field(None, alias="reviewedAt")
+
+
+class ModeratorSubmissionSchema(SubmissionSchema):
+    """Submission as moderators see it. Near-duplicates name other users' submissions, so they are
+    never part of the submitter's own SubmissionSchema."""
+
+    # Filled in shortly after submission by the near-duplicate check (duplicates.py)
+    near_duplicates: List[NearDuplicateSchema] = Field(default_factory=list, alias="nearDuplicates")
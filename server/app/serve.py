@@ -0,0 +1,192 @@
+"""
+Pre-fork launcher: load the catalog once in the parent, then fork ASGI workers that share it.
+
+Usage:  python -m app.serve --workers 4 [--host 0.0.0.0] [--port 8000]
+
+In file mode the parent builds the in-memory catalog and its indexes, moves them out of the
+garbage collector's reach with gc.freeze() and then forks, so workers share those pages
+copy-on-write instead of each loading their own copy. In MongoDB mode the parent seeds the
+database (so workers don't race on an empty database) and loads the catalog read model, then
+closes its client; each worker opens its own.
+
+A worker that exits is restarted after RESTART_DELAY_SECONDS, doubled for each consecutive quick
+exit (one within QUICK_EXIT_SECONDS of starting) up to MAX_RESTART_DELAY_SECONDS. After --max-quick-restarts of those in a row, the launcher
+stops the remaining workers and exits with status 1, so a process manager sees the failure instead
+of a crash loop.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import get_settings
+from app.core.db import close_mongodb, connect_mongodb
+from app.core.logging_config import get_logger, setup_logging
+from app.main import app
+from app.services.data_loader import load_catalog_from_mongodb, load_data, seed_mongodb_if_empty
+
+logger = get_logger(__name__)
+
+# A worker that exits sooner than this after starting counts as a failed start
+QUICK_EXIT_SECONDS = 10.0
+RESTART_DELAY_SECONDS = 1.0
+MAX_RESTART_DELAY_SECONDS = 30.0
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        help="Number of worker processes (default: $WEB_CONCURRENCY or 1)",
+    )
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument(
+        "--max-quick-restarts",
+        type=int,
+        default=5,
+        help="Exit with status 1 after this many consecutive worker exits within "
+        f"{QUICK_EXIT_SECONDS:g}s of starting (default: 5)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_quick_restarts < 1:
+        parser.error("--max-quick-restarts must be at least 1")
+    return args
+
+
+async def _prepare_mongodb() -> None:
+    await connect_mongodb()
+    try:
+        await seed_mongodb_if_empty()
+        await load_catalog_from_mongodb(primary=True)
+    finally:
+        await close_mongodb()
+
+
+def _preload() -> None:
+    """Load everything workers can share before forking."""
+    if get_settings().mongodb_configured:
+        asyncio.run(_prepare_mongodb())
+    else:
+        load_data()
+
+
+def _bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket) -> None:
+    """Child process: serve the app on the inherited socket until told to stop."""
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+    gc.enable()
+    config = uvicorn.Config(app, lifespan="on", proxy_headers=True, forwarded_allow_ips="*")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock)
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+    logger.info("Started worker %d", pid)
+    return pid
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    setup_logging()
+    # Keep the collector from touching (and un-sharing) catalog objects while they are built
+    gc.disable()
+    _preload()
+    sock = _bind_socket(args.host, args.port, args.backlog)
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Serving on %s:%d with %d worker(s); %d objects frozen for copy-on-write sharing",
+        args.host,
+        args.port,
+        args.workers,
+        gc.get_freeze_count(),
+    )
+
+    # pid -> monotonic start time
+    workers = {_spawn(sock): time.monotonic() for _ in range(args.workers)}
+    stopping = False
+    gave_up = False
+    quick_exits = 0
+
+    def _stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = workers.pop(pid, None)
+        if stopping:
+            continue
+        if started is not None and time.monotonic() - started >= QUICK_EXIT_SECONDS:
+            quick_exits = 0
+        else:
+            quick_exits += 1
+        if quick_exits >= args.max_quick_restarts:
+            logger.error(
+                "Worker %d exited (status %d); %d quick exits in a row, giving up", pid, status, quick_exits
+            )
+            gave_up = True
+            _stop(signal.SIGTERM, None)
+            continue
+        delay = min(RESTART_DELAY_SECONDS * 2**quick_exits, MAX_RESTART_DELAY_SECONDS)
+        logger.warning("Worker %d exited (status %d); restarting in %.1fs", pid, status, delay)
+        # Short steps, so a stop signal during the delay isn't held up by it
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(max(0.0, min(0.2, deadline - time.monotonic())))
+        if not stopping:
+            workers[_spawn(sock)] = time.monotonic()
+    sock.close()
+    logger.info("All workers stopped")
+    if gave_up:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
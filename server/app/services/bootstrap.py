@@ -0,0 +1,74 @@
+"""
+Home page bootstrap: all groups with members, photocard counts and first photocards in one response.
+
+The client's landing flow otherwise calls /groups and then each group's members and first photocard page,
+N+1 round trips over a mobile link. The body is assembled from data_loader, serialized once per catalog
+version and page size, and served from that cache until the catalog is swapped. Concurrent requests for an
+uncached body share one build. Without an in-process catalog (MongoDB connected, read model not loaded yet)
+nothing is cached.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from app.schemas.bootstrap import BootstrapGroupSchema, BootstrapSchema
+from app.services.data_loader import catalog_version, get_bootstrap_async
+from app.services.single_flight import SingleFlight
+
+# per_group -> JSON body, for _version only
+_bodies: Dict[int, bytes] = {}
+_version: Optional[str] = None
+_builds = SingleFlight()
+_hits = 0
+_misses = 0
+
+
+async def _build(per_group: int) -> Tuple[Optional[str], bytes]:
+    result = await get_bootstrap_async(per_group)
+    response = BootstrapSchema.model_construct(
+        catalog_version=result["version"],
+        groups=[
+            BootstrapGroupSchema.model_construct(
+                **dict(entry["group"]),
+                total_photocards=entry["total_photocards"],
+                photocards=entry["photocards"],
+            )
+            for entry in result["groups"]
+        ],
+    )
+    return result["version"], response.model_dump_json(by_alias=True).encode()
+
+
+def _cached(version: Optional[str], per_group: int) -> Optional[bytes]:
+    global _version
+    if version != _version:
+        _bodies.clear()
+        _version = version
+    return _bodies.get(per_group) if version is not None else None
+
+
+async def bootstrap_body(per_group: int) -> Tuple[Optional[str], bytes]:
+    """(catalog version, JSON body) of GET /bootstrap with per_group photocards per group."""
+    global _hits, _misses
+    body = _cached(catalog_version(), per_group)
+    if body is not None:
+        _hits += 1
+        return _version, body
+    _misses += 1
+    version, body = await _builds.do(("bootstrap", catalog_version(), per_group), lambda: _build(per_group))
+    # Not if the catalog was swapped while building: don't store an old body for the new version
+    if version is not None and version == catalog_version() and _cached(version, per_group) is None:
+        _bodies[per_group] = body
+    return version, body
+
+
+def bootstrap_cache_stats() -> dict:
+    """Cached bodies for the current catalog version and hit rate."""
+    total = _hits + _misses
+    return {
+        "version": _version,
+        "entries": len(_bodies),
+        "bytes": sum(len(b) for b in _bodies.values()),
+        "hits": _hits,
+        "misses": _misses,
+        "hit_rate": round(_hits / total, 4) if total else 0.0,
+    }
@@ -0,0 +1,281 @@
+"""In-memory catalog with precomputed lookup indexes.
+
+Indexes hold positions into the ``photocards`` list rather than the objects themselves,
+so they stay compact, keep catalog order when merged, and can be written to a snapshot as-is.
+"""
+
+from typing import Collection, Dict, Iterable, List
+
+from app.schemas.group import GroupSchema
+from app.schemas.photocard import PhotocardSchema
+from app.services.fuzzy import DeletionIndex
+from app.services.hangul import HangulIndex, has_hangul
+from app.services.suggest import Suggestion, SuggestIndex, album_suggestion, build_suggest_index
+
+
+def _search_fields(p: PhotocardSchema) -> tuple[str, ...]:
+    """Lowercased photocard fields matched by the search endpoint."""
+    return (
+        (p.album or "").lower(),
+        (p.member_name or "").lower(),
+        (p.group_name or "").lower(),
+        (p.version or "").lower(),
+    )
+
+
+def index_photocard_ids(
+    index: Dict[str, int], photocards: Iterable[PhotocardSchema], start: int = 0
+) -> Dict[str, int]:
+    """Add id -> position for photocards (positions from start) to index and return it.
+
+    A photocard answers to its id and to its legacy id (MongoDB). API ids take precedence, and
+    existing entries are kept. This is the one id rule for the read model and for MongoDB lookups
+    (data_loader.get_photocards_by_ids_async).
+    """
+    photocards = list(photocards)
+    for i, p in enumerate(photocards, start=start):
+        index.setdefault(p.id, i)
+    for i, p in enumerate(photocards, start=start):
+        if p.legacy_id:
+            index.setdefault(p.legacy_id, i)
+    return index
+
+
+def _fuzzy_fields(p: PhotocardSchema) -> tuple[str, ...]:
+    """Lowercased photocard fields that typo-tolerant search looks up."""
+    return (
+        (p.album or "").lower(),
+        (p.member_name or "").lower(),
+        (p.group_name or "").lower(),
+    )
+
+
+class Catalog:
+    """Validated groups and photocards plus lookup indexes. Treat instances as read-only."""
+
+    __slots__ = (
+        "version",
+        "groups",
+        "photocards",
+        "group_index",
+        "photocard_index",
+        "group_photocards",
+        "member_photocards",
+        "search_terms",
+        "fuzzy",
+        "hangul",
+        "suggest",
+    )
+
+    def __init__(
+        self,
+        version: str,
+        groups: List[GroupSchema],
+        photocards: List[PhotocardSchema],
+        group_index: Dict[str, int],
+        photocard_index: Dict[str, int],
+        group_photocards: Dict[str, List[int]],
+        member_photocards: Dict[str, List[int]],
+        search_terms: Dict[str, List[int]],
+        fuzzy: DeletionIndex,
+        hangul: HangulIndex,
+        suggest: SuggestIndex,
+    ) -> None:
+        self.version = version
+        self.groups = groups
+        self.photocards = photocards
+        # group id -> position in groups
+        self.group_index = group_index
+        # photocard id -> position in photocards
+        self.photocard_index = photocard_index
+        # group id / member id -> photocard positions (catalog order)
+        self.group_photocards = group_photocards
+        self.member_photocards = member_photocards
+        # lowercased album/member/group/version value -> photocard positions (catalog order)
+        self.search_terms = search_terms
+        # typo-tolerant lookup over lowercased group names, member names and albums
+        self.fuzzy = fuzzy
+        # jamo/choseong prefix lookup over Korean group/member names and lowercased Korean albums
+        self.hangul = hangul
+        # prefix -> group/member/album suggestions weighted by photocard count
+        self.suggest = suggest
+
+    def indexes(self) -> dict:
+        """Return the derived indexes as plain dicts (used by the snapshot writer)."""
+        return {
+            "group_index": self.group_index,
+            "photocard_index": self.photocard_index,
+            "group_photocards": self.group_photocards,
+            "member_photocards": self.member_photocards,
+            "search_terms": self.search_terms,
+            "fuzzy": self.fuzzy,
+            "hangul": self.hangul,
+            "suggest": self.suggest,
+        }
+
+    def get_group(self, group_id: str) -> GroupSchema | None:
+        pos = self.group_index.get(group_id)
+        return self.groups[pos] if pos is not None else None
+
+    def get_photocard(self, photocard_id: str) -> PhotocardSchema | None:
+        pos = self.photocard_index.get(photocard_id)
+        return self.photocards[pos] if pos is not None else None
+
+    def take(self, positions: Iterable[int]) -> List[PhotocardSchema]:
+        """Map photocard positions to photocards."""
+        pcs = self.photocards
+        return [pcs[i] for i in positions]
+
+    def match_photocards(self, q: str, terms: Collection[str] = ()) -> List[int]:
+        """Positions of photocards whose album, member, group or version contains q (lowercased),
+        or equals one of terms (e.g. fuzzy matches)."""
+        matched: set[int] = set()
+        for term, positions in self.search_terms.items():
+            if q in term:
+                matched.update(positions)
+        for term in terms:
+            matched.update(self.search_terms.get(term, ()))
+        return sorted(matched)
+
+    def fuzzy_terms(self, q: str) -> set[str]:
+        """Lowercased group/member names and albums within a small edit distance of q."""
+        return set(self.fuzzy.lookup(q))
+
+    def hangul_terms(self, q: str) -> set[str]:
+        """Korean names and albums matching q by jamo prefix ("카리" -> 카리나) or choseong ("ㅋㄹㄴ")."""
+        return self.hangul.lookup(q)
+
+    def _suggestions_for(self, p: PhotocardSchema) -> List[Suggestion]:
+        """Suggestions whose weight a photocard adds to (its group and member if known, its album)."""
+        out: List[Suggestion] = []
+        g = self.get_group(p.group_id)
+        if g is not None:
+            out.append(("group", g.id, g.name))
+            out.extend(("member", m.id, m.name) for m in g.members if m.id == p.member_id)
+        if p.album:
+            out.append(album_suggestion(p.album))
+        return out
+
+    def with_photocards(self, new: List[PhotocardSchema], version: str) -> "Catalog":
+        """Return a new catalog with photocards appended, updating indexes incrementally.
+
+        Only the index entries the new photocards touch are copied; everything else is shared
+        with this catalog, which stays valid for readers still holding it.
+        """
+        photocards = self.photocards + new
+        photocard_index = dict(self.photocard_index)
+        group_photocards = dict(self.group_photocards)
+        member_photocards = dict(self.member_photocards)
+        search_terms = dict(self.search_terms)
+        touched: set[int] = set()
+
+        def _append(index: Dict[str, List[int]], key: str, pos: int) -> None:
+            positions = index.get(key)
+            if positions is None:
+                index[key] = [pos]
+                touched.add(id(index[key]))
+            elif id(positions) in touched:
+                positions.append(pos)
+            else:
+                index[key] = positions + [pos]
+                touched.add(id(index[key]))
+
+        index_photocard_ids(photocard_index, new, start=len(self.photocards))
+        for i, p in enumerate(new, start=len(self.photocards)):
+            _append(group_photocards, p.group_id, i)
+            _append(member_photocards, p.member_id, i)
+            for term in set(_search_fields(p)):
+                if term:
+                    _append(search_terms, term, i)
+        fuzzy = self.fuzzy.with_terms(term for p in new for term in _fuzzy_fields(p))
+        hangul = self.hangul.with_terms((p.album or "").lower() for p in new)
+        counts: Dict[Suggestion, int] = {}
+        for p in new:
+            for sug in self._suggestions_for(p):
+                counts[sug] = counts.get(sug, 0) + 1
+        return Catalog(
+            version=version,
+            groups=self.groups,
+            photocards=photocards,
+            group_index=self.group_index,
+            photocard_index=photocard_index,
+            group_photocards=group_photocards,
+            member_photocards=member_photocards,
+            search_terms=search_terms,
+            fuzzy=fuzzy,
+            hangul=hangul,
+            suggest=self.suggest.with_counts(counts),
+        )
+
+    def with_photocard_updates(self, updates: Dict[str, dict], version: str) -> "Catalog":
+        """Return a new catalog with fields of existing photocards replaced (by id -> {field: value}).
+
+        Only for fields no index covers (e.g. image dimensions); every index is shared.
+        """
+        photocards = list(self.photocards)
+        for photocard_id, fields in updates.items():
+            pos = self.photocard_index.get(photocard_id)
+            if pos is not None:
+                photocards[pos] = photocards[pos].model_copy(update=fields)
+        return Catalog(
+            version=version,
+            groups=self.groups,
+            photocards=photocards,
+            **self.indexes(),
+        )
+
+
+def build_catalog(
+    groups: List[GroupSchema],
+    photocards: List[PhotocardSchema],
+    version: str,
+) -> Catalog:
+    """Build a catalog and all of its indexes from validated groups and photocards."""
+    group_index: Dict[str, int] = {}
+    for i, g in enumerate(groups):
+        group_index.setdefault(g.id, i)
+    photocard_index: Dict[str, int] = {}
+    group_photocards: Dict[str, List[int]] = {}
+    member_photocards: Dict[str, List[int]] = {}
+    search_terms: Dict[str, List[int]] = {}
+    fuzzy_terms: set[str] = set()
+    hangul_terms: set[str] = set()
+    album_counts: Dict[str, int] = {}
+    for g in groups:
+        fuzzy_terms.add((g.name or "").lower())
+        fuzzy_terms.update((m.name or "").lower() for m in g.members)
+        hangul_terms.add(g.korean_name or "")
+        hangul_terms.update(m.korean_name or "" for m in g.members)
+    index_photocard_ids(photocard_index, photocards)
+    for i, p in enumerate(photocards):
+        group_photocards.setdefault(p.group_id, []).append(i)
+        member_photocards.setdefault(p.member_id, []).append(i)
+        for term in set(_search_fields(p)):
+            if term:
+                search_terms.setdefault(term, []).append(i)
+        fuzzy_terms.update(_fuzzy_fields(p))
+        if p.album:
+            album_counts[p.album] = album_counts.get(p.album, 0) + 1
+        album = (p.album or "").lower()
+        if has_hangul(album):
+            hangul_terms.add(album)
+    fuzzy = DeletionIndex()
+    fuzzy.update(fuzzy_terms)
+    return Catalog(
+        version=version,
+        groups=groups,
+        photocards=photocards,
+        group_index=group_index,
+        photocard_index=photocard_index,
+        group_photocards=group_photocards,
+        member_photocards=member_photocards,
+        search_terms=search_terms,
+        fuzzy=fuzzy,
+        hangul=HangulIndex(hangul_terms),
+        suggest=build_suggest_index(
+            groups,
+            {k: len(v) for k, v in group_photocards.items()},
+            {k: len(v) for k, v in member_photocards.items()},
+            album_counts,
+        ),
+    )
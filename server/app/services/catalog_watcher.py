@@ -0,0 +1,111 @@
+"""
+Hot reload of the in-process catalog.
+
+File mode: polls data.json's mtime/size and, when it changes, rebuilds the catalog and its
+indexes in a worker thread so the event loop keeps serving. data_loader.reload_data() then
+swaps the new catalog in with a single reference assignment: requests already running keep
+the catalog they started with, and readers never take a lock.
+
+MongoDB mode: every CATALOG_CHANGE_POLL_SECONDS, compares a cheap change signal (counts, newest
+_ids, the API write revision) with the one the read model was built from and rebuilds on change,
+picking up writes from other workers and inserts made outside the API. With
+CATALOG_RELOAD_INTERVAL_SECONDS it also rebuilds unconditionally, for in-place database edits.
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.services.data_loader import (
+    catalog_source_path,
+    load_catalog_from_mongodb,
+    refresh_catalog_if_changed,
+    reload_data,
+)
+
+logger = get_logger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+def _source_stat() -> tuple[str, int, int] | None:
+    path = catalog_source_path()
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+async def _watch_file(interval: float) -> None:
+    last = _source_stat()
+    while True:
+        await asyncio.sleep(interval)
+        current = _source_stat()
+        if current == last:
+            continue
+        try:
+            await asyncio.to_thread(reload_data)
+        except Exception as e:
+            # Keep serving the previous catalog; retry on the next change
+            logger.error("Catalog reload failed, keeping current catalog: %s", e)
+        last = current
+
+
+async def _watch_mongodb(poll: float, full: float) -> None:
+    loop = asyncio.get_running_loop()
+    last_full = loop.time()
+    step = min(x for x in (poll, full) if x > 0)
+    while True:
+        await asyncio.sleep(step)
+        try:
+            if full > 0 and loop.time() - last_full >= full:
+                await load_catalog_from_mongodb()
+                last_full = loop.time()
+            elif poll > 0:
+                await refresh_catalog_if_changed()
+        except Exception as e:
+            logger.error("Catalog read model refresh failed, keeping current one: %s", e)
+
+
+def start_catalog_watcher() -> bool:
+    """Start polling the catalog source (CATALOG_RELOAD_INTERVAL_SECONDS; in MongoDB mode also
+    CATALOG_CHANGE_POLL_SECONDS). Returns True if started."""
+    global _task
+    settings = get_settings()
+    interval = settings.catalog_reload_interval_seconds
+    if _task is not None:
+        return False
+    if settings.mongodb_configured:
+        poll = settings.catalog_change_poll_seconds
+        if interval <= 0 and poll <= 0:
+            return False
+        _task = asyncio.create_task(_watch_mongodb(poll, interval), name="catalog-watcher")
+        logger.info(
+            "Refreshing catalog read model from MongoDB on change (checked every %.1f s), full rebuild every %.1f s",
+            poll,
+            interval,
+        )
+    elif interval <= 0:
+        return False
+    else:
+        _task = asyncio.create_task(_watch_file(interval), name="catalog-watcher")
+        logger.info("Watching catalog source for changes every %.1f s", interval)
+    return True
+
+
+async def stop_catalog_watcher() -> None:
+    """Stop the watcher task. Call on app shutdown."""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,93 @@
+"""
+Write coalescing: many concurrent callers, one batched operation.
+
+Items submitted within max_wait seconds of the first one (or until max_items are waiting) are
+handed to a single flush(items) call, which returns one result or exception per item. Each caller
+gets its own. Database round trips under bursts then scale with batches rather than requests; a
+lone caller waits at most max_wait. Every caller gets an answer: if a flush is cancelled or returns
+too few results, the callers left over get an error. close() flushes what is waiting on shutdown.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Flush = Callable[[List[T]], Awaitable[List[Union[R, BaseException]]]]
+
+
+class Coalescer(Generic[T, R]):
+    """Time/size-bounded batches of submitted items (one event loop)."""
+
+    def __init__(self, flush: Flush, max_wait: float, max_items: int) -> None:
+        self._flush = flush
+        self.max_wait = max_wait
+        self.max_items = max(1, max_items)
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self.items = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    async def submit(self, item: T) -> R:
+        """Add item to the next batch and return its result (or raise its exception)."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._start_flush)
+        # Shielded: a caller that disconnects doesn't cancel its item; the batch writes it anyway
+        return await asyncio.shield(future)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        results: List[Any] = []
+        try:
+            results = await self._flush([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            # Also runs when the flush is cancelled, so no (shielded) caller waits forever
+            for i, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                result = results[i] if i < len(results) else RuntimeError("batched write did not complete")
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def close(self, timeout: float) -> None:
+        """Flush waiting items now and wait up to timeout for running batches; cancel the rest."""
+        self._start_flush()
+        if not self._running:
+            return
+        _, not_done = await asyncio.wait(set(self._running), timeout=timeout)
+        for task in not_done:
+            task.cancel()
+        if not_done:
+            await asyncio.gather(*not_done, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0,
+            "largest_batch": self.largest_batch,
+            "waiting": len(self._pending),
+        }
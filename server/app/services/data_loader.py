@@ -1,47 +1,161 @@
 """Load and expose catalog data (groups, members, photocards) from file or MongoDB."""
 
+import asyncio
+import hashlib
 import json
+import os
+import tempfile
 import uuid
-from datetime import datetime, timezone
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import wraps
 from pathlib import Path
-from typing import List
+from typing import Awaitable, Callable, Collection, List, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock (pre-forking is POSIX-only anyway)
+    fcntl = None
 
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, WriteError
 
+from app.core.config import get_settings
 from app.core.db import (
+    CATALOG_META_COLLECTION,
     GROUPS_COLLECTION,
     PHOTOCARDS_COLLECTION,
     SUBMISSIONS_COLLECTION,
+    get_catalog_database,
     get_database,
     is_connected,
 )
 from app.core.logging_config import get_logger
+from app.core.metrics import REGISTRY, MONGODB_QUERY_SECONDS, CallbackMetric
+from app.core.mongo_monitor import current_caller
 from app.schemas.group import GroupDataSchema, GroupSchema
 from app.schemas.member import MemberSchema
 from app.schemas.photocard import PhotocardSchema
-from app.schemas.submission import SubmissionSchema
+from app.schemas.submission import ModeratorSubmissionSchema, SubmissionSchema
+from app.services.catalog import Catalog, build_catalog, index_photocard_ids
+from app.services.coalescer import Coalescer
+from app.services.fieldsets import FieldSet
 from app.services.hardcoded_data import HARDCODED_RAW
+from app.services.search_cache import SearchCache, SearchMatches
+from app.services.single_flight import SingleFlight
+from app.services.snapshot import read_snapshot, source_hash, write_snapshot
 
 logger = get_logger(__name__)
 
 # Max time for a single MongoDB query (ms); prevents requests hanging forever
 MONGODB_QUERY_TIMEOUT_MS = 15000
 
-# In-memory store when MongoDB is not used
-_groups: List[GroupSchema] = []
-_photocards: List[PhotocardSchema] = []
+# Server root (the directory containing app/ and data/)
+_SERVER_DIR = Path(__file__).resolve().parent.parent.parent
+
+# In-memory catalog: the whole store when MongoDB is not used, and a read model (indexes for
+# by-group/by-member lists and search) built from MongoDB when it is
+_catalog: Catalog | None = None
+
+# Full match lists of recent searches over the in-process catalog (paging only slices)
+_search_cache = SearchCache(get_settings().search_cache_size, lambda: catalog_version())
+
+# Identical concurrent MongoDB reads share one query (see single_flight.py)
+_mongo_reads = SingleFlight()
+# Change signal of the MongoDB catalog the read model was built from (refresh_catalog_if_changed)
+_catalog_signal: tuple | None = None
+
+# Concurrent submission inserts written as one batch (SUBMISSION_BATCH_MS; created on first use)
+_submissions_coalescer: Coalescer | None = None
+
+REGISTRY.register(CallbackMetric(
+    "katalog_cache_requests_total",
+    "Cache lookups by cache and result (search: hit/miss; mongodb_single_flight: shared/executed).",
+    ("cache", "result"),
+    "counter",
+    lambda: {
+        ("search", "hit"): _search_cache.hits,
+        ("search", "miss"): _search_cache.misses,
+        ("mongodb_single_flight", "shared"): _mongo_reads.shared,
+        ("mongodb_single_flight", "executed"): _mongo_reads.calls - _mongo_reads.shared,
+    },
+))
+REGISTRY.register(CallbackMetric(
+    "katalog_search_cache_bytes",
+    "Approximate memory held by the search result cache.",
+    (),
+    "gauge",
+    lambda: {(): _search_cache.stats()["approx_bytes"]},
+))
+
+T = TypeVar("T")
+
+
+def _mongo_timed(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Record the wrapped coroutine's duration in the MongoDB query histogram under name, and
+    tag the commands it issues with name for the command monitor's slow-query log."""
+
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(fn)
+        async def wrapper(*args, **kwargs) -> T:
+            token = current_caller.set(name)
+            try:
+                with MONGODB_QUERY_SECONDS.time(name):
+                    return await fn(*args, **kwargs)
+            finally:
+                current_caller.reset(token)
+
+        return wrapper
+
+    return decorator
 
 
 def _data_path() -> Path | None:
-    """Resolve path to data.json if it exists."""
-    base = Path(__file__).resolve().parent.parent.parent
-    for rel in ["data/data.json", "../client/src/data/data.json"]:
-        p = (base / rel).resolve()
+    """Resolve path to data.json if it exists (CATALOG_DATA_PATH overrides the default locations)."""
+    configured = get_settings().catalog_data_path.strip()
+    candidates = [configured] if configured else ["data/data.json", "../client/src/data/data.json"]
+    for rel in candidates:
+        p = (_SERVER_DIR / rel).resolve()
         if p.exists():
             return p
     return None
 
 
+def _snapshot_path() -> Path | None:
+    """Resolve the configured catalog snapshot path, or None if snapshots are disabled."""
+    rel = get_settings().catalog_snapshot_path.strip()
+    return (_SERVER_DIR / rel).resolve() if rel else None
+
+
+def _raw_source() -> bytes:
+    """Return raw catalog bytes from file, or hardcoded data serialized as JSON (no DB)."""
+    path = _data_path()
+    if path:
+        return path.read_bytes()
+    return json.dumps(HARDCODED_RAW, ensure_ascii=False).encode("utf-8")
+
+
+def _image_meta_path() -> Path | None:
+    """Resolve the file-mode image metadata store (IMAGE_META_PATH), or None if disabled."""
+    rel = get_settings().image_meta_path.strip()
+    return (_SERVER_DIR / rel).resolve() if rel else None
+
+
+def _image_meta_source() -> bytes:
+    """Raw image metadata store ({imageUrl: {width, height, placeholder, imageHash}}), or b"" if none."""
+    path = _image_meta_path()
+    try:
+        return path.read_bytes() if path else b""
+    except OSError:
+        return b""
+
+
+def _catalog_digest(source: bytes, image_meta: bytes) -> bytes:
+    return source_hash(source + b"\n" + image_meta)
+
+
 def _raw_fallback() -> dict:
     """Return raw dict from file or hardcoded data (no DB)."""
     path = _data_path()
@@ -51,37 +165,344 @@ def _raw_fallback() -> dict:
     return HARDCODED_RAW
 
 
+def _group_from_raw(g: dict) -> GroupSchema:
+    g_data = GroupDataSchema.model_validate(g)
+    return GroupSchema(
+        id=g_data.id,
+        name=g_data.name,
+        korean_name=g_data.korean_name,
+        company=g_data.company,
+        debut_year=g_data.debut_year,
+        image_url=g_data.image_url,
+        members=list(g_data.members),
+    )
+
+
+def _with_image_meta(p: dict, image_meta: dict) -> dict:
+    meta = image_meta.get(p.get("imageUrl"))
+    return {**meta, **p} if meta else p
+
+
+def _catalog_from_raw(raw: dict, version: str, image_meta: bytes = b"") -> Catalog:
+    """Validate raw groups/photocards (plus stored image metadata) and build the catalog indexes."""
+    groups = [_group_from_raw(g) for g in raw.get("groups", [])]
+    meta = json.loads(image_meta) if image_meta else {}
+    photocards = [PhotocardSchema.model_validate(_with_image_meta(p, meta)) for p in raw.get("photocards", [])]
+    return build_catalog(groups, photocards, version)
+
+
+def _version_for(digest: bytes) -> str:
+    return digest.hex()[:16]
+
+
+def _load_catalog(source: bytes, image_meta: bytes, digest: bytes) -> tuple[Catalog, str]:
+    """Build a catalog for source: from the snapshot when it is current, else from JSON."""
+    snapshot_path = _snapshot_path()
+    catalog = read_snapshot(snapshot_path, digest) if snapshot_path else None
+    if catalog is not None:
+        return catalog, "snapshot"
+    return _catalog_from_raw(json.loads(source), _version_for(digest), image_meta), "JSON"
+
+
 def load_data() -> None:
-    """Load groups and photocards from JSON file or hardcoded into memory (when not using MongoDB)."""
-    global _groups, _photocards
-    raw = _raw_fallback()
-    groups_raw = raw.get("groups", [])
-    _groups = []
-    for g in groups_raw:
-        g_data = GroupDataSchema.model_validate(g)
-        _groups.append(
-            GroupSchema(
-                id=g_data.id,
-                name=g_data.name,
-                korean_name=g_data.korean_name,
-                company=g_data.company,
-                debut_year=g_data.debut_year,
-                image_url=g_data.image_url,
-                members=list(g_data.members),
-            )
-        )
-    _photocards = [PhotocardSchema.model_validate(p) for p in raw.get("photocards", [])]
-    logger.info("Loaded %d groups and %d photocards (in-memory)", len(_groups), len(_photocards))
+    """Load groups and photocards into memory (when not using MongoDB).
+
+    Uses the binary catalog snapshot when it matches the current source; otherwise parses
+    and validates the JSON file (or hardcoded data).
+    """
+    global _catalog
+    source, image_meta = _raw_source(), _image_meta_source()
+    catalog, origin = _load_catalog(source, image_meta, _catalog_digest(source, image_meta))
+    _catalog = catalog
+    logger.info(
+        "Loaded %d groups and %d photocards (in-memory, from %s)",
+        len(catalog.groups),
+        len(catalog.photocards),
+        origin,
+    )
+
+
+def reload_data() -> bool:
+    """Rebuild the in-memory catalog if its source changed, then swap it in. Returns True if swapped.
+
+    The new catalog is built completely before the module reference is replaced, so readers
+    (which take the reference once per call) see either the old or the new catalog, never a mix.
+    """
+    global _catalog
+    source, image_meta = _raw_source(), _image_meta_source()
+    digest = _catalog_digest(source, image_meta)
+    current = _catalog
+    if current is not None and current.version == _version_for(digest):
+        return False
+    catalog, origin = _load_catalog(source, image_meta, digest)
+    _catalog = catalog
+    logger.info(
+        "Reloaded catalog %s -> %s: %d groups and %d photocards (from %s)",
+        current.version if current else None,
+        catalog.version,
+        len(catalog.groups),
+        len(catalog.photocards),
+        origin,
+    )
+    return True
 
 
-def _ensure_memory_loaded() -> None:
-    """Ensure in-memory data is loaded (for non-MongoDB path)."""
-    if not _groups and not _photocards:
+def catalog_source_path() -> Path | None:
+    """Path of the data.json backing the in-memory catalog, or None when using hardcoded data."""
+    return _data_path()
+
+
+def is_data_loaded() -> bool:
+    """True if the in-memory catalog is loaded (e.g. preloaded by the pre-fork launcher)."""
+    return _catalog is not None
+
+
+def build_catalog_snapshot() -> Path:
+    """Validate the file catalog and write it, with its indexes, to the snapshot path."""
+    path = _snapshot_path()
+    if path is None:
+        raise RuntimeError("CATALOG_SNAPSHOT_PATH is empty; snapshots are disabled")
+    source, image_meta = _raw_source(), _image_meta_source()
+    digest = _catalog_digest(source, image_meta)
+    catalog = _catalog_from_raw(json.loads(source), _version_for(digest), image_meta)
+    write_snapshot(catalog, digest, path)
+    logger.info(
+        "Wrote catalog snapshot %s (%d groups, %d photocards)",
+        path,
+        len(catalog.groups),
+        len(catalog.photocards),
+    )
+    return path
+
+
+def _memory_catalog() -> Catalog:
+    """Return the in-memory catalog, loading it on first use (for non-MongoDB path)."""
+    if _catalog is None:
         load_data()
+    return _catalog
+
+
+def _current_catalog() -> Catalog | None:
+    """Catalog to serve indexed reads from: the file catalog, or the MongoDB read model if loaded."""
+    if is_connected():
+        return _catalog
+    return _memory_catalog()
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+async def _catalog_change_signal(db) -> tuple:
+    """Cheap fingerprint of the catalog collections: counts, newest _ids and the API write revision.
+
+    Inserts and deletes change the counts or newest _id; in-place updates made through the API bump
+    the revision. In-place edits made directly in the database don't change it (see
+    CATALOG_RELOAD_INTERVAL_SECONDS)."""
+
+    async def newest_id(collection: str):
+        doc = await db[collection].find_one({}, {"_id": 1}, sort=[("_id", -1)], max_time_ms=MONGODB_QUERY_TIMEOUT_MS)
+        return doc["_id"] if doc else None
+
+    async def revision():
+        doc = await db[CATALOG_META_COLLECTION].find_one({"_id": "catalog"}, max_time_ms=MONGODB_QUERY_TIMEOUT_MS)
+        return doc.get("revision", 0) if doc else 0
+
+    return tuple(await asyncio.gather(
+        db[GROUPS_COLLECTION].estimated_document_count(),
+        newest_id(GROUPS_COLLECTION),
+        db[PHOTOCARDS_COLLECTION].estimated_document_count(),
+        newest_id(PHOTOCARDS_COLLECTION),
+        revision(),
+    ))
+
+
+async def _bump_catalog_revision(db) -> None:
+    """Mark the catalog changed for other processes' change polls (after in-place photocard updates
+    this process has already applied to its read model; inserts already change the counts)."""
+    global _catalog_signal
+    try:
+        doc = await db[CATALOG_META_COLLECTION].find_one_and_update(
+            {"_id": "catalog"}, {"$inc": {"revision": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except Exception as e:
+        # Other processes then pick the change up on their next full reload
+        logger.warning("Could not bump catalog revision: %s", e)
+        return
+    # Only our own bump since the read model's signal: this process doesn't need to rebuild for it
+    if _catalog_signal is not None and doc["revision"] == _catalog_signal[-1] + 1:
+        _catalog_signal = (*_catalog_signal[:-1], doc["revision"])
+
+
+async def load_catalog_from_mongodb(primary: bool = False) -> None:
+    """Build the in-process read model from MongoDB (and swap it in, replacing any previous one).
+
+    primary reads from the primary (startup: the first read model must not start out stale);
+    rebuilds read catalog data where get_catalog_database() allows. The stored change signal comes
+    from the same source as the data, so a rebuild from a lagging secondary is repeated by the next
+    poll (which reads the primary) until it has caught up.
+    """
+    global _catalog, _catalog_signal
+    db = get_database() if primary else get_catalog_database()
+    if db is None:
+        groups, photocards, signal = await get_groups_async(), await get_photocards_async(), None
+    else:
+        # Taken before reading, so a write during the load shows up as a change on the next poll
+        signal = await _catalog_change_signal(db)
+        groups = await _fetch_groups(db)
+        photocards = await _fetch_photocards(db)
+    catalog = await asyncio.to_thread(build_catalog, groups, photocards, _new_version())
+    _catalog = catalog
+    _catalog_signal = signal
+    logger.info(
+        "Loaded catalog read model from MongoDB: %d groups and %d photocards",
+        len(catalog.groups),
+        len(catalog.photocards),
+    )
+
+
+async def refresh_catalog_if_changed() -> bool:
+    """Rebuild the read model if the MongoDB catalog changed since it was loaded. True if rebuilt.
+
+    The change signal is read from the primary, so a write is seen as soon as it is acknowledged."""
+    db = get_database()
+    if db is None:
+        return False
+    if await _catalog_change_signal(db) == _catalog_signal and _catalog is not None:
+        return False
+    await load_catalog_from_mongodb()
+    return True
+
+
+def _apply_new_photocards(photocards: List[PhotocardSchema]) -> None:
+    """Add photocards this process just inserted to the in-process catalog indexes without a rebuild."""
+    global _catalog, _catalog_signal
+    current = _catalog
+    if current is None or not photocards:
+        return
+    _catalog = current.with_photocards(photocards, _new_version())
+    # Expect the inserts in the change signal, so the next poll doesn't rebuild for this process's own
+    # write. If another process changed the catalog too, the signal won't match and the poll rebuilds.
+    if _catalog_signal is not None:
+        groups, newest_group, count, newest, revision = _catalog_signal
+        ids = [ObjectId(p.id) for p in photocards if _is_objectid_string(p.id)]
+        if newest is not None:
+            ids.append(newest)
+        _catalog_signal = (groups, newest_group, count + len(photocards), max(ids, default=None), revision)
+
+
+def catalog_version() -> str | None:
+    """Version of the in-process catalog (changes whenever it is swapped), or None if not loaded."""
+    catalog = _current_catalog()
+    return catalog.version if catalog is not None else None
+
+
+def photocard_image_hashes() -> List[tuple[str, str]]:
+    """(photocard id, imageHash) for photocards in the in-process catalog that have one."""
+    catalog = _current_catalog()
+    if catalog is None:
+        return []
+    return [(p.id, p.image_hash) for p in catalog.photocards if p.image_hash]
+
+
+def photocards_missing_image_meta() -> List[PhotocardSchema]:
+    """Photocards in the in-process catalog without image metadata (size, placeholder, hash) yet,
+    leaving out those whose last attempt failed less than IMAGE_META_RETRY_HOURS ago."""
+    catalog = _current_catalog()
+    if catalog is None:
+        return []
+    retry_before = datetime.now(timezone.utc) - timedelta(hours=get_settings().image_meta_retry_hours)
+
+    def due(p: PhotocardSchema) -> bool:
+        failed_at = p.image_meta_failed_at
+        if failed_at is None:
+            return True
+        # MongoDB returns naive UTC datetimes
+        return (failed_at if failed_at.tzinfo else failed_at.replace(tzinfo=timezone.utc)) < retry_before
+
+    return [p for p in catalog.photocards if p.image_hash is None and due(p)]
+
+
+def _write_image_meta_file(path: Path, by_url: dict) -> None:
+    """Merge {imageUrl: meta} into the file-mode store. Read-merge-write holds an exclusive lock on
+    a sibling .lock file, so workers and the backfill CLI don't drop each other's updates; the new
+    contents go to a per-process temp file that is renamed over the store."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            stored = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            stored = {}
+        stored.update(by_url)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+        ) as tmp:
+            json.dump(stored, tmp, ensure_ascii=False, separators=(",", ":"), default=datetime.isoformat)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+
+@_mongo_timed("apply_image_meta_async")
+async def _store_image_meta_mongodb(db, updates: dict[str, dict]) -> None:
+    ops = [
+        UpdateOne({"_id": ObjectId(pid)} if _is_objectid_string(pid) else {"id": pid}, {"$set": meta})
+        for pid, meta in updates.items()
+    ]
+    await db[PHOTOCARDS_COLLECTION].bulk_write(ops, ordered=False)
+
+
+_PHOTOCARD_FIELD_BY_ALIAS = {(f.alias or name): name for name, f in PhotocardSchema.model_fields.items()}
+
+
+async def apply_image_meta_async(updates: dict[str, dict]) -> None:
+    """Store computed image metadata ({photocard id: {width, height, placeholder, imageHash}}, or
+    {imageMetaFailedAt} for a failed attempt) and swap it into the in-process catalog. MongoDB: $set on
+    the photocard documents; call publish_image_meta_async() once the run is done so other processes
+    pick it up. File mode: the IMAGE_META_PATH store keyed by image URL, merged into the catalog on
+    every load."""
+    global _catalog
+    if not updates:
+        return
+    current = _current_catalog()
+    if is_connected():
+        db = get_database()
+        if db is not None:
+            await _store_image_meta_mongodb(db, updates)
+    else:
+        path = _image_meta_path()
+        if path is not None and current is not None:
+            by_url = {}
+            for pid, meta in updates.items():
+                p = current.get_photocard(pid)
+                if p is not None:
+                    by_url[p.image_url] = meta
+            await asyncio.to_thread(_write_image_meta_file, path, by_url)
+    # Re-read: the catalog may have been swapped while storing
+    current = _catalog
+    if current is not None:
+        fields = {
+            pid: {_PHOTOCARD_FIELD_BY_ALIAS.get(k, k): v for k, v in meta.items()}
+            for pid, meta in updates.items()
+        }
+        _catalog = current.with_photocard_updates(fields, _new_version())
+
+
+async def publish_image_meta_async() -> None:
+    """MongoDB: bump the catalog revision once after a run of apply_image_meta_async calls, so other
+    processes rebuild their read model once instead of once per stored batch. No-op in file mode."""
+    db = get_database() if is_connected() else None
+    if db is not None:
+        await _bump_catalog_revision(db)
 
 
 # ---- MongoDB seed ----
 
+@_mongo_timed("seed_mongodb_if_empty")
 async def seed_mongodb_if_empty() -> None:
     """If MongoDB is connected and collections are empty, seed from file/hardcoded data.
     Uses MongoDB _id as the group id in API responses; photocards get groupId = that _id.
@@ -98,21 +519,12 @@ async def seed_mongodb_if_empty() -> None:
     # Map legacy group id -> MongoDB _id (string) so photocards can use it as groupId
     group_id_to_mongo_id: dict[str, str] = {}
     for g in groups_raw:
-        g_data = GroupDataSchema.model_validate(g)
-        group = GroupSchema(
-            id=g_data.id,
-            name=g_data.name,
-            korean_name=g_data.korean_name,
-            company=g_data.company,
-            debut_year=g_data.debut_year,
-            image_url=g_data.image_url,
-            members=list(g_data.members),
-        )
+        group = _group_from_raw(g)
         result = await groups_coll.insert_one(group.model_dump(by_alias=True))
         if result.inserted_id:
-            group_id_to_mongo_id[g_data.id] = str(result.inserted_id)
+            group_id_to_mongo_id[group.id] = str(result.inserted_id)
     for p in raw.get("photocards", []):
-        doc = PhotocardSchema.model_validate(p).model_dump(by_alias=True)
+        doc = PhotocardSchema.model_validate(p).model_dump(by_alias=True, exclude={"thumbnail_url"})
         # Store groupId as ObjectId for proper references and indexing
         legacy_group_id = doc.get("groupId")
         if legacy_group_id and legacy_group_id in group_id_to_mongo_id:
@@ -121,6 +533,81 @@ async def seed_mongodb_if_empty() -> None:
     logger.info("Seeded MongoDB with %d groups and %d photocards", len(groups_raw), len(raw.get("photocards", [])))
 
 
+@_mongo_timed("ensure_mongodb_indexes")
+async def ensure_mongodb_indexes() -> None:
+    """Create the ``contentKey`` indexes (unique among pending/accepted submissions) and the pending
+    submissions queue index. Idempotent."""
+    db = get_database()
+    if db is None:
+        return
+    await db[SUBMISSIONS_COLLECTION].create_index(
+        "contentKey",
+        name="contentKey_unique",
+        unique=True,
+        partialFilterExpression={"contentKey": {"$exists": True}},
+    )
+    await db[PHOTOCARDS_COLLECTION].create_index("contentKey", name="contentKey")
+    await db[SUBMISSIONS_COLLECTION].create_index([("status", 1), ("submittedAt", 1)], name="status_submittedAt")
+
+
+async def backfill_content_keys() -> int:
+    """Fill in ``contentKey`` on photocards that predate it (seeded or imported); returns how many.
+    Idempotent; uses the contentKey index, so it is cheap when there is nothing to do."""
+    db = get_database()
+    if db is None:
+        return 0
+    photocards_coll = db[PHOTOCARDS_COLLECTION]
+    cursor = photocards_coll.find(
+        {"contentKey": None},
+        {"groupName": 1, "memberName": 1, "album": 1, "version": 1, "type": 1, "imageUrl": 1},
+    )
+    ops = []
+    filled = 0
+    async for d in cursor:
+        key = _content_key(d["groupName"], d["memberName"], d["album"], d["version"], d["type"], d["imageUrl"])
+        ops.append(UpdateOne({"_id": d["_id"]}, {"$set": {"contentKey": key}}))
+        if len(ops) >= 1000:
+            await photocards_coll.bulk_write(ops, ordered=False)
+            filled += len(ops)
+            ops = []
+    if ops:
+        await photocards_coll.bulk_write(ops, ordered=False)
+        filled += len(ops)
+    if filled:
+        logger.info("Filled in contentKey on %d photocards", filled)
+    return filled
+
+
+_backfill_task: asyncio.Task | None = None
+
+
+async def _run_content_key_backfill() -> None:
+    try:
+        await backfill_content_keys()
+    except Exception as e:
+        # Retried on the next start; until then those photocards aren't matched as exact duplicates
+        logger.warning("contentKey backfill failed: %s", e)
+
+
+def start_content_key_backfill() -> None:
+    """Run backfill_content_keys in the background (after startup, so a large catalog can't hold it up)."""
+    global _backfill_task
+    if _backfill_task is None and is_connected():
+        _backfill_task = asyncio.create_task(_run_content_key_backfill(), name="content-key-backfill")
+
+
+async def stop_content_key_backfill() -> None:
+    global _backfill_task
+    if _backfill_task is None:
+        return
+    _backfill_task.cancel()
+    try:
+        await _backfill_task
+    except asyncio.CancelledError:
+        pass
+    _backfill_task = None
+
+
 # ---- Async data access (MongoDB or in-memory) ----
 
 def _doc_for_validation(d: dict) -> dict:
@@ -134,6 +621,9 @@ def _doc_for_validation(d: dict) -> dict:
         out[k] = str(v) if isinstance(v, ObjectId) else v
     if "_id" in d:
         out["id"] = str(d["_id"])
+        # Stored legacy id (photocards): still resolves, see catalog.index_photocard_ids
+        if isinstance(d.get("id"), str) and d["id"] != out["id"]:
+            out["legacyId"] = d["id"]
     return out
 
 
@@ -146,26 +636,50 @@ def _group_doc_for_validation(d: dict) -> dict:
     return d
 
 
-async def get_groups_async() -> List[GroupSchema]:
-    """Return all groups. From MongoDB if connected, else from in-memory."""
+@_mongo_timed("get_groups_async")
+async def _fetch_groups(db, fields: FieldSet | None = None) -> List[GroupSchema]:
+    if fields is None:
+        cursor = db[GROUPS_COLLECTION].find({}).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+        return [GroupSchema.model_validate(_group_doc_for_validation(d)) async for d in cursor]
+    cursor = db[GROUPS_COLLECTION].find({}, fields.projection()).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    return [fields.construct(_group_doc_for_validation(d)) async for d in cursor]
+
+
+async def get_groups_async(fields: FieldSet | None = None) -> List[GroupSchema]:
+    """Return all groups. From MongoDB if connected, else from in-memory.
+
+    With fields (MongoDB), only those are read: the groups are partial, for serializing with
+    fields.include() only.
+    """
     if is_connected():
-        db = get_database()
+        db = get_catalog_database()
         if db is not None:
-            cursor = db[GROUPS_COLLECTION].find({}).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
-            return [GroupSchema.model_validate(_group_doc_for_validation(d)) async for d in cursor]
-    _ensure_memory_loaded()
-    return _groups
+            key = "groups" if fields is None else ("groups", fields.key)
+            return await _mongo_reads.do(key, lambda: _fetch_groups(db, fields))
+    return _memory_catalog().groups
+
 
+@_mongo_timed("get_photocards_async")
+async def _fetch_photocards(db, fields: FieldSet | None = None) -> List[PhotocardSchema]:
+    if fields is None:
+        cursor = db[PHOTOCARDS_COLLECTION].find({}).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+        return [PhotocardSchema.model_validate(_doc_for_validation(d)) async for d in cursor]
+    cursor = db[PHOTOCARDS_COLLECTION].find({}, fields.projection()).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    return [fields.construct(_doc_for_validation(d)) async for d in cursor]
 
-async def get_photocards_async() -> List[PhotocardSchema]:
-    """Return all photocards. From MongoDB if connected, else from in-memory."""
+
+async def get_photocards_async(fields: FieldSet | None = None) -> List[PhotocardSchema]:
+    """Return all photocards. From MongoDB if connected, else from in-memory.
+
+    With fields (MongoDB), only those are read (projection): the photocards are partial, for
+    serializing with fields.include() only.
+    """
     if is_connected():
-        db = get_database()
+        db = get_catalog_database()
         if db is not None:
-            cursor = db[PHOTOCARDS_COLLECTION].find({})
-            return [PhotocardSchema.model_validate(_doc_for_validation(d)) async for d in cursor]
-    _ensure_memory_loaded()
-    return _photocards
+            key = "photocards" if fields is None else ("photocards", fields.key)
+            return await _mongo_reads.do(key, lambda: _fetch_photocards(db, fields))
+    return _memory_catalog().photocards
 
 
 def _is_objectid_string(s: str) -> bool:
@@ -173,30 +687,33 @@ def _is_objectid_string(s: str) -> bool:
     return len(s) == 24 and all(c in "0123456789abcdefABCDEF" for c in s)
 
 
+@_mongo_timed("get_group_by_id_async")
+async def _fetch_group_by_id(db, group_id: str) -> GroupSchema | None:
+    doc = None
+    if _is_objectid_string(group_id):
+        try:
+            doc = await db[GROUPS_COLLECTION].find_one(
+                {"_id": ObjectId(group_id)},
+                max_time_ms=MONGODB_QUERY_TIMEOUT_MS,
+            )
+        except Exception:
+            pass
+    if doc is None:
+        doc = await db[GROUPS_COLLECTION].find_one(
+            {"id": group_id}, max_time_ms=MONGODB_QUERY_TIMEOUT_MS
+        )
+    return GroupSchema.model_validate(_group_doc_for_validation(doc)) if doc else None
+
+
 async def get_group_by_id_async(group_id: str) -> GroupSchema | None:
     """Return a single group by id (MongoDB _id string or legacy id) or None."""
     if is_connected():
-        db = get_database()
+        db = get_catalog_database()
         if db is not None:
-            doc = None
-            if _is_objectid_string(group_id):
-                try:
-                    doc = await db[GROUPS_COLLECTION].find_one(
-                        {"_id": ObjectId(group_id)},
-                        max_time_ms=MONGODB_QUERY_TIMEOUT_MS,
-                    )
-                except Exception:
-                    pass
-            if doc is None:
-                doc = await db[GROUPS_COLLECTION].find_one(
-                    {"id": group_id}, max_time_ms=MONGODB_QUERY_TIMEOUT_MS
-                )
-            return GroupSchema.model_validate(_group_doc_for_validation(doc)) if doc else None
-    _ensure_memory_loaded()
-    for g in _groups:
-        if g.id == group_id:
-            return g
-    return None
+            return await _mongo_reads.do(
+                ("group", group_id), lambda: _fetch_group_by_id(db, group_id)
+            )
+    return _memory_catalog().get_group(group_id)
 
 
 async def get_member_by_id_async(group_id: str, member_id: str) -> MemberSchema | None:
@@ -210,8 +727,79 @@ async def get_member_by_id_async(group_id: str, member_id: str) -> MemberSchema
     return None
 
 
+@_mongo_timed("get_photocard_by_id_async")
+async def _fetch_photocard_by_id(db, photocard_id: str) -> PhotocardSchema | None:
+    return (await _find_photocards_by_ids(db, [photocard_id], None)).get(photocard_id)
+
+
+async def get_photocard_by_id_async(photocard_id: str) -> PhotocardSchema | None:
+    """Return a single photocard by id or None (read model first, then MongoDB)."""
+    catalog = _current_catalog()
+    if catalog is not None:
+        return catalog.get_photocard(photocard_id)
+    db = get_catalog_database()
+    if db is None:
+        return None
+    return await _mongo_reads.do(
+        ("photocard", photocard_id), lambda: _fetch_photocard_by_id(db, photocard_id)
+    )
+
+
+async def _find_photocards_by_ids(
+    db, photocard_ids: List[str], fields: FieldSet | None
+) -> dict[str, PhotocardSchema]:
+    """One $in query for photocards whose _id or stored legacy id is among the ids, resolved like the
+    read model's id index (catalog.index_photocard_ids)."""
+    object_ids = [ObjectId(i) for i in photocard_ids if _is_objectid_string(i)]
+    clauses: list = [{"id": {"$in": photocard_ids}}]
+    if object_ids:
+        clauses.append({"_id": {"$in": object_ids}})
+    projection = None
+    if fields is not None:
+        # The stored legacy id is needed to match those ids back
+        projection = {**fields.projection(), "id": 1}
+    cursor = db[PHOTOCARDS_COLLECTION].find({"$or": clauses}, projection).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    photocards: List[PhotocardSchema] = []
+    async for d in cursor:
+        doc = _doc_for_validation(d)
+        pc = fields.construct(doc) if fields is not None else PhotocardSchema.model_validate(doc)
+        # Partial models skip excluded fields
+        pc.legacy_id = doc.get("legacyId")
+        photocards.append(pc)
+    index = index_photocard_ids({}, photocards)
+    return {i: photocards[index[i]] for i in photocard_ids if i in index}
+
+
+@_mongo_timed("get_photocards_by_ids_async")
+async def _fetch_photocards_by_ids(
+    db, photocard_ids: List[str], fields: FieldSet | None
+) -> dict[str, PhotocardSchema]:
+    return await _find_photocards_by_ids(db, photocard_ids, fields)
+
+
+async def get_photocards_by_ids_async(
+    photocard_ids: List[str], fields: FieldSet | None = None
+) -> dict[str, PhotocardSchema]:
+    """Photocards for the given ids, by id (ids not found are absent).
+
+    From the read model's id index when loaded, else one MongoDB $in query (with fields, only those are
+    read and the photocards are partial, for serializing with fields.include() only).
+    """
+    catalog = _current_catalog()
+    if catalog is not None:
+        index = catalog.photocard_index
+        return {i: catalog.photocards[index[i]] for i in photocard_ids if i in index}
+    db = get_catalog_database()
+    if db is None or not photocard_ids:
+        return {}
+    return await _fetch_photocards_by_ids(db, photocard_ids, fields)
+
+
 async def get_photocards_by_group_async(group_id: str) -> List[PhotocardSchema]:
     """Return photocards for a group."""
+    catalog = _current_catalog()
+    if catalog is not None:
+        return catalog.take(catalog.group_photocards.get(group_id, ()))
     all_pc = await get_photocards_async()
     return [p for p in all_pc if p.group_id == group_id]
 
@@ -222,6 +810,11 @@ async def get_photocards_by_group_paginated_async(
     offset: int = 0,
 ) -> dict:
     """Return paginated photocards for a group and total count."""
+    catalog = _current_catalog()
+    if catalog is not None:
+        positions = catalog.group_photocards.get(group_id, [])
+        page = catalog.take(positions[offset : offset + limit])
+        return {"photocards": page, "total_photocards": len(positions)}
     all_pc = await get_photocards_by_group_async(group_id)
     total = len(all_pc)
     page = all_pc[offset : offset + limit]
@@ -230,17 +823,72 @@ async def get_photocards_by_group_paginated_async(
 
 async def get_photocards_by_member_async(member_id: str) -> List[PhotocardSchema]:
     """Return photocards for a member."""
+    catalog = _current_catalog()
+    if catalog is not None:
+        return catalog.take(catalog.member_photocards.get(member_id, ()))
     all_pc = await get_photocards_async()
     return [p for p in all_pc if p.member_id == member_id]
 
 
+async def get_bootstrap_async(per_group: int = 12) -> dict:
+    """Every group with its photocard count and first per_group photocards, plus the catalog version.
+
+    From the in-process catalog's indexes when loaded; otherwise the group pages are read concurrently
+    (their photocard reads share one MongoDB query) and the version is None.
+    """
+    catalog = _current_catalog()
+    if catalog is not None:
+        groups = catalog.groups
+        pages = []
+        for g in groups:
+            positions = catalog.group_photocards.get(g.id, [])
+            pages.append({"photocards": catalog.take(positions[:per_group]), "total_photocards": len(positions)})
+        version = catalog.version
+    else:
+        groups = await get_groups_async()
+        pages = await asyncio.gather(
+            *(get_photocards_by_group_paginated_async(g.id, limit=per_group) for g in groups)
+        )
+        version = None
+    return {
+        "version": version,
+        "groups": [{"group": g, **page} for g, page in zip(groups, pages)],
+    }
+
+
+def _match_groups_and_members(
+    groups: List[GroupSchema], q: str, terms: Collection[str] = ()
+) -> tuple[List[GroupSchema], List[MemberSchema]]:
+    """Groups and members whose name (case-insensitive) or Korean name contains q,
+    or whose lowercased name or Korean name is one of terms (fuzzy / Hangul matches)."""
+    matched_groups = [
+        g for g in groups
+        if q in (g.name or "").lower() or q in (g.korean_name or "")
+        or (g.name or "").lower() in terms or g.korean_name in terms
+    ]
+    matched_members = [
+        m for g in groups for m in g.members
+        if q in (m.name or "").lower() or q in (m.korean_name or "")
+        or (m.name or "").lower() in terms or m.korean_name in terms
+    ]
+    return matched_groups, matched_members
+
+
 async def search_catalog_async(
     query: str,
     pc_limit: int = 40,
     pc_offset: int = 0,
+    fuzzy: bool = False,
 ) -> dict:
-    """Search groups, members, and photocards by query string. Photocards are paginated."""
+    """Search groups, members, and photocards by query string. Photocards are paginated.
+
+    With fuzzy=True, group names, member names and albums within a small edit distance of the
+    query also match (needs the in-process catalog; ignored on the per-request MongoDB fallback).
+    """
     q = query.lower().strip()
+    catalog = _current_catalog()
+    if catalog is not None:
+        return _search_memory_catalog(catalog, q, pc_limit, pc_offset, fuzzy)
     groups = await get_groups_async()
     all_pc = await get_photocards_async()
     if not q:
@@ -253,14 +901,7 @@ async def search_catalog_async(
             "photocards": photocards,
             "total_photocards": total_photocards,
         }
-    matched_groups = [
-        g for g in groups
-        if q in (g.name or "").lower() or q in (g.korean_name or "")
-    ]
-    matched_members = [
-        m for g in groups for m in g.members
-        if q in (m.name or "").lower() or q in (m.korean_name or "")
-    ]
+    matched_groups, matched_members = _match_groups_and_members(groups, q)
     matched_photocards = [
         p for p in all_pc
         if q in (p.album or "").lower() or q in (p.member_name or "").lower()
@@ -276,11 +917,133 @@ async def search_catalog_async(
     }
 
 
+def suggest_catalog(query: str, limit: int = 8) -> List[dict]:
+    """Top group/member/album suggestions for a typed prefix, most photocards first.
+
+    Served from the in-process catalog's prefix index; empty when no catalog is loaded.
+    """
+    catalog = _current_catalog()
+    if catalog is None:
+        return []
+    return [
+        {"type": kind, "id": None if kind == "album" else key, "label": label}
+        for kind, key, label in catalog.suggest.top(query, limit)
+    ]
+
+
+def _search_memory_catalog(
+    catalog: Catalog, q: str, pc_limit: int, pc_offset: int, fuzzy: bool = False
+) -> dict:
+    """search_catalog_async over the in-process catalog, using its search-term index."""
+    if not q:
+        return {
+            "groups": catalog.groups,
+            "members": [m for g in catalog.groups for m in g.members],
+            "photocards": catalog.photocards[pc_offset : pc_offset + pc_limit],
+            "total_photocards": len(catalog.photocards),
+        }
+    matches = _search_cache.get(catalog.version, q, fuzzy)
+    if matches is None:
+        terms = catalog.fuzzy_terms(q) if fuzzy else set()
+        terms |= catalog.hangul_terms(q)
+        matched_groups, matched_members = _match_groups_and_members(catalog.groups, q, terms)
+        positions = array("I", catalog.match_photocards(q, terms))
+        matches = SearchMatches(matched_groups, matched_members, positions)
+        _search_cache.put(catalog.version, q, fuzzy, matches)
+    return {
+        "groups": matches.groups,
+        "members": matches.members,
+        "photocards": catalog.take(matches.positions[pc_offset : pc_offset + pc_limit]),
+        "total_photocards": len(matches.positions),
+    }
+
+
+def single_flight_stats() -> dict:
+    """How many MongoDB reads joined an identical in-flight query."""
+    return _mongo_reads.stats()
+
+
+def search_cache_stats() -> dict:
+    """Hit rate and approximate memory footprint of the search result cache."""
+    return _search_cache.stats()
+
+
 def _normalize_id(s: str) -> str:
     """Lowercase and remove spaces for memberId/groupId."""
     return "".join(s.lower().split())
 
 
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+
+def _canonical_image_url(url: str) -> str:
+    """Image URL with scheme and host lowercased, default port and fragment dropped."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    port = _DEFAULT_PORTS.get(scheme)
+    if port and netloc.endswith(port):
+        netloc = netloc[: -len(port)]
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def _content_key(
+    group_name: str, member_name: str, album: str, version: str, type_: str, image_url: str
+) -> str:
+    """Hash identifying the same card submitted twice (``contentKey`` on submissions and photocards):
+    group/member as ids, album/version case-folded with whitespace collapsed, canonical image URL."""
+    parts = (
+        _normalize_id(group_name),
+        _normalize_id(member_name),
+        " ".join(album.casefold().split()),
+        " ".join(version.casefold().split()),
+        type_,
+        _canonical_image_url(image_url),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+class DuplicateSubmission(Exception):
+    """The submitted card is already a photocard or a pending/accepted submission."""
+
+    def __init__(
+        self, submission: SubmissionSchema | None = None, photocard: PhotocardSchema | None = None
+    ) -> None:
+        super().__init__(submission.id if submission is not None else photocard.id)
+        self.submission = submission
+        self.photocard = photocard
+
+
+def _photocard_doc(
+    member_id: str,
+    member_name: str,
+    group_id: str,
+    group_name: str,
+    album: str,
+    version: str,
+    year: int,
+    type_: str,
+    image_url: str,
+    back_image_url: str | None,
+) -> dict:
+    """Build a photocard MongoDB document (groupId stored as ObjectId when it is one)."""
+    return {
+        "id": f"pc-{uuid.uuid4().hex[:12]}",
+        "memberId": member_id,
+        "memberName": member_name,
+        "groupId": ObjectId(group_id) if _is_objectid_string(group_id) else group_id,
+        "groupName": group_name,
+        "album": album,
+        "version": version,
+        "year": year,
+        "type": type_,
+        "imageUrl": image_url,
+        "backImageUrl": back_image_url,
+        "contentKey": _content_key(group_name, member_name, album, version, type_, image_url),
+    }
+
+
+@_mongo_timed("insert_photocard_async")
 async def insert_photocard_async(
     member_name: str,
     group_name: str,
@@ -301,24 +1064,17 @@ async def insert_photocard_async(
         {"id": group_id_normalized}, max_time_ms=MONGODB_QUERY_TIMEOUT_MS
     )
     group_id = str(group_doc["_id"]) if group_doc else group_id_normalized
-    pc_id = f"pc-{uuid.uuid4().hex[:12]}"
-    doc = {
-        "id": pc_id,
-        "memberId": member_id,
-        "memberName": member_name,
-        "groupId": ObjectId(group_id) if _is_objectid_string(group_id) else group_id,
-        "groupName": group_name,
-        "album": album,
-        "version": version,
-        "year": year,
-        "type": type_,
-        "imageUrl": image_url,
-        "backImageUrl": back_image_url,
-    }
+    doc = _photocard_doc(
+        member_id, member_name, group_id, group_name, album, version, year, type_,
+        image_url, back_image_url,
+    )
     await db[PHOTOCARDS_COLLECTION].insert_one(doc)
-    return PhotocardSchema.model_validate(_doc_for_validation(doc))
+    photocard = PhotocardSchema.model_validate(_doc_for_validation(doc))
+    _apply_new_photocards([photocard])
+    return photocard
 
 
+@_mongo_timed("insert_submission_async")
 async def insert_submission_async(
     member_name: str,
     group_name: str,
@@ -332,22 +1088,22 @@ async def insert_submission_async(
     back_image_url: str | None = None,
     status: str = "accepted",
 ) -> SubmissionSchema | None:
-    """Insert a submission record into MongoDB. Returns created submission or None if not connected."""
+    """Insert a submission record into MongoDB. Returns created submission or None if not connected.
+
+    Raises DuplicateSubmission with the existing record when a photocard (indexed ``contentKey``
+    lookup, run alongside the group lookup) or a pending/accepted submission (unique partial index,
+    so the insert itself fails) has the same content key. With SUBMISSION_BATCH_MS set, concurrent
+    inserts are written together (see _insert_submissions).
+    """
     db = get_database()
     if db is None:
         return None
-    member_id = _normalize_id(member_name)
-    group_id_normalized = _normalize_id(group_name)
-    group_doc = await db[GROUPS_COLLECTION].find_one(
-        {"id": group_id_normalized}, max_time_ms=MONGODB_QUERY_TIMEOUT_MS
-    )
-    group_id = str(group_doc["_id"]) if group_doc else group_id_normalized
-    sub_id = f"sub-{uuid.uuid4().hex[:12]}"
     doc = {
-        "id": sub_id,
-        "memberId": member_id,
+        "id": f"sub-{uuid.uuid4().hex[:12]}",
+        "memberId": _normalize_id(member_name),
         "memberName": member_name,
-        "groupId": group_id,
+        # Normalized group id; replaced by the group's _id when it exists
+        "groupId": _normalize_id(group_name),
         "groupName": group_name,
         "album": album,
         "version": version,
@@ -359,9 +1115,102 @@ async def insert_submission_async(
         "submittedAt": datetime.now(timezone.utc),
         "status": status,
         "photocardId": photocard_id,
+        "contentKey": _content_key(group_name, member_name, album, version, type_, image_url),
     }
-    await db[SUBMISSIONS_COLLECTION].insert_one(doc)
-    return SubmissionSchema.model_validate(_submission_doc_for_validation(doc))
+    batcher = _submission_batcher()
+    if batcher is not None:
+        return await batcher.submit(doc)
+    result = (await _insert_submissions([doc]))[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+@_mongo_timed("insert_submissions_batch")
+async def _insert_submissions(docs: List[dict]) -> List[SubmissionSchema | Exception]:
+    """Insert submission docs with one group ``$in`` query and one photocard ``contentKey`` ``$in``
+    query (concurrently), then one unordered insert_many. Returns a result per doc: the submission,
+    DuplicateSubmission, or the write error for that doc."""
+    db = get_database()
+    if db is None:
+        raise RuntimeError("MongoDB is not connected")
+    group_docs, photocard_docs = await asyncio.gather(
+        db[GROUPS_COLLECTION].find(
+            {"id": {"$in": list({d["groupId"] for d in docs})}}, {"id": 1}
+        ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS).to_list(None),
+        db[PHOTOCARDS_COLLECTION].find(
+            {"contentKey": {"$in": [d["contentKey"] for d in docs]}}
+        ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS).to_list(None),
+    )
+    group_ids = {g["id"]: str(g["_id"]) for g in group_docs}
+    photocards_by_key = {p["contentKey"]: p for p in photocard_docs}
+    results: List[SubmissionSchema | Exception | None] = [None] * len(docs)
+    to_insert: List[int] = []
+    for i, doc in enumerate(docs):
+        photocard = photocards_by_key.get(doc["contentKey"])
+        if photocard is not None:
+            results[i] = DuplicateSubmission(photocard=PhotocardSchema.model_validate(_doc_for_validation(photocard)))
+            continue
+        doc["groupId"] = group_ids.get(doc["groupId"], doc["groupId"])
+        to_insert.append(i)
+    if not to_insert:
+        return results
+    write_errors: dict[int, dict] = {}
+    try:
+        await db[SUBMISSIONS_COLLECTION].insert_many([docs[i] for i in to_insert], ordered=False)
+    except BulkWriteError as e:
+        write_errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+    # Content key taken by a pending/accepted submission (possibly one earlier in this batch)
+    duplicate_keys = [docs[to_insert[j]]["contentKey"] for j, err in write_errors.items() if err.get("code") == 11000]
+    existing = {}
+    if duplicate_keys:
+        cursor = db[SUBMISSIONS_COLLECTION].find({"contentKey": {"$in": duplicate_keys}}).max_time_ms(
+            MONGODB_QUERY_TIMEOUT_MS
+        )
+        existing = {d["contentKey"]: d async for d in cursor}
+    for j, i in enumerate(to_insert):
+        err = write_errors.get(j)
+        holder = existing.get(docs[i]["contentKey"])
+        if err is None:
+            results[i] = SubmissionSchema.model_validate(_submission_doc_for_validation(docs[i]))
+        elif holder is not None and err.get("code") == 11000:
+            results[i] = DuplicateSubmission(
+                submission=SubmissionSchema.model_validate(_submission_doc_for_validation(holder))
+            )
+        else:
+            # Includes a duplicate whose holder was rejected (key released) since the insert
+            results[i] = WriteError(err.get("errmsg", "write failed"), err.get("code"), err)
+    return results
+
+
+def _submission_batcher() -> Coalescer | None:
+    """The submission write coalescer, or None when SUBMISSION_BATCH_MS is 0."""
+    global _submissions_coalescer
+    settings = get_settings()
+    if settings.submission_batch_ms <= 0:
+        return None
+    if _submissions_coalescer is None:
+        _submissions_coalescer = Coalescer(
+            _insert_submissions, settings.submission_batch_ms / 1000, settings.submission_batch_max
+        )
+    return _submissions_coalescer
+
+
+async def close_submission_batcher(timeout: float = 10) -> None:
+    """Write submissions still waiting for a batch (up to timeout seconds). Call on app shutdown,
+    before closing MongoDB."""
+    global _submissions_coalescer
+    if _submissions_coalescer is None:
+        return
+    await _submissions_coalescer.close(timeout)
+    _submissions_coalescer = None
+
+
+def submission_batch_stats() -> dict:
+    """Submission write batches: items, batches and sizes (this process)."""
+    if _submissions_coalescer is None:
+        return {"enabled": get_settings().submission_batch_ms > 0, "items": 0, "batches": 0}
+    return {"enabled": True, **_submissions_coalescer.stats()}
 
 
 def _submission_doc_for_validation(d: dict) -> dict:
@@ -378,6 +1227,166 @@ def _submission_doc_for_validation(d: dict) -> dict:
     return out
 
 
+@_mongo_timed("get_submission_hashes_async")
+async def get_submission_hashes_async(since: datetime | None = None) -> List[tuple[str, str, datetime]]:
+    """(id, imageHash, imageHashedAt) of submissions with an image hash, hashed after since if given."""
+    db = get_database()
+    if db is None:
+        return []
+    query: dict = {"imageHash": {"$exists": True}}
+    if since is not None:
+        query["imageHashedAt"] = {"$gt": since}
+    cursor = db[SUBMISSIONS_COLLECTION].find(
+        query, {"_id": 0, "id": 1, "imageHash": 1, "imageHashedAt": 1}
+    ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    return [(d["id"], d["imageHash"], d["imageHashedAt"]) async for d in cursor]
+
+
+@_mongo_timed("set_submission_duplicates_async")
+async def set_submission_duplicates_async(
+    submission_id: str, image_hash: str, near_duplicates: List[dict]
+) -> None:
+    """Record a submission's image hash and near-duplicates ({kind, id, distance}), and add it to
+    the near-duplicates of the submissions it matched. MongoDB only."""
+    db = get_database()
+    if db is None:
+        return
+    ops = [
+        UpdateOne(
+            {"id": submission_id},
+            {"$set": {
+                "imageHash": image_hash,
+                "imageHashedAt": datetime.now(timezone.utc),
+                "nearDuplicates": near_duplicates,
+            }},
+        )
+    ]
+    for d in near_duplicates:
+        if d["kind"] == "submission":
+            ops.append(UpdateOne(
+                {"id": d["id"]},
+                {"$push": {"nearDuplicates": {"kind": "submission", "id": submission_id, "distance": d["distance"]}}},
+            ))
+    await db[SUBMISSIONS_COLLECTION].bulk_write(ops, ordered=False)
+
+
+async def _release_failed_accepts(db, new_docs: dict[str, dict], review_batch: str) -> dict[str, dict]:
+    """After a failed photocard insert: put the claimed submissions whose photocard doesn't exist back
+    to pending (so they can be moderated again) and return the ones that were inserted."""
+    cursor = db[PHOTOCARDS_COLLECTION].find(
+        {"_id": {"$in": [d["_id"] for d in new_docs.values()]}}, {"_id": 1}
+    ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    inserted = {d["_id"] async for d in cursor}
+    failed = [sub_id for sub_id, d in new_docs.items() if d["_id"] not in inserted]
+    if failed:
+        await db[SUBMISSIONS_COLLECTION].update_many(
+            {"id": {"$in": failed}, "reviewBatch": review_batch, "status": "accepted"},
+            {
+                "$set": {"status": "pending"},
+                "$unset": {"photocardId": "", "reviewedAt": "", "reviewedBy": "", "reviewBatch": ""},
+            },
+        )
+        logger.warning("Returned %d submissions to pending after the failed insert: %s", len(failed), failed)
+    return {sub_id: d for sub_id, d in new_docs.items() if d["_id"] in inserted}
+
+
+@_mongo_timed("moderate_submissions_async")
+async def moderate_submissions_async(
+    accept_ids: List[str],
+    reject_ids: List[str],
+    reviewer_email: str,
+) -> dict | None:
+    """Accept and/or reject pending submissions in bulk. MongoDB only; None if not connected.
+
+    Accepted submissions are promoted to photocards. Uses one read to load the pending
+    submissions, one bulk_write to claim them and one insert_many for the new photocards, then
+    adds those photocards to the in-process indexes incrementally. Ids that are unknown, not
+    pending, or claimed first by a concurrent request are returned as skipped, as are accepts whose
+    photocard insert failed (those go back to pending).
+    """
+    db = get_database()
+    if db is None:
+        return None
+    accept_ids = list(dict.fromkeys(accept_ids))
+    accept_set = set(accept_ids)
+    reject_ids = [i for i in dict.fromkeys(reject_ids) if i not in accept_set]
+    requested = accept_ids + reject_ids
+    cursor = db[SUBMISSIONS_COLLECTION].find(
+        {"id": {"$in": requested}, "status": "pending"}
+    ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    pending = {d["id"]: d async for d in cursor}
+
+    reviewed_at = datetime.now(timezone.utc)
+    review_batch = uuid.uuid4().hex
+    review_fields = {"reviewedAt": reviewed_at, "reviewedBy": reviewer_email, "reviewBatch": review_batch}
+    # Photocard _ids are assigned up front so the claim can record photocardId
+    new_docs: dict[str, dict] = {}
+    ops = []
+    for sub_id in accept_ids:
+        sub = pending.get(sub_id)
+        if sub is None:
+            continue
+        doc = _photocard_doc(
+            sub["memberId"], sub["memberName"], str(sub["groupId"]), sub["groupName"],
+            sub["album"], sub["version"], sub["year"], sub["type"],
+            sub["imageUrl"], sub.get("backImageUrl"),
+        )
+        doc["_id"] = ObjectId()
+        new_docs[sub_id] = doc
+        ops.append(
+            UpdateOne(
+                {"id": sub_id, "status": "pending"},
+                {"$set": {"status": "accepted", "photocardId": str(doc["_id"]), **review_fields}},
+            )
+        )
+    rejected = [i for i in reject_ids if i in pending]
+    for sub_id in rejected:
+        ops.append(
+            # Releases the content key so the card can be submitted again
+            UpdateOne(
+                {"id": sub_id, "status": "pending"},
+                {"$set": {"status": "rejected", **review_fields}, "$unset": {"contentKey": ""}},
+            )
+        )
+    if ops:
+        result = await db[SUBMISSIONS_COLLECTION].bulk_write(ops, ordered=False)
+        if result.modified_count != len(ops):
+            # A concurrent moderation claimed some of these first; keep only our claims
+            claimed_cursor = db[SUBMISSIONS_COLLECTION].find(
+                {"id": {"$in": list(pending)}, "reviewBatch": review_batch}, {"id": 1}
+            ).max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+            claimed = {d["id"] async for d in claimed_cursor}
+            new_docs = {k: v for k, v in new_docs.items() if k in claimed}
+            rejected = [i for i in rejected if i in claimed]
+
+    photocards: List[PhotocardSchema] = []
+    if new_docs:
+        try:
+            await db[PHOTOCARDS_COLLECTION].insert_many(list(new_docs.values()), ordered=False)
+        except Exception as e:
+            logger.error("Photocard insert for moderation batch %s failed: %s", review_batch, e)
+            new_docs = await _release_failed_accepts(db, new_docs, review_batch)
+        docs = list(new_docs.values())
+        photocards = [PhotocardSchema.model_validate(_doc_for_validation(d)) for d in docs]
+        _apply_new_photocards(photocards)
+    accepted = list(new_docs)
+    done = set(accepted) | set(rejected)
+    logger.info(
+        "Moderation by %s: %d accepted, %d rejected, %d skipped",
+        reviewer_email,
+        len(accepted),
+        len(rejected),
+        len(requested) - len(done),
+    )
+    return {
+        "accepted": accepted,
+        "rejected": rejected,
+        "skipped": [i for i in requested if i not in done],
+        "photocards": photocards,
+    }
+
+
+@_mongo_timed("get_submissions_by_email_async")
 async def get_submissions_by_email_async(user_email: str, limit: int = 50) -> List[SubmissionSchema]:
     """Return submissions for a user, newest first. MongoDB only."""
     db = get_database()
@@ -396,27 +1405,37 @@ async def get_submissions_by_email_async(user_email: str, limit: int = 50) -> Li
     return results
 
 
+@_mongo_timed("get_pending_submissions_async")
+async def get_pending_submissions_async(limit: int = 50) -> List[ModeratorSubmissionSchema]:
+    """Return pending submissions for moderators, oldest first, with their near-duplicates. MongoDB only."""
+    db = get_database()
+    if db is None:
+        return []
+    cursor = (
+        db[SUBMISSIONS_COLLECTION]
+        .find({"status": "pending"})
+        .sort("submittedAt", 1)
+        .limit(limit)
+        .max_time_ms(MONGODB_QUERY_TIMEOUT_MS)
+    )
+    return [ModeratorSubmissionSchema.model_validate(_submission_doc_for_validation(d)) async for d in cursor]
+
+
 # ---- Sync access (kept for backward compatibility; prefer async) ----
 
 def get_groups() -> List[GroupSchema]:
     """Return all groups from in-memory (call only when not using MongoDB)."""
-    _ensure_memory_loaded()
-    return _groups
+    return _memory_catalog().groups
 
 
 def get_photocards() -> List[PhotocardSchema]:
     """Return all photocards from in-memory."""
-    _ensure_memory_loaded()
-    return _photocards
+    return _memory_catalog().photocards
 
 
 def get_group_by_id(group_id: str) -> GroupSchema | None:
     """Return a single group by id (in-memory only)."""
-    _ensure_memory_loaded()
-    for g in _groups:
-        if g.id == group_id:
-            return g
-    return None
+    return _memory_catalog().get_group(group_id)
 
 
 def get_member_by_id(group_id: str, member_id: str) -> MemberSchema | None:
@@ -432,38 +1451,30 @@ def get_member_by_id(group_id: str, member_id: str) -> MemberSchema | None:
 
 def get_photocards_by_member(member_id: str) -> List[PhotocardSchema]:
     """Return photocards for a member (in-memory only)."""
-    _ensure_memory_loaded()
-    return [p for p in _photocards if p.member_id == member_id]
+    catalog = _memory_catalog()
+    return catalog.take(catalog.member_photocards.get(member_id, ()))
 
 
 def get_photocards_by_group(group_id: str) -> List[PhotocardSchema]:
     """Return photocards for a group (in-memory only)."""
-    _ensure_memory_loaded()
-    return [p for p in _photocards if p.group_id == group_id]
+    catalog = _memory_catalog()
+    return catalog.take(catalog.group_photocards.get(group_id, ()))
 
 
 def search_catalog(query: str) -> dict:
     """Search (in-memory only). Use search_catalog_async when using MongoDB."""
-    _ensure_memory_loaded()
+    catalog = _memory_catalog()
     q = query.lower().strip()
     if not q:
         return {
-            "groups": _groups,
-            "members": [m for g in _groups for m in g.members],
-            "photocards": _photocards,
+            "groups": catalog.groups,
+            "members": [m for g in catalog.groups for m in g.members],
+            "photocards": catalog.photocards,
         }
-    matched_groups = [g for g in _groups if q in g.name.lower() or q in g.korean_name]
-    matched_members = [
-        m for g in _groups for m in g.members
-        if q in m.name.lower() or q in m.korean_name
-    ]
-    matched_photocards = [
-        p for p in _photocards
-        if q in p.album.lower() or q in p.member_name.lower()
-        or q in p.group_name.lower() or q in p.version.lower()
-    ]
+    terms = catalog.hangul_terms(q)
+    matched_groups, matched_members = _match_groups_and_members(catalog.groups, q, terms)
     return {
         "groups": matched_groups,
         "members": matched_members,
-        "photocards": matched_photocards,
+        "photocards": catalog.take(catalog.match_photocards(q, terms)),
     }
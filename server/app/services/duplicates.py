@@ -0,0 +1,126 @@
+"""
+Near-duplicate detection for submissions.
+
+After a submission is stored, a ``duplicate_check`` job (jobs.py) fetches and dHashes its front
+image and looks it up in an in-process HashIndex (image_hash.py) over
+every photocard with a hash (computed by image_meta.py) and every hashed submission. Matches within
+DUPLICATE_MAX_DISTANCE bits are written to the submission's ``nearDuplicates`` (closest first) and
+the submission is added to those of the submissions it matched, so moderators see resubmissions
+of the same card from either side (GET /moderation/submissions; submitters never see them). With
+JOB_WORKERS=0 the check runs inline in POST /photocards.
+
+The index is synced lazily before each lookup: photocards when the catalog version changed,
+submissions hashed since the last sync (including by other workers) with one query.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.schemas.submission import SubmissionSchema
+from app.services.data_loader import (
+    catalog_version,
+    get_submission_hashes_async,
+    photocard_image_hashes,
+    set_submission_duplicates_async,
+)
+from app.services.image_hash import HashIndex, dhash, hash_hex
+from app.services.jobs import enqueue_job, job_queue_enabled, register_job_handler
+from app.services.thumbnails import ImageUnavailable, fetch_origin
+
+logger = get_logger(__name__)
+
+# Near-duplicates recorded per submission
+MAX_NEAR_DUPLICATES = 10
+
+_index: Optional[HashIndex] = None
+_indexed_catalog_version: Optional[str] = None
+_submissions_synced_at: Optional[datetime] = None
+_checked = 0
+_flagged = 0
+_failed = 0
+
+
+async def _synced_index() -> HashIndex:
+    global _index, _indexed_catalog_version, _submissions_synced_at
+    if _index is None:
+        _index = HashIndex(get_settings().duplicate_max_distance)
+    version = catalog_version()
+    if version != _indexed_catalog_version:
+        for pid, value in photocard_image_hashes():
+            _index.add(("photocard", pid), int(value, 16))
+        _indexed_catalog_version = version
+    for sub_id, value, hashed_at in await get_submission_hashes_async(_submissions_synced_at):
+        _index.add(("submission", sub_id), int(value, 16))
+        if _submissions_synced_at is None or hashed_at > _submissions_synced_at:
+            _submissions_synced_at = hashed_at
+    return _index
+
+
+async def check_submission(submission_id: str, image_url: str) -> list[dict]:
+    """Hash the submission's image, record its near-duplicates and return them."""
+    global _checked, _flagged
+    data = await fetch_origin(image_url)
+    try:
+        value = await asyncio.to_thread(dhash, data)
+    except (OSError, ValueError) as e:
+        raise ImageUnavailable(f"not a decodable image: {e}") from e
+    index = await _synced_index()
+    key = ("submission", submission_id)
+    matches = [
+        {"kind": kind, "id": match_id, "distance": distance}
+        for distance, (kind, match_id) in index.search(value)
+        if (kind, match_id) != key
+    ][:MAX_NEAR_DUPLICATES]
+    index.add(key, value)
+    await set_submission_duplicates_async(submission_id, hash_hex(value), matches)
+    _checked += 1
+    if matches:
+        _flagged += 1
+        logger.info(
+            "Submission %s looks like %s",
+            submission_id,
+            ", ".join(f"{m['kind']} {m['id']} (distance {m['distance']})" for m in matches),
+        )
+    return matches
+
+
+async def _duplicate_check_job(payload: dict) -> None:
+    global _failed
+    try:
+        await check_submission(payload["submissionId"], payload["imageUrl"])
+    except ImageUnavailable as e:
+        # Broken or missing image: retrying won't help
+        _failed += 1
+        logger.info("Near-duplicate check skipped for %s: %s", payload["submissionId"], e)
+
+
+register_job_handler("duplicate_check", _duplicate_check_job)
+
+
+async def enqueue_duplicate_check(submission: SubmissionSchema) -> bool:
+    """Queue the check as a background job (no-op when DUPLICATE_MAX_DISTANCE is 0). Without a job
+    queue (JOB_WORKERS=0) it runs inline instead, before the submission is returned."""
+    if get_settings().duplicate_max_distance <= 0:
+        return False
+    payload = {"submissionId": submission.id, "imageUrl": submission.image_url}
+    if job_queue_enabled():
+        return await enqueue_job("duplicate_check", payload)
+    try:
+        await _duplicate_check_job(payload)
+    except Exception as e:
+        # The submission is stored; it just has no near-duplicate check
+        logger.warning("Near-duplicate check for %s failed: %s", submission.id, e)
+        return False
+    return True
+
+
+def duplicate_index_stats() -> dict:
+    return {
+        "indexed": len(_index) if _index is not None else 0,
+        "checked": _checked,
+        "flagged": _flagged,
+        "failed": _failed,
+    }
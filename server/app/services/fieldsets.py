@@ -0,0 +1,135 @@
+"""
+Sparse fieldsets for ``fields=`` on listing, search and group endpoints.
+
+``fields`` is a comma-separated list of a schema's JSON names (aliases), for example
+``fields=id,imageUrl,memberName,version``. A field holding a list of models can be narrowed with
+``parent.child`` (``members.name``). A FieldSet turns the selection into a Pydantic ``include``, so only
+those keys are serialized, and into a MongoDB projection, so only those fields are read and transferred.
+Computed fields such as thumbnailUrl derive from the id, which is always read.
+"""
+
+import typing
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Type
+
+from pydantic import BaseModel
+
+# Most names accepted in one fields= value
+MAX_FIELDS = 50
+
+
+def _list_item_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The model in List[Model] (or Model), if the annotation is one."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if typing.get_origin(annotation) in (list, List):
+        args = typing.get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _public_fields(model: Type[BaseModel]) -> Dict[str, str]:
+    """Alias -> field name for the fields a response can carry (stored and computed, not excluded)."""
+    out = {(f.alias or name): name for name, f in model.model_fields.items() if not f.exclude}
+    out.update({(c.alias or name): name for name, c in model.model_computed_fields.items()})
+    return out
+
+
+class FieldSet:
+    """A validated selection of a model's fields (and of sub-fields of its nested model lists)."""
+
+    def __init__(self, model: Type[BaseModel], selected: Dict[str, Optional[FrozenSet[str]]]) -> None:
+        self.model = model
+        # field name -> None (whole field) or the selected sub-field names
+        self.selected = selected
+
+    @classmethod
+    def parse(cls, model: Type[BaseModel], spec: str) -> "FieldSet":
+        """Parse a fields= value; ValueError names unknown fields and lists the allowed ones."""
+        names = [n.strip() for n in spec.split(",") if n.strip()]
+        if not names:
+            raise ValueError("fields must name at least one field")
+        if len(names) > MAX_FIELDS:
+            raise ValueError(f"fields accepts at most {MAX_FIELDS} names")
+        public = _public_fields(model)
+        selected: Dict[str, Optional[Set[str]]] = {}
+        unknown = []
+        for name in names:
+            parent, _, child = name.partition(".")
+            field = public.get(parent)
+            if field is None:
+                unknown.append(name)
+                continue
+            if not child:
+                selected[field] = None
+                continue
+            info = model.model_fields.get(field)
+            sub_model = _list_item_model(info.annotation) if info is not None else None
+            sub_field = _public_fields(sub_model).get(child) if sub_model is not None else None
+            if sub_field is None:
+                unknown.append(name)
+            elif field not in selected:
+                selected[field] = {sub_field}
+            elif selected[field] is not None:
+                selected[field].add(sub_field)
+        if unknown:
+            allowed = sorted(public)
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+        return cls(model, {k: frozenset(v) if v is not None else None for k, v in selected.items()})
+
+    @property
+    def key(self) -> tuple:
+        """Hashable identity (e.g. for single-flight keys)."""
+        selected = tuple(sorted((name, tuple(sorted(sub or ()))) for name, sub in self.selected.items()))
+        return (self.model.__name__, selected)
+
+    def include(self) -> Dict[str, Any]:
+        """Pydantic include for one instance of the model."""
+        return {
+            name: True if sub is None else {"__all__": set(sub)}
+            for name, sub in self.selected.items()
+        }
+
+    def projection(self) -> Dict[str, int]:
+        """MongoDB projection reading only the selected fields (by alias; ``_id`` is always returned)."""
+        fields = self.model.model_fields
+        projection: Dict[str, int] = {}
+        for name, sub in self.selected.items():
+            info = fields.get(name)
+            if info is None or name == "id":
+                # The id is stored as _id; computed fields are built from it
+                continue
+            alias = info.alias or name
+            if sub is None:
+                projection[alias] = 1
+                continue
+            sub_fields = _list_item_model(info.annotation).model_fields
+            for sub_name in sub:
+                sub_info = sub_fields.get(sub_name)
+                if sub_info is not None:
+                    projection[f"{alias}.{sub_info.alias or sub_name}"] = 1
+        return projection or {"_id": 1}
+
+    def construct(self, data: Dict[str, Any]) -> BaseModel:
+        """Model instance from a projected document (by alias), without validation.
+
+        Only the selected fields (and the id) are set, so serialize it with include().
+        """
+        return _construct(self.model, data)
+
+
+def _construct(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    values = {}
+    for alias, name in _public_fields(model).items():
+        if alias not in data or name not in model.model_fields:
+            continue
+        value = data[alias]
+        sub_model = _list_item_model(model.model_fields[name].annotation)
+        if sub_model is not None and isinstance(value, list):
+            value = [_construct(sub_model, v) if isinstance(v, dict) else v for v in value]
+        elif sub_model is not None and isinstance(value, dict):
+            value = _construct(sub_model, value)
+        values[name] = value
+    return model.model_construct(**values)
@@ -0,0 +1,145 @@
+"""
+Typo-tolerant term lookup using a SymSpell-style deletion index.
+
+Every indexed key is stored under each string obtained by deleting up to ``max_distance``
+characters from it. A query generates its own deletions and looks them up, so candidate terms
+within the edit distance are found with a handful of dict lookups; only those candidates are
+checked with a real edit-distance computation.
+"""
+
+from typing import Dict, Iterable, Optional, Set
+
+# Queries shorter than this only tolerate one edit (two edits on "rei" match almost anything)
+_TWO_EDITS_MIN_LEN = 5
+# Words shorter than this are not indexed on their own (only as part of the full term)
+_MIN_WORD_LEN = 3
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings obtained from word by deleting up to max_distance characters (word included)."""
+    out = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        nxt = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1 :])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (edits incl. adjacent transposition); max_distance + 1 if above."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            row_min = min(row_min, v)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def max_distance_for(query: str) -> int:
+    return 2 if len(query) >= _TWO_EDITS_MIN_LEN else 1
+
+
+class DeletionIndex:
+    """Deletion dictionary over lowercased catalog terms (names, albums) and their words.
+
+    Filled with update() while a catalog is built, then treated as immutable: with_terms() returns
+    a new index that shares this one's dictionaries and keeps the added terms in a small layer of
+    its own, so catalog versions still holding this index never see terms added after it.
+    """
+
+    __slots__ = ("max_distance", "_deletes", "_owners", "_added")
+
+    def __init__(self, max_distance: int = 2) -> None:
+        self.max_distance = max_distance
+        # deletion variant -> keys that produce it
+        self._deletes: Dict[str, Set[str]] = {}
+        # key (full term or one of its words) -> full terms containing it
+        self._owners: Dict[str, Set[str]] = {}
+        # Terms added by with_terms since the build (copied, never shared between versions)
+        self._added: Optional["DeletionIndex"] = None
+
+    def __len__(self) -> int:
+        added = self._added._owners.keys() - self._owners.keys() if self._added is not None else ()
+        return len(self._owners) + len(added)
+
+    def _layers(self) -> tuple["DeletionIndex", ...]:
+        return (self,) if self._added is None else (self, self._added)
+
+    def _has(self, term: str) -> bool:
+        return any(term in layer._owners.get(term, ()) for layer in self._layers())
+
+    def with_terms(self, terms: Iterable[str]) -> "DeletionIndex":
+        """Return a new index with terms added; returns self if they are all indexed already."""
+        new = {t.strip() for t in terms} - {""}
+        new = {t for t in new if not self._has(t)}
+        if not new:
+            return self
+        added = DeletionIndex(self.max_distance)
+        if self._added is not None:
+            added._deletes = {d: set(keys) for d, keys in self._added._deletes.items()}
+            added._owners = {key: set(owners) for key, owners in self._added._owners.items()}
+        added.update(new)
+        out = DeletionIndex(self.max_distance)
+        out._deletes, out._owners, out._added = self._deletes, self._owners, added
+        return out
+
+    def add(self, term: str) -> None:
+        term = term.strip()
+        if not term:
+            return
+        keys = {term} | {w for w in term.split() if len(w) >= _MIN_WORD_LEN}
+        for key in keys:
+            owners = self._owners.get(key)
+            if owners is None:
+                self._owners[key] = {term}
+                for d in _deletes(key, self.max_distance):
+                    self._deletes.setdefault(d, set()).add(key)
+            else:
+                owners.add(term)
+
+    def update(self, terms: Iterable[str]) -> None:
+        for term in terms:
+            self.add(term)
+
+    def lookup(self, query: str) -> Dict[str, int]:
+        """Full terms with a key within the allowed edit distance of query -> best distance."""
+        query = query.strip()
+        if not query:
+            return {}
+        max_d = min(self.max_distance, max_distance_for(query))
+        layers = self._layers()
+        candidates: Set[str] = set()
+        for d in _deletes(query, max_d):
+            for layer in layers:
+                keys = layer._deletes.get(d)
+                if keys:
+                    candidates |= keys
+        out: Dict[str, int] = {}
+        for key in candidates:
+            dist = edit_distance(query, key, max_d)
+            if dist > max_d:
+                continue
+            for layer in layers:
+                for term in layer._owners.get(key, ()):
+                    if dist < out.get(term, max_d + 1):
+                        out[term] = dist
+        return out
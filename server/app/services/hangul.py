@@ -0,0 +1,136 @@
+"""
+Hangul jamo and initial-consonant (choseong) matching for Korean names and albums.
+
+Names are decomposed once, at load time, into jamo ("카린" -> "ㅋㅏㄹㅣㄴ") and choseong
+("카리나" -> "ㅋㄹㄴ") strings, and every syllable-boundary suffix of those strings is put in a
+sorted prefix index. A query is decomposed the same way and resolved with a binary search, so:
+
+- a syllable still being composed matches ("카리" and "칼" both match "카리나"), because the
+  query's jamo are a prefix of the name's;
+- consonant-only queries ("ㅋㄹㄴ") match against initial consonants;
+- matches may start at any syllable ("리나" matches "카리나").
+"""
+
+from typing import Iterable, List, Set
+
+from app.services.prefix_index import PrefixIndex
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_JUNG_COUNT = 21
+_JONG_COUNT = 28
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+
+# Compound vowels and final clusters are typed as two keys, so split them to match mid-composition
+_SPLIT = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_CONSONANTS = frozenset(_CHO) | frozenset("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+
+
+def _is_syllable(ch: str) -> bool:
+    return _SYLLABLE_BASE <= ord(ch) <= _SYLLABLE_LAST
+
+
+def _is_jamo(ch: str) -> bool:
+    return 0x3131 <= ord(ch) <= 0x318E
+
+
+def has_hangul(s: str) -> bool:
+    return any(_is_syllable(ch) or _is_jamo(ch) for ch in s)
+
+
+def is_choseong_query(s: str) -> bool:
+    """True if s is made only of consonant jamo (e.g. "ㅋㄹㄴ")."""
+    chars = [ch for ch in s if not ch.isspace()]
+    return bool(chars) and all(ch in _CONSONANTS for ch in chars)
+
+
+def _char_jamo(ch: str) -> str:
+    if _is_syllable(ch):
+        idx = ord(ch) - _SYLLABLE_BASE
+        cho, rest = divmod(idx, _JUNG_COUNT * _JONG_COUNT)
+        jung, jong = divmod(rest, _JONG_COUNT)
+        parts = _CHO[cho] + _JUNG[jung] + _JONG[jong]
+        return "".join(_SPLIT.get(j, j) for j in parts)
+    return _SPLIT.get(ch, ch.lower())
+
+
+def _char_choseong(ch: str) -> str:
+    if _is_syllable(ch):
+        return _CHO[(ord(ch) - _SYLLABLE_BASE) // (_JUNG_COUNT * _JONG_COUNT)]
+    return ch.lower()
+
+
+def decompose(s: str) -> str:
+    """Jamo string for s (whitespace dropped, compound jamo split)."""
+    return "".join(_char_jamo(ch) for ch in s if not ch.isspace())
+
+
+def choseong(s: str) -> str:
+    """Initial-consonant string for s (whitespace dropped)."""
+    return "".join(_char_choseong(ch) for ch in s if not ch.isspace())
+
+
+def _suffixes(chars: List[str]) -> Iterable[str]:
+    """Suffixes of the joined per-character strings, starting at each character."""
+    for i in range(len(chars)):
+        yield "".join(chars[i:])
+
+
+def _index_pairs(term: str) -> tuple[list, list]:
+    chars = [ch for ch in term if not ch.isspace()]
+    jamo = [(key, term) for key in _suffixes([_char_jamo(ch) for ch in chars])]
+    cho = [(key, term) for key in _suffixes([_char_choseong(ch) for ch in chars])]
+    return jamo, cho
+
+
+class HangulIndex:
+    """Jamo and choseong prefix indexes over Korean terms (names, albums). Immutable."""
+
+    __slots__ = ("_jamo", "_choseong", "_terms")
+
+    def __init__(self, terms: Iterable[str] = ()) -> None:
+        self._terms: Set[str] = {t for t in terms if t and has_hangul(t)}
+        jamo_pairs: list = []
+        cho_pairs: list = []
+        for term in self._terms:
+            jamo, cho = _index_pairs(term)
+            jamo_pairs.extend(jamo)
+            cho_pairs.extend(cho)
+        self._jamo: PrefixIndex[str] = PrefixIndex(jamo_pairs)
+        self._choseong: PrefixIndex[str] = PrefixIndex(cho_pairs)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def with_terms(self, terms: Iterable[str]) -> "HangulIndex":
+        """Return a new index with terms added; returns self if none are new Korean terms."""
+        new = {t for t in terms if t and t not in self._terms and has_hangul(t)}
+        if not new:
+            return self
+        jamo_pairs: list = []
+        cho_pairs: list = []
+        for term in new:
+            jamo, cho = _index_pairs(term)
+            jamo_pairs.extend(jamo)
+            cho_pairs.extend(cho)
+        out = HangulIndex.__new__(HangulIndex)
+        out._terms = self._terms | new
+        out._jamo = self._jamo.with_pairs(jamo_pairs)
+        out._choseong = self._choseong.with_pairs(cho_pairs)
+        return out
+
+    def lookup(self, query: str) -> Set[str]:
+        """Indexed terms matching a (possibly partially typed) Korean query."""
+        if not has_hangul(query):
+            return set()
+        if is_choseong_query(query):
+            return set(self._choseong.values_with_prefix(choseong(query)))
+        key = decompose(query)
+        return set(self._jamo.values_with_prefix(key)) if key else set()
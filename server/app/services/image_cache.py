@@ -0,0 +1,131 @@
+"""
+Size-bounded on-disk LRU cache for rendered image variants.
+
+Entries are files named by key under two-character fan-out directories. The in-memory index
+(key -> size, least recently used first) is rebuilt from the directory on first use, ordered by
+file mtime; hits bump the mtime so the order survives restarts. Writes go to a temp file and are
+renamed into place, so readers never see partial files. Each process (pre-fork worker) keeps its own
+index over the shared directory: a file evicted by another worker is simply a miss, and the
+directory can exceed the bound by at most one worker's share until the next eviction.
+Methods do file I/O: call them from a thread (asyncio.to_thread).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_TMP_SUFFIX = ".tmp"
+
+
+class DiskLRUCache:
+    """Bytes by key on disk, evicting least recently used files beyond max_bytes."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            if self.directory.is_dir():
+                for path in self.directory.glob("*/*"):
+                    if path.suffix == _TMP_SUFFIX:
+                        continue
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, path.name, st.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._bytes = sum(self._index.values())
+            if entries:
+                logger.info("Image cache: %d files, %.1f MB in %s", len(entries), self._bytes / 1e6, self.directory)
+        return self._index
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for key, or None."""
+        with self._lock:
+            index = self._load_index()
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                # Evicted by another worker (or never cached)
+                self._bytes -= index.pop(key, 0)
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if key not in index:
+                # Written by another worker
+                index[key] = len(data)
+                self._bytes += len(data)
+            index.move_to_end(key)
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key and evict older entries beyond the size bound."""
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}{_TMP_SUFFIX}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            index = self._load_index()
+            self._bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            victims = []
+            while self._bytes > self.max_bytes and len(index) > 1:
+                old, size = index.popitem(last=False)
+                self._bytes -= size
+                victims.append(old)
+            self.evictions += len(victims)
+        for old in victims:
+            self._path(old).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            index = self._load_index()
+            keys = list(index)
+            index.clear()
+            self._bytes = 0
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "directory": str(self.directory),
+                "entries": len(index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
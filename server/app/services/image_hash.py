@@ -0,0 +1,102 @@
+"""
+Perceptual image hashes and a Hamming-distance index for near-duplicate lookup.
+
+dhash: 64-bit difference hash. The image is reduced to 9x8 grayscale and each bit records whether
+a pixel is brighter than its right neighbour, so re-scans, recompression, resizing and small colour
+shifts of the same card land within a few bits of each other.
+
+HashIndex is a multi-index hash: the 64 bits are split into max_distance + 1 chunks and each chunk
+value is a dict key. Two hashes within max_distance bits must agree exactly on at least one chunk
+(pigeonhole), so a lookup only verifies the entries sharing a chunk with the query instead of
+scanning every hash.
+"""
+
+import io
+from typing import Dict, Hashable, List, Tuple
+
+from PIL import Image
+
+HASH_BITS = 64
+
+
+def dhash(data: bytes) -> int:
+    """64-bit difference hash of encoded image bytes (raises OSError/ValueError if not an image)."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("L", (64, 64))
+        return dhash_image(img)
+
+
+def dhash_image(img: Image.Image) -> int:
+    """dhash of an opened image (for callers that decode it for something else too)."""
+    px = img.convert("L").resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        base = row * 9
+        for col in range(8):
+            value = (value << 1) | (px[base + col] > px[base + col + 1])
+    return value
+
+
+def hash_hex(value: int) -> str:
+    return f"{value:016x}"
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class HashIndex:
+    """64-bit hashes by key, searchable by Hamming distance up to max_distance."""
+
+    def __init__(self, max_distance: int) -> None:
+        self.max_distance = max_distance
+        chunks = min(max_distance + 1, HASH_BITS)
+        # (shift, mask) per chunk, widths as even as possible
+        self._spans: List[Tuple[int, int]] = []
+        start = 0
+        for i in range(chunks):
+            width = HASH_BITS // chunks + (1 if i < HASH_BITS % chunks else 0)
+            self._spans.append((start, (1 << width) - 1))
+            start += width
+        self._tables: List[Dict[int, List[Hashable]]] = [{} for _ in self._spans]
+        self._hashes: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._hashes
+
+    def add(self, key: Hashable, value: int) -> None:
+        if key in self._hashes:
+            if self._hashes[key] == value:
+                return
+            self.remove(key)
+        self._hashes[key] = value
+        for table, (shift, mask) in zip(self._tables, self._spans):
+            table.setdefault((value >> shift) & mask, []).append(key)
+
+    def remove(self, key: Hashable) -> None:
+        value = self._hashes.pop(key, None)
+        if value is None:
+            return
+        for table, (shift, mask) in zip(self._tables, self._spans):
+            bucket = table.get((value >> shift) & mask)
+            if bucket is not None:
+                bucket.remove(key)
+
+    def search(self, value: int, max_distance: int | None = None) -> List[Tuple[int, Hashable]]:
+        """(distance, key) for stored hashes within max_distance (default: the index's), closest first."""
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        seen: set = set()
+        out = []
+        for table, (shift, mask) in zip(self._tables, self._spans):
+            for key in table.get((value >> shift) & mask, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                d = (self._hashes[key] ^ value).bit_count()
+                if d <= limit:
+                    out.append((d, key))
+        out.sort(key=lambda item: item[0])
+        return out
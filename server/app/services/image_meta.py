@@ -0,0 +1,240 @@
+"""
+Photocard image dimensions, LQIP placeholders and perceptual hashes, computed in the background.
+
+For each photocard without them, a bounded pool of IMAGE_META_WORKERS tasks fetches the front image
+once (the image proxy's pooled client), and a thread reads its size (EXIF orientation applied),
+encodes a tiny WebP preview as a ``data:`` URI (IMAGE_PLACEHOLDER_SIZE px, a few hundred bytes) that
+the client can show blurred while the real image loads, and computes its dHash for near-duplicate
+checks (duplicates.py), all from one decode. Results are stored in batches
+(data_loader.apply_image_meta_async: MongoDB fields or the file-mode store) and swapped into the
+catalog, so photocard responses gain ``width``, ``height`` and ``placeholder``. In MongoDB mode the
+catalog revision is bumped once each time the queue runs dry, so other processes rebuild their read
+model once per run rather than once per batch. Failed images are stored with a timestamp and
+skipped by backfills until IMAGE_META_RETRY_HOURS have passed.
+
+New photocards from moderation are queued as they are accepted. Existing ones are queued at startup
+with IMAGE_META_BACKFILL, or processed offline:
+
+    python -m app.services.image_meta
+"""
+
+import asyncio
+import base64
+import io
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image, ImageOps
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger, setup_logging
+from app.schemas.photocard import PhotocardSchema
+from app.services.data_loader import (
+    apply_image_meta_async,
+    photocards_missing_image_meta,
+    publish_image_meta_async,
+)
+from app.services.image_hash import dhash_image, hash_hex
+from app.services.thumbnails import ImageUnavailable, fetch_origin
+
+logger = get_logger(__name__)
+
+# Results stored per write (MongoDB bulk_write / file store rewrite and catalog swap)
+_BATCH_SIZE = 200
+# EXIF orientations that swap width and height
+_TRANSPOSED = {5, 6, 7, 8}
+# JPEG draft size: what image_hash.dhash decodes at, so hashes match the submission check's
+_HASH_DRAFT_SIZE = 64
+
+
+def compute_image_meta(data: bytes, placeholder_size: int) -> dict:
+    """{width, height, placeholder, imageHash} for encoded image bytes; raises ImageUnavailable."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+            if img.getexif().get(0x0112) in _TRANSPOSED:
+                width, height = height, width
+            draft = max(placeholder_size, _HASH_DRAFT_SIZE)
+            img.draft("RGB", (draft, draft))
+            img.load()
+            # dhash of the stored (not EXIF-rotated) orientation, like image_hash.dhash
+            image_hash = dhash_image(img)
+            small = ImageOps.exif_transpose(img).convert("RGB")
+            small.thumbnail((placeholder_size, placeholder_size), Image.Resampling.BILINEAR)
+            out = io.BytesIO()
+            small.save(out, "WEBP", quality=40)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ImageUnavailable(f"not a decodable image: {e}") from e
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode("ascii"),
+        "imageHash": hash_hex(image_hash),
+    }
+
+
+class ImageMetaPipeline:
+    """Queue of photocards drained by a fixed number of worker tasks (one event loop)."""
+
+    def __init__(self, workers: int, placeholder_size: int) -> None:
+        self.workers = workers
+        self.placeholder_size = placeholder_size
+        self._queue: "asyncio.Queue[PhotocardSchema]" = asyncio.Queue()
+        self._queued: set[str] = set()
+        self._pending: Dict[str, dict] = {}
+        self._store_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+        # Photocards taken off the queue and not finished yet; stored since the last publish
+        self._busy = 0
+        self._unpublished = False
+        self.processed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"image-meta-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._store()
+        await self._publish()
+
+    def enqueue(self, photocards: Iterable[PhotocardSchema]) -> int:
+        """Queue photocards that have no metadata yet and aren't queued. Returns how many were added."""
+        added = 0
+        for p in photocards:
+            if p.image_hash is None and p.image_url and p.id not in self._queued:
+                self._queued.add(p.id)
+                self._queue.put_nowait(p)
+                added += 1
+        return added
+
+    async def drain(self) -> None:
+        """Wait until everything queued so far is processed and stored."""
+        await self._queue.join()
+        await self._store()
+        await self._publish()
+
+    async def _worker(self) -> None:
+        while True:
+            p = await self._queue.get()
+            self._busy += 1
+            try:
+                data = await fetch_origin(p.image_url)
+                self._pending[p.id] = await asyncio.to_thread(compute_image_meta, data, self.placeholder_size)
+                self.processed += 1
+            except ImageUnavailable as e:
+                self.failed += 1
+                self._pending[p.id] = {"imageMetaFailedAt": datetime.now(timezone.utc)}
+                logger.info("No image metadata for %s: %s", p.id, e)
+            except Exception as e:
+                self.failed += 1
+                self._pending[p.id] = {"imageMetaFailedAt": datetime.now(timezone.utc)}
+                logger.warning("Image metadata for %s failed: %s", p.id, e)
+            finally:
+                self._busy -= 1
+                self._queued.discard(p.id)
+                self._queue.task_done()
+            if len(self._pending) >= _BATCH_SIZE or self._queue.empty():
+                await self._store()
+            # Last photocard of this run (nothing queued or in progress): tell other processes once
+            if self._queue.empty() and not self._busy:
+                await self._publish()
+
+    async def _store(self) -> None:
+        async with self._store_lock:
+            updates, self._pending = self._pending, {}
+            if not updates:
+                return
+            try:
+                await apply_image_meta_async(updates)
+                self._unpublished = True
+            except Exception as e:
+                # Not retried here; still missing, so the next backfill picks them up
+                logger.warning("Storing image metadata for %d photocards failed: %s", len(updates), e)
+
+    async def _publish(self) -> None:
+        async with self._store_lock:
+            if not self._unpublished:
+                return
+            self._unpublished = False
+            await publish_image_meta_async()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize(),
+            "pending_store": len(self._pending),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+_pipeline: Optional[ImageMetaPipeline] = None
+
+
+def start_image_meta_pipeline() -> bool:
+    """Start the worker pool if IMAGE_META_WORKERS > 0 (and queue the backfill if enabled)."""
+    global _pipeline
+    settings = get_settings()
+    if settings.image_meta_workers <= 0 or _pipeline is not None:
+        return False
+    _pipeline = ImageMetaPipeline(settings.image_meta_workers, settings.image_placeholder_size)
+    _pipeline.start()
+    if settings.image_meta_backfill:
+        queued = _pipeline.enqueue(photocards_missing_image_meta())
+        logger.info("Image metadata backfill: %d photocards queued", queued)
+    return True
+
+
+async def stop_image_meta_pipeline() -> None:
+    global _pipeline
+    if _pipeline is not None:
+        await _pipeline.stop()
+        _pipeline = None
+
+
+def enqueue_image_meta(photocards: Iterable[PhotocardSchema]) -> int:
+    """Queue new photocards for metadata (no-op when the pipeline is off)."""
+    return _pipeline.enqueue(photocards) if _pipeline is not None else 0
+
+
+def image_meta_stats() -> dict:
+    return _pipeline.stats() if _pipeline is not None else {"workers": 0}
+
+
+async def _backfill() -> None:
+    from app.core.db import close_mongodb, connect_mongodb
+    from app.services.data_loader import build_catalog_snapshot, load_catalog_from_mongodb, load_data
+    from app.services.thumbnails import close_image_client
+
+    settings = get_settings()
+    if settings.mongodb_configured:
+        await connect_mongodb()
+        await load_catalog_from_mongodb(primary=True)
+    else:
+        load_data()
+    pipeline = ImageMetaPipeline(max(1, settings.image_meta_workers), settings.image_placeholder_size)
+    pipeline.start()
+    try:
+        logger.info("Computing image metadata for %d photocards", pipeline.enqueue(photocards_missing_image_meta()))
+        await pipeline.drain()
+    finally:
+        await pipeline.stop()
+        await close_image_client()
+        if settings.mongodb_configured:
+            await close_mongodb()
+    logger.info("Image metadata: %d computed, %d failed", pipeline.processed, pipeline.failed)
+    # The metadata store is part of the snapshot's source hash: rebuild it, or cold starts fall back to JSON
+    stored = pipeline.processed or pipeline.failed
+    if not settings.mongodb_configured and stored and settings.catalog_snapshot_path.strip():
+        build_catalog_snapshot()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(_backfill())
@@ -0,0 +1,310 @@
+"""
+Background jobs: post-processing that must not hold up the request that triggered it.
+
+enqueue_job(kind, payload) records the job in the MongoDB ``jobs`` collection (when connected) and
+offers it to a bounded in-process queue drained by JOB_WORKERS tasks, which run the handler
+registered for its kind (register_job_handler). The request returns right after that insert.
+
+- A worker claims a job atomically (status queued → running, with a lease), so a job offered to
+  several processes runs once.
+- A failed job is retried with exponential backoff up to JOB_MAX_ATTEMPTS, then marked failed with
+  its last error.
+- When the queue is full, the job stays queued in MongoDB (backpressure) and a poller in each process
+  loads due jobs as room frees up, every JOB_POLL_SECONDS. It also re-queues jobs whose worker died
+  (lease expired) and, at startup, jobs left over from the last run.
+- On shutdown the queue gets JOB_DRAIN_TIMEOUT_SECONDS to empty; the rest stay queued for next start.
+
+Without MongoDB, jobs live only in memory (retries via timers; lost on restart or when the queue is full).
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from app.core.config import get_settings
+from app.core.db import JOBS_COLLECTION, get_database
+from app.core.logging_config import get_logger
+from app.core.metrics import REGISTRY, CallbackMetric
+
+logger = get_logger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+# How long a claimed job may run before another worker may take it over
+_LEASE = timedelta(minutes=5)
+# First retry delay; doubles per attempt
+_RETRY_BASE_SECONDS = 10
+# Finished jobs are kept this long for inspection (TTL index), failed ones until removed
+_FINISHED_TTL_SECONDS = 7 * 24 * 3600
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str, handler: JobHandler) -> None:
+    """Run handler(payload) for jobs of this kind. Raise to have the job retried."""
+    _handlers[kind] = handler
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """Bounded queue of job documents drained by a fixed number of worker tasks (one event loop)."""
+
+    def __init__(self, workers: int, maxsize: int, max_attempts: int, poll_seconds: float) -> None:
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize)
+        self._queued: set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._retry_timers: set[asyncio.TimerHandle] = set()
+        self.running = 0
+        # (kind, result) -> count; result is done, retried, failed, deferred or dropped
+        self.counts: Counter = Counter()
+
+    async def start(self) -> None:
+        db = get_database()
+        if db is not None:
+            coll = db[JOBS_COLLECTION]
+            await coll.create_index("id", unique=True)
+            await coll.create_index([("status", 1), ("runAfter", 1)])
+            await coll.create_index("finishedAt", expireAfterSeconds=_FINISHED_TTL_SECONDS)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)
+        ]
+        if db is not None:
+            self._poller = asyncio.create_task(self._poll(), name="job-poller")
+
+    async def stop(self, drain_timeout: float) -> None:
+        """Let the queue empty for up to drain_timeout seconds, then cancel the workers."""
+        if self._poller is not None:
+            self._poller.cancel()
+        for timer in self._retry_timers:
+            timer.cancel()
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job queue not drained in %s s: %d jobs left", drain_timeout, self._queue.qsize())
+        tasks = self._tasks + ([self._poller] if self._poller is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._poller = None
+
+    async def enqueue(self, kind: str, payload: dict) -> bool:
+        """Persist the job (MongoDB) and offer it to the queue. False if it could not be stored or was dropped."""
+        now = _now()
+        job = {
+            "id": f"job-{uuid.uuid4().hex[:12]}",
+            "kind": kind,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "createdAt": now,
+            "runAfter": now,
+        }
+        db = get_database()
+        if db is not None:
+            try:
+                await db[JOBS_COLLECTION].insert_one(job)
+            except Exception as e:
+                # The triggering write already succeeded; don't fail the request over its follow-up
+                logger.warning("Storing %s job failed: %s", kind, e)
+                return False
+        return self._offer(job, persisted=db is not None)
+
+    def _offer(self, job: dict, persisted: bool) -> bool:
+        if job["id"] in self._queued:
+            return True
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            if persisted:
+                # The poller loads it once there is room
+                self.counts[(job["kind"], "deferred")] += 1
+                return True
+            self.counts[(job["kind"], "dropped")] += 1
+            logger.warning("Job queue full: dropped %s job %s", job["kind"], job["id"])
+            return False
+        self._queued.add(job["id"])
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.warning("Job %s bookkeeping failed: %s", job["id"], e)
+            finally:
+                self.running -= 1
+                self._queued.discard(job["id"])
+                self._queue.task_done()
+
+    async def _run(self, job: dict) -> None:
+        db = get_database()
+        if db is not None:
+            job = await db[JOBS_COLLECTION].find_one_and_update(
+                {"id": job["id"], "status": "queued"},
+                {"$set": {"status": "running", "leaseUntil": _now() + _LEASE}, "$inc": {"attempts": 1}},
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                # Finished or claimed by another process meanwhile
+                return
+        else:
+            job["attempts"] += 1
+        handler = _handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise LookupError(f"no handler for job kind {job['kind']!r}")
+            await handler(job["payload"])
+        except Exception as e:
+            await self._failed(job, e, retry=handler is not None)
+            return
+        self.counts[(job["kind"], "done")] += 1
+        if db is not None:
+            await db[JOBS_COLLECTION].update_one(
+                {"id": job["id"]},
+                {"$set": {"status": "done", "finishedAt": _now()}, "$unset": {"leaseUntil": ""}},
+            )
+
+    async def _failed(self, job: dict, error: Exception, retry: bool) -> None:
+        db = get_database()
+        if retry and job["attempts"] < self.max_attempts:
+            delay = _RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+            self.counts[(job["kind"], "retried")] += 1
+            logger.info("Job %s (%s) failed, retrying in %d s: %s", job["id"], job["kind"], delay, error)
+            if db is not None:
+                await db[JOBS_COLLECTION].update_one(
+                    {"id": job["id"]},
+                    {
+                        "$set": {
+                            "status": "queued",
+                            "runAfter": _now() + timedelta(seconds=delay),
+                            "lastError": str(error),
+                        },
+                        "$unset": {"leaseUntil": ""},
+                    },
+                )
+            else:
+                self._retry_later(job, delay)
+            return
+        self.counts[(job["kind"], "failed")] += 1
+        logger.warning("Job %s (%s) failed after %d attempts: %s", job["id"], job["kind"], job["attempts"], error)
+        if db is not None:
+            await db[JOBS_COLLECTION].update_one(
+                {"id": job["id"]},
+                {"$set": {"status": "failed", "lastError": str(error)}, "$unset": {"leaseUntil": ""}},
+            )
+
+    def _retry_later(self, job: dict, delay: float) -> None:
+        def fire() -> None:
+            self._retry_timers.discard(timer)
+            self._offer(job, persisted=False)
+
+        timer = asyncio.get_running_loop().call_later(delay, fire)
+        self._retry_timers.add(timer)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self._load_due()
+            except Exception as e:
+                logger.warning("Loading queued jobs failed: %s", e)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _load_due(self) -> None:
+        db = get_database()
+        if db is None:
+            return
+        coll = db[JOBS_COLLECTION]
+        now = _now()
+        await coll.update_many(
+            {"status": "running", "leaseUntil": {"$lt": now}},
+            {"$set": {"status": "queued", "runAfter": now}, "$unset": {"leaseUntil": ""}},
+        )
+        room = self._queue.maxsize - self._queue.qsize()
+        if room <= 0:
+            return
+        cursor = coll.find({"status": "queued", "runAfter": {"$lte": now}}).sort("runAfter", 1).limit(room)
+        async for job in cursor:
+            if self._queue.full():
+                break
+            self._offer(job, persisted=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "handlers": sorted(_handlers),
+            "jobs": {f"{kind}:{result}": n for (kind, result), n in sorted(self.counts.items())},
+        }
+
+
+_jobs: Optional[JobQueue] = None
+
+REGISTRY.register(CallbackMetric(
+    "katalog_jobs_total",
+    "Background jobs by kind and result (done, retried, failed, deferred, dropped).",
+    ("kind", "result"),
+    "counter",
+    lambda: dict(_jobs.counts) if _jobs else {},
+))
+REGISTRY.register(CallbackMetric(
+    "katalog_job_queue_depth",
+    "Jobs waiting in this process's queue.",
+    (),
+    "gauge",
+    lambda: {(): _jobs._queue.qsize()} if _jobs else {},
+))
+
+
+async def start_job_queue() -> bool:
+    """Start the worker pool (and the MongoDB poller when connected) if JOB_WORKERS > 0."""
+    global _jobs
+    settings = get_settings()
+    if settings.job_workers <= 0 or _jobs is not None:
+        return False
+    _jobs = JobQueue(
+        settings.job_workers,
+        max(1, settings.job_queue_size),
+        max(1, settings.job_max_attempts),
+        settings.job_poll_seconds,
+    )
+    await _jobs.start()
+    return True
+
+
+async def stop_job_queue() -> None:
+    global _jobs
+    if _jobs is not None:
+        await _jobs.stop(get_settings().job_drain_timeout_seconds)
+        _jobs = None
+
+
+async def enqueue_job(kind: str, payload: dict) -> bool:
+    """Queue a job. False when the queue is off (JOB_WORKERS=0), the job couldn't be stored, or the
+    queue is full without MongoDB."""
+    if _jobs is None:
+        return False
+    return await _jobs.enqueue(kind, payload)
+
+
+def job_queue_enabled() -> bool:
+    """True if this process runs a job queue (JOB_WORKERS > 0)."""
+    return _jobs is not None
+
+
+def job_queue_stats() -> dict:
+    return _jobs.stats() if _jobs is not None else {"workers": 0}
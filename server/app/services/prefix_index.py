@@ -0,0 +1,37 @@
+"""Sorted-array prefix index: binary search over sorted keys instead of a trie."""
+
+from bisect import bisect_left
+from typing import Generic, Iterable, List, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# Sorts after every other code point, so prefix + _MAX_CHAR bounds all keys starting with prefix
+_MAX_CHAR = "\U0010ffff"
+
+
+class PrefixIndex(Generic[V]):
+    """Immutable (key, value) pairs sorted by key; lookups cost O(log n + matches)."""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, pairs: Iterable[Tuple[str, V]] = ()) -> None:
+        items = sorted(pairs, key=lambda kv: kv[0])
+        self._keys: List[str] = [k for k, _ in items]
+        self._values: List[V] = [v for _, v in items]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _MAX_CHAR, lo)
+        return lo, hi
+
+    def values_with_prefix(self, prefix: str) -> List[V]:
+        """Values of all keys starting with prefix, in key order."""
+        lo, hi = self._range(prefix)
+        return self._values[lo:hi]
+
+    def with_pairs(self, pairs: Iterable[Tuple[str, V]]) -> "PrefixIndex[V]":
+        """Return a new index with pairs added (this one is unchanged)."""
+        return PrefixIndex([*zip(self._keys, self._values), *pairs])
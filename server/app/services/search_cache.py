@@ -0,0 +1,106 @@
+"""
+Bounded LRU cache of full search match lists, so paging through results only slices.
+
+Entries hold the matched groups/members (references into the catalog) and photocard positions
+as a compact array. They are tied to a catalog version: the first lookup against the live catalog's
+new version drops everything cached for the old one. Lookups from requests still running on a
+replaced catalog are ignored (miss, nothing stored), so they can't evict the new version's entries.
+"""
+
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional
+
+from app.schemas.group import GroupSchema
+from app.schemas.member import MemberSchema
+
+
+class SearchMatches(NamedTuple):
+    groups: List[GroupSchema]
+    members: List[MemberSchema]
+    # photocard positions in catalog order
+    positions: array
+
+
+def _entry_bytes(key: tuple, m: SearchMatches) -> int:
+    """Approximate bytes owned by an entry (catalog objects it references are not counted)."""
+    return (
+        sys.getsizeof(key)
+        + sys.getsizeof(key[1])
+        + sys.getsizeof(m)
+        + sys.getsizeof(m.groups)
+        + sys.getsizeof(m.members)
+        + sys.getsizeof(m.positions)
+    )
+
+
+class SearchCache:
+    """LRU of (query, fuzzy) -> SearchMatches for one catalog version at a time."""
+
+    def __init__(self, max_entries: int, current_version: Callable[[], Optional[str]]) -> None:
+        self.max_entries = max_entries
+        self._current_version = current_version
+        self._entries: "OrderedDict[tuple, SearchMatches]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _accepts(self, version: str) -> bool:
+        """True if entries for version may be read/stored, switching to it if it is the live version."""
+        if version == self._version:
+            return True
+        if version != self._current_version():
+            return False
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+        return True
+
+    def get(self, version: str, q: str, fuzzy: bool) -> Optional[SearchMatches]:
+        key = (version, q, fuzzy)
+        with self._lock:
+            m = self._entries.get(key) if self._accepts(version) else None
+            if m is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return m
+
+    def put(self, version: str, q: str, fuzzy: bool, m: SearchMatches) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (version, q, fuzzy)
+        with self._lock:
+            if not self._accepts(version):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= _entry_bytes(key, old)
+            self._entries[key] = m
+            self._bytes += _entry_bytes(key, m)
+            while len(self._entries) > self.max_entries:
+                k, v = self._entries.popitem(last=False)
+                self._bytes -= _entry_bytes(k, v)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "approx_bytes": self._bytes,
+                "catalog_version": self._version,
+            }
@@ -0,0 +1,45 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+Callers asking for the same key while a fetch is in flight await that fetch instead of starting
+their own, so database load during request spikes scales with distinct queries rather than with
+request count. Nothing is cached: once the fetch finishes, the next caller starts a new one.
+Results are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key in-flight task registry (one event loop)."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, joining an in-flight call for key if there is one."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._forget(k, _t))
+        else:
+            self.shared += 1
+        # Shielded: a caller that disconnects must not cancel the fetch the others are awaiting
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller went away before it finished
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._inflight)}
@@ -0,0 +1,162 @@
+"""
+Versioned binary snapshot of the in-memory catalog (file mode) for fast cold starts.
+
+Layout: a fixed header (magic, format version, source hash, payload length) followed by a
+pickled payload holding each group/photocard as a tuple of field values plus the catalog
+indexes. The file is memory-mapped and unpickled straight from the mapping, and models are
+restored without re-running validation (they were validated when the snapshot was built).
+
+The source hash covers the raw catalog bytes, the snapshot format version and the schema
+field layout, so editing data.json or a schema makes an existing snapshot stale.
+
+Build with:  python -m app.services.snapshot
+"""
+
+import gc
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import List, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.logging_config import get_logger, setup_logging
+from app.schemas.group import GroupSchema
+from app.schemas.member import MemberDataSchema
+from app.schemas.photocard import PhotocardSchema
+from app.services.catalog import Catalog
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"KATSNAP\x00"
+# Bump when the payload layout changes
+SNAPSHOT_FORMAT_VERSION = 5
+# magic, format version, sha256(source), payload length
+_HEADER = struct.Struct("<8sI32sQ")
+
+_GROUP_FIELDS = tuple(f for f in GroupSchema.model_fields if f != "members")
+_MEMBER_FIELDS = tuple(MemberDataSchema.model_fields)
+_PHOTOCARD_FIELDS = tuple(PhotocardSchema.model_fields)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def source_hash(source: bytes) -> bytes:
+    """Hash of the raw catalog source plus everything that affects the snapshot layout."""
+    h = hashlib.sha256()
+    h.update(SNAPSHOT_FORMAT_VERSION.to_bytes(4, "little"))
+    for fields in (_GROUP_FIELDS, _MEMBER_FIELDS, _PHOTOCARD_FIELDS):
+        h.update(",".join(fields).encode())
+        h.update(b"\x00")
+    h.update(source)
+    return h.digest()
+
+
+def _row(model: BaseModel, fields: tuple[str, ...]) -> tuple:
+    return tuple(getattr(model, f) for f in fields)
+
+
+def _restore(cls: Type[M], fields: tuple[str, ...], row: tuple, **extra) -> M:
+    """Rebuild an already-validated model from its field values without validation."""
+    obj = cls.__new__(cls)
+    values = dict(zip(fields, row))
+    values.update(extra)
+    obj.__setstate__(
+        {
+            "__dict__": values,
+            "__pydantic_fields_set__": set(values),
+            "__pydantic_extra__": None,
+            "__pydantic_private__": None,
+        }
+    )
+    return obj
+
+
+def write_snapshot(catalog: Catalog, digest: bytes, path: Path) -> None:
+    """Write the catalog and its indexes to path (atomically, via a temp file)."""
+    payload = pickle.dumps(
+        {
+            "version": catalog.version,
+            "groups": [
+                (_row(g, _GROUP_FIELDS), [_row(m, _MEMBER_FIELDS) for m in g.members])
+                for g in catalog.groups
+            ],
+            "photocards": [_row(p, _PHOTOCARD_FIELDS) for p in catalog.photocards],
+            "indexes": catalog.indexes(),
+        },
+        protocol=5,
+    )
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, digest, len(payload))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Path, digest: bytes) -> Catalog | None:
+    """Load a catalog from a snapshot. Returns None (never raises) if missing, unreadable or stale."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    try:
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                logger.warning("Catalog snapshot %s is truncated; ignoring", path)
+                return None
+            magic, fmt, stored_digest, length = _HEADER.unpack_from(mm)
+            if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT_VERSION:
+                logger.info("Catalog snapshot %s has an old format; ignoring", path)
+                return None
+            if stored_digest != digest:
+                logger.info("Catalog snapshot %s is stale (source changed); ignoring", path)
+                return None
+            if len(mm) < _HEADER.size + length:
+                logger.warning("Catalog snapshot %s is truncated; ignoring", path)
+                return None
+            # Many small objects are created below; skip GC passes until they are all built
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with memoryview(mm) as view, view[_HEADER.size : _HEADER.size + length] as body:
+                    data = pickle.loads(body)
+                return _catalog_from_payload(data)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except Exception as e:
+        # Any failure (corrupt pickle, renamed class, payload from other code): a snapshot is only a
+        # cache, so fall back to building from the source
+        logger.warning("Catalog snapshot %s could not be read (%s: %s); ignoring", path, type(e).__name__, e)
+        return None
+
+
+def _catalog_from_payload(data: dict) -> Catalog:
+    groups: List[GroupSchema] = [
+        _restore(
+            GroupSchema,
+            _GROUP_FIELDS,
+            row,
+            members=[_restore(MemberDataSchema, _MEMBER_FIELDS, m) for m in members],
+        )
+        for row, members in data["groups"]
+    ]
+    photocards = [_restore(PhotocardSchema, _PHOTOCARD_FIELDS, row) for row in data["photocards"]]
+    return Catalog(version=data["version"], groups=groups, photocards=photocards, **data["indexes"])
+
+
+def main() -> None:
+    # Imported here: data_loader imports this module
+    from app.services.data_loader import build_catalog_snapshot
+
+    setup_logging()
+    build_catalog_snapshot()
+
+
+if __name__ == "__main__":
+    main()
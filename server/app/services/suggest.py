@@ -0,0 +1,120 @@
+"""
+Search-as-you-type suggestions over group names, member names and albums.
+
+Each suggestion is indexed under its lowercased label, every later word of the label and, for
+groups and members, the Korean name, in a sorted-array prefix index. Weights (photocard counts)
+are kept in a separate dict so adding photocards only bumps counts instead of re-sorting keys.
+"""
+
+from heapq import nlargest
+from typing import Dict, Iterable, List, Tuple
+
+from app.services.prefix_index import PrefixIndex
+
+# (type, id, label); albums have no id and use the label
+Suggestion = Tuple[str, str, str]
+
+# Prefixes up to this length match a large share of the index; their top-k is memoized. Only
+# prefixes of indexed keys are stored, so the memo is bounded by the index, not by what users type
+_MEMO_MAX_PREFIX = 2
+_MAX_LIMIT = 20
+_TYPE_RANK = {"group": 0, "member": 1, "album": 2}
+
+
+def _keys(label: str, extra: Iterable[str] = ()) -> set[str]:
+    text = label.lower().strip()
+    words = text.split()
+    keys = {" ".join(words[i:]) for i in range(len(words))}
+    keys.update(e.lower().strip() for e in extra)
+    keys.discard("")
+    return keys
+
+
+class SuggestIndex:
+    """Prefix -> top suggestions by weight. Treat as immutable; with_* return new instances."""
+
+    __slots__ = ("_prefixes", "_weights", "_memo")
+
+    def __init__(
+        self,
+        prefixes: PrefixIndex[Suggestion],
+        weights: Dict[Suggestion, int],
+    ) -> None:
+        self._prefixes = prefixes
+        self._weights = weights
+        self._memo: Dict[str, List[Suggestion]] = {}
+
+    def __getstate__(self) -> tuple:
+        return self._prefixes, self._weights
+
+    def __setstate__(self, state: tuple) -> None:
+        self._prefixes, self._weights = state
+        self._memo = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def top(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """Highest-weight suggestions with a key starting with prefix (lowercased)."""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        limit = min(limit, _MAX_LIMIT)
+        if len(prefix) <= _MEMO_MAX_PREFIX:
+            cached = self._memo.get(prefix)
+            if cached is None:
+                cached = self._top(prefix, _MAX_LIMIT)
+                # No match: a lookup that finds nothing is cheap, and caching it would grow without bound
+                if cached:
+                    self._memo[prefix] = cached
+            return cached[:limit]
+        return self._top(prefix, limit)
+
+    def _top(self, prefix: str, limit: int) -> List[Suggestion]:
+        # Deduplicated in key order, which nlargest keeps for equal weights
+        candidates = dict.fromkeys(self._prefixes.values_with_prefix(prefix))
+        weights = self._weights
+        # Ties: groups before members before albums
+        return nlargest(limit, candidates, key=lambda s: (weights[s], -_TYPE_RANK[s[0]]))
+
+    def with_counts(self, counts: Dict[Suggestion, int]) -> "SuggestIndex":
+        """Return a new index with weights increased by counts; unseen suggestions are added."""
+        weights = dict(self._weights)
+        new: List[Tuple[str, Suggestion]] = []
+        for s, n in counts.items():
+            if s not in weights:
+                new.extend((key, s) for key in _keys(s[2]))
+                weights[s] = 0
+            weights[s] += n
+        prefixes = self._prefixes.with_pairs(new) if new else self._prefixes
+        return SuggestIndex(prefixes, weights)
+
+
+def album_suggestion(album: str) -> Suggestion:
+    return ("album", album, album)
+
+
+def build_suggest_index(
+    groups: Iterable,
+    group_counts: Dict[str, int],
+    member_counts: Dict[str, int],
+    album_counts: Dict[str, int],
+) -> SuggestIndex:
+    """Build suggestions for groups/members (with Korean names) and albums, weighted by photocard count."""
+    pairs: List[Tuple[str, Suggestion]] = []
+    weights: Dict[Suggestion, int] = {}
+    for g in groups:
+        s: Suggestion = ("group", g.id, g.name)
+        if s not in weights:
+            weights[s] = group_counts.get(g.id, 0)
+            pairs.extend((key, s) for key in _keys(g.name, [g.korean_name or ""]))
+        for m in g.members:
+            s = ("member", m.id, m.name)
+            if s not in weights:
+                weights[s] = member_counts.get(m.id, 0)
+                pairs.extend((key, s) for key in _keys(m.name, [m.korean_name or ""]))
+    for album, n in album_counts.items():
+        s = album_suggestion(album)
+        weights[s] = n
+        pairs.extend((key, s) for key in _keys(album))
+    return SuggestIndex(PrefixIndex(pairs), weights)
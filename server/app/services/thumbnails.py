@@ -0,0 +1,344 @@
+"""
+Image proxy: resized WebP/JPEG variants of photocard images.
+
+Origins (Pinterest, Discord, ...) are fetched through one pooled httpx client per process, capped at
+IMAGE_ORIGIN_MAX_BYTES. Variants are rendered with Pillow in a thread at one of IMAGE_WIDTHS (never
+upscaled) and kept in the on-disk LRU (image_cache.py) keyed by origin URL, width and format, so a
+changed image URL gets new variants and cached ones never go stale. Concurrent requests for the same
+uncached variant share one fetch and render (single_flight.py).
+
+Origin URLs come from users (submissions), so fetches only go to public addresses: every connection
+is checked after DNS resolution (so a name can't be re-pointed at an internal host between check and
+connect), and redirects are followed by hand, each hop checked against IMAGE_ORIGIN_ALLOWED_HOSTS.
+"""
+
+import asyncio
+import hashlib
+import io
+import ipaddress
+import socket
+from pathlib import Path
+from typing import Iterable, Optional
+
+import httpcore
+import httpx
+from PIL import Image, ImageOps
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.core.metrics import IMAGE_ORIGIN_FETCH_SECONDS, REGISTRY, CallbackMetric
+from app.services.image_cache import DiskLRUCache
+from app.services.single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+FORMATS = {"webp": "image/webp", "jpeg": "image/jpeg"}
+_QUALITY = {"webp": 80, "jpeg": 82}
+_MAX_REDIRECTS = 5
+_SERVER_DIR = Path(__file__).resolve().parent.parent.parent
+# Refuse decompression bombs (Pillow raises beyond twice this)
+Image.MAX_IMAGE_PIXELS = 50_000_000
+
+_client: Optional[httpx.AsyncClient] = None
+_cache: Optional[DiskLRUCache] = None
+_renders = SingleFlight()
+
+REGISTRY.register(CallbackMetric(
+    "katalog_image_cache_requests_total",
+    "Image variant cache lookups by result.",
+    ("result",),
+    "counter",
+    lambda: {("hit",): _cache.hits, ("miss",): _cache.misses} if _cache else {},
+))
+REGISTRY.register(CallbackMetric(
+    "katalog_image_cache_bytes",
+    "Bytes of image variants in this process's on-disk cache index.",
+    (),
+    "gauge",
+    lambda: {(): _cache.stats()["bytes"]} if _cache else {},
+))
+
+
+class ImageUnavailable(Exception):
+    """The origin image could not be fetched or decoded."""
+
+
+def image_cache() -> DiskLRUCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        path = Path(settings.image_cache_dir)
+        _cache = DiskLRUCache(
+            path if path.is_absolute() else _SERVER_DIR / path,
+            settings.image_cache_max_mb * 1024 * 1024,
+        )
+    return _cache
+
+
+def _is_public(address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    # is_global excludes loopback, private, link-local (cloud metadata), shared and reserved ranges
+    return address.is_global and not address.is_multicast
+
+
+async def _public_address(host: str, port: int) -> str:
+    """An address of host to connect to; ImageUnavailable if any of its addresses isn't public."""
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError) as e:
+        raise ImageUnavailable("origin host does not resolve") from e
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(_is_public(ipaddress.ip_address(a.split("%")[0])) for a in addresses):
+        raise ImageUnavailable("origin address not allowed")
+    return addresses[0]
+
+
+class _PublicOnlyBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that connects only to public addresses (checked at connect time)."""
+
+    def __init__(self) -> None:
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        # TLS still verifies (and sends SNI for) host; only the TCP connection uses the checked address
+        address = await _public_address(host, port)
+        return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore exceptions and the httpx ones raised for them (subclasses first)
+_TRANSPORT_ERRORS = tuple(
+    (getattr(httpcore, name), getattr(httpx, name))
+    for name in (
+        "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout", "TimeoutException",
+        "ConnectError", "ReadError", "WriteError", "NetworkError",
+        "LocalProtocolError", "RemoteProtocolError", "ProtocolError", "UnsupportedProtocol",
+    )
+)
+_CORE_ERRORS = tuple(core_error for core_error, _ in _TRANSPORT_ERRORS)
+
+
+def _transport_error(e: Exception, request: httpx.Request) -> httpx.TransportError:
+    httpx_error = next(h for c, h in _TRANSPORT_ERRORS if isinstance(e, c))
+    return httpx_error(str(e), request=request)
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream, request: httpx.Request) -> None:
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except _CORE_ERRORS as e:
+            raise _transport_error(e, self._request) from e
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class _PublicOnlyTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an httpcore pool that connects through _PublicOnlyBackend.
+
+    Built on the public transport API (httpx.AsyncHTTPTransport takes no network backend).
+    """
+
+    def __init__(self, limits: httpx.Limits) -> None:
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_PublicOnlyBackend(),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self._pool.handle_async_request(core_request)
+        except _CORE_ERRORS as e:
+            raise _transport_error(e, request) from e
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def _http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        settings = get_settings()
+        limit = settings.image_origin_max_connections
+        limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+        transport: httpx.AsyncBaseTransport = (
+            httpx.AsyncHTTPTransport(limits=limits)
+            if settings.image_origin_allow_private
+            else _PublicOnlyTransport(limits)
+        )
+        _client = httpx.AsyncClient(
+            timeout=settings.image_origin_timeout_seconds,
+            transport=transport,
+            # Redirects are followed in fetch_origin, checking each hop
+            follow_redirects=False,
+            headers={"User-Agent": f"{settings.app_name} image proxy", "Accept": "image/*"},
+        )
+    return _client
+
+
+async def check_origin_guard() -> None:
+    """Startup self-check: the image client must refuse a loopback address before connecting.
+
+    Raises RuntimeError if it doesn't (e.g. an httpx/httpcore upgrade bypasses the backend), so the
+    server doesn't start with user-supplied URLs reaching internal hosts. No-op when
+    IMAGE_ORIGIN_ALLOW_PRIVATE is set.
+    """
+    if get_settings().image_origin_allow_private:
+        return
+    try:
+        # Port 9 (discard): nothing is fetched even if the check fails
+        await _http_client().get("http://127.0.0.1:9/")
+    except ImageUnavailable:
+        return
+    except Exception as e:
+        raise RuntimeError(f"Image origin address check is not applied (loopback fetch raised {e!r})") from e
+    raise RuntimeError("Image origin address check is not applied (loopback fetch succeeded)")
+
+
+async def close_image_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def pick_width(requested: int) -> int:
+    """Smallest configured width >= requested, else the largest."""
+    widths = get_settings().image_width_choices
+    return next((w for w in widths if w >= requested), widths[-1])
+
+
+def negotiate_format(accept: str) -> str:
+    return "webp" if "image/webp" in accept else "jpeg"
+
+
+def variant_key(url: str, width: int, fmt: str) -> str:
+    return hashlib.sha256(f"{url}\n{width}\n{fmt}".encode()).hexdigest()
+
+
+def _check_origin_url(url: httpx.URL) -> None:
+    if url.scheme not in ("http", "https") or not url.host:
+        raise ImageUnavailable("unsupported image URL")
+    allowed = get_settings().image_origin_allowed_host_list
+    if allowed and not any(url.host == h or url.host.endswith("." + h) for h in allowed):
+        raise ImageUnavailable("image host not allowed")
+
+
+async def fetch_origin(url: str) -> bytes:
+    """Download an origin image (http/https, public addresses, size-capped); raises ImageUnavailable."""
+    try:
+        current = httpx.URL(url)
+    except httpx.InvalidURL as e:
+        raise ImageUnavailable("unsupported image URL") from e
+    max_bytes = get_settings().image_origin_max_bytes
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    result = "error"
+    try:
+        for _ in range(_MAX_REDIRECTS + 1):
+            _check_origin_url(current)
+            async with _http_client().stream("GET", current) as response:
+                if response.next_request is not None:
+                    current = response.next_request.url
+                    continue
+                if response.status_code != 200:
+                    raise ImageUnavailable(f"origin returned {response.status_code}")
+                declared = response.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise ImageUnavailable("origin image too large")
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ImageUnavailable("origin image too large")
+                    chunks.append(chunk)
+            result = "ok"
+            return b"".join(chunks)
+        raise ImageUnavailable("too many redirects")
+    except httpx.HTTPError as e:
+        raise ImageUnavailable(f"origin fetch failed: {e.__class__.__name__}") from e
+    finally:
+        IMAGE_ORIGIN_FETCH_SECONDS.observe(loop.time() - start, result)
+
+
+def render_variant(data: bytes, width: int, fmt: str) -> bytes:
+    """Resize to at most width pixels wide (aspect kept, EXIF orientation applied) and encode."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", (width, width))  # JPEG: decode at a reduced scale when possible
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA") or (fmt == "jpeg" and img.mode == "RGBA"):
+                img = img.convert("RGBA" if fmt == "webp" and "A" in img.getbands() else "RGB")
+            if img.width > width:
+                img = img.resize((width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            if fmt == "webp":
+                img.save(out, "WEBP", quality=_QUALITY[fmt], method=4)
+            else:
+                img.save(out, "JPEG", quality=_QUALITY[fmt], optimize=True, progressive=True)
+            return out.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ImageUnavailable(f"not a decodable image: {e}") from e
+
+
+async def _render_and_store(url: str, width: int, fmt: str, key: str) -> bytes:
+    data = await fetch_origin(url)
+    variant = await asyncio.to_thread(render_variant, data, width, fmt)
+    try:
+        await asyncio.to_thread(image_cache().put, key, variant)
+    except OSError as e:
+        logger.warning("Could not cache image variant %s: %s", key, e)
+    return variant
+
+
+async def cached_variant(url: str, width: int, fmt: str) -> Optional[bytes]:
+    """Encoded variant of an origin URL from the disk cache, or None."""
+    return await asyncio.to_thread(image_cache().get, variant_key(url, width, fmt))
+
+
+async def render_variant_to_cache(url: str, width: int, fmt: str) -> bytes:
+    """Fetch the origin, render the variant and cache it (concurrent calls share one render);
+    raises ImageUnavailable."""
+    key = variant_key(url, width, fmt)
+    return await _renders.do(key, lambda: _render_and_store(url, width, fmt, key))
+
+
+def image_proxy_stats() -> dict:
+    return {**image_cache().stats(), "renders": _renders.stats()}
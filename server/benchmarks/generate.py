@@ -0,0 +1,128 @@
+"""
+Synthetic catalog generator (data.json shape) for benchmarks.
+
+Produces groups with 4-9 members, Korean (Hangul) group/member names and some Korean album titles,
+and photocards spread over groups with a skewed (Zipf-like) popularity so a few groups dominate,
+as in the real catalog. Output is deterministic for a given size and seed.
+
+    python -m benchmarks.generate 100000 -o /tmp/catalog-100k.json
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+_ROMAN = ["ka", "ri", "na", "min", "ji", "ha", "ni", "da", "el", "hye", "in", "seo", "yu", "jin", "soo",
+          "yeon", "chae", "won", "young", "bin", "hyun", "woo", "sung", "mi", "ra", "eun", "bi", "ye", "so"]
+# Hangul syllables roughly matching _ROMAN, so names read consistently in both scripts
+_HANGUL = ["카", "리", "나", "민", "지", "하", "니", "다", "엘", "혜", "인", "서", "유", "진", "수",
+           "연", "채", "원", "영", "빈", "현", "우", "성", "미", "라", "은", "비", "예", "소"]
+_ALBUM_WORDS = ["Love", "Dream", "Summer", "Night", "Eleven", "Fever", "Savage", "Ready", "Blue",
+                "Golden", "Hour", "Flower", "Crush", "Drama", "Armageddon", "Whiplash", "Supernova",
+                "Teen", "Spirit", "Moon", "Light", "Wave", "Bloom", "Echo", "Starlight"]
+_KOREAN_ALBUMS = ["사랑", "여름밤", "꽃길", "별빛", "파도", "첫눈", "꿈결", "노을", "봄날", "하루"]
+_COMPANIES = ["SM", "JYP", "YG", "HYBE", "ADOR", "Starship", "Cube", "Pledis", "Woollim", "RBW"]
+_VERSIONS = ["Version A", "Version B", "Digipack", "Photobook", "Jewel", "Platform", "Weverse", "Kit"]
+_TYPES = ["album", "album", "album", "album", "pob", "fansign", "special"]
+
+
+def _name(rng: random.Random, syllables: int) -> tuple[str, str]:
+    picks = [rng.randrange(len(_ROMAN)) for _ in range(syllables)]
+    roman = "".join(_ROMAN[i] for i in picks).capitalize()
+    hangul = "".join(_HANGUL[i] for i in picks)
+    return roman, hangul
+
+
+def _unique_id(base: str, used: set[str]) -> str:
+    candidate, n = base, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{base}{n}"
+    used.add(candidate)
+    return candidate
+
+
+def generate_catalog(photocards: int, seed: int = 42, groups: int | None = None) -> dict:
+    """Return {"groups": [...], "photocards": [...]} with the given number of photocards."""
+    rng = random.Random(seed)
+    n_groups = groups or max(4, min(2000, photocards // 250))
+    group_ids: set[str] = set()
+    member_ids: set[str] = set()
+    out_groups = []
+    albums_by_group = []
+    for _ in range(n_groups):
+        name, korean = _name(rng, rng.randint(2, 3))
+        gid = _unique_id(name.lower(), group_ids)
+        members = []
+        for _ in range(rng.randint(4, 9)):
+            m_name, m_korean = _name(rng, rng.randint(2, 3))
+            members.append({
+                "id": _unique_id(m_name.lower(), member_ids),
+                "name": m_name,
+                "koreanName": m_korean,
+                "imageUrl": f"https://picsum.photos/seed/{gid}-{m_name.lower()}/300/300",
+            })
+        debut = rng.randint(2010, 2024)
+        out_groups.append({
+            "id": gid,
+            "name": name,
+            "koreanName": korean,
+            "company": rng.choice(_COMPANIES),
+            "debutYear": debut,
+            "imageUrl": f"https://picsum.photos/seed/{gid}/400/400",
+            "members": members,
+        })
+        albums = []
+        for _ in range(rng.randint(3, 12)):
+            if rng.random() < 0.2:
+                title = rng.choice(_KOREAN_ALBUMS) + rng.choice(["", " 2", " (Repackage)"])
+            else:
+                title = " ".join(rng.sample(_ALBUM_WORDS, rng.randint(1, 2)))
+            albums.append((title, rng.randint(debut, 2025)))
+        albums_by_group.append(albums)
+
+    # Zipf-like popularity: group i gets weight 1 / (i + 1)
+    weights = [1 / (i + 1) for i in range(n_groups)]
+    order = list(range(n_groups))
+    rng.shuffle(order)
+    picks = rng.choices(order, weights=weights, k=photocards)
+    out_cards = []
+    for i, gi in enumerate(picks):
+        g = out_groups[gi]
+        m = rng.choice(g["members"])
+        album, year = rng.choice(albums_by_group[gi])
+        out_cards.append({
+            "id": f"pc-{i:07d}",
+            "memberId": m["id"],
+            "memberName": m["name"],
+            "groupId": g["id"],
+            "groupName": g["name"],
+            "album": album,
+            "version": rng.choice(_VERSIONS),
+            "year": year,
+            "type": rng.choice(_TYPES),
+            "imageUrl": f"https://picsum.photos/seed/pc{i}/300/400",
+        })
+    return {"groups": out_groups, "photocards": out_cards}
+
+
+def write_catalog(path: Path, photocards: int, seed: int = 42) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_catalog(photocards, seed), f, ensure_ascii=False)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic data.json")
+    parser.add_argument("photocards", type=int, help="Number of photocards (e.g. 1000 - 1000000)")
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    write_catalog(args.output, args.photocards, args.seed)
+    print(f"Wrote {args.photocards} photocards to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
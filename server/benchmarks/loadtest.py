@@ -0,0 +1,328 @@
+"""
+End-to-end load test: drives the API with a realistic traffic mix and reports per-route latency.
+
+Transports:
+- asgi: create_app() in this process through httpx.ASGITransport (no sockets; measures the app,
+  middleware, auth and data access)
+- uvicorn: a uvicorn subprocess on a local port (adds HTTP parsing and the socket)
+- serve: the pre-fork launcher (python -m app.serve) with --workers
+- url: an already running server (--url)
+
+    python -m benchmarks.loadtest --transport asgi --concurrency 32 --duration 10
+    python -m benchmarks.loadtest --transport serve --workers 4 --catalog-size 100000 --output load.json
+
+The rate limiter is off unless --rate-limit N is given; --clients spreads requests over that many
+X-Forwarded-For addresses so a limit behaves as it would with many users. Authenticated routes use
+HS256 tokens signed with a local secret (SUPABASE_JWT_SECRET is set for the server under test).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import jwt
+
+from benchmarks.generate import generate_catalog
+
+_SERVER_DIR = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+
+# route label -> weight (share of requests)
+DEFAULT_MIX: Dict[str, int] = {
+    "GET /groups": 10,
+    "GET /groups/{group_id}": 10,
+    "GET /photocards/by-group/{group_id}": 15,
+    "GET /groups/{group_id}/members/{member_id}": 8,
+    "GET /groups/{group_id}/members/{member_id}/photocards": 8,
+    "GET /search": 20,
+    "GET /search (page 2+)": 10,
+    "GET /search/suggest": 12,
+    "GET /submissions (auth)": 4,
+    "POST /photocards (auth)": 3,
+}
+
+Request = Tuple[str, str, str, dict]  # label, method, url, httpx kwargs
+
+
+class TrafficMix:
+    """Builds requests for each route label from the catalog being served."""
+
+    def __init__(self, catalog: dict, secret: str, rng: random.Random) -> None:
+        self.rng = rng
+        self.groups = catalog["groups"]
+        self.albums = sorted({p["album"] for p in catalog["photocards"]})
+        words = {w.lower() for g in self.groups for w in (g["name"], g["koreanName"])}
+        words.update(m["name"].lower() for g in self.groups for m in g["members"])
+        self.terms = sorted(words | {a.split()[0].lower() for a in self.albums})
+        self.tokens = [
+            jwt.encode(
+                {"sub": f"user-{i}", "email": f"load{i}@example.com", "aud": "authenticated",
+                 "role": "authenticated", "exp": int(time.time()) + 86400},
+                secret,
+                algorithm="HS256",
+            )
+            for i in range(20)
+        ]
+
+    def _group(self) -> dict:
+        # Popular groups first in the generated catalog order get more traffic
+        return self.groups[min(int(self.rng.expovariate(1 / 5)), len(self.groups) - 1)]
+
+    def _query(self) -> str:
+        term = self.rng.choice(self.terms)
+        return term[: self.rng.randint(2, max(2, len(term)))]
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def build(self, label: str) -> Request:
+        g = self._group()
+        m = self.rng.choice(g["members"])
+        if label == "GET /groups":
+            return label, "GET", f"{API}/groups", {}
+        if label == "GET /groups/{group_id}":
+            return label, "GET", f"{API}/groups/{g['id']}", {}
+        if label == "GET /photocards/by-group/{group_id}":
+            params = {"limit": 40, "offset": 40 * self.rng.randint(0, 3)}
+            return label, "GET", f"{API}/photocards/by-group/{g['id']}", {"params": params}
+        if label == "GET /groups/{group_id}/members/{member_id}":
+            return label, "GET", f"{API}/groups/{g['id']}/members/{m['id']}", {}
+        if label == "GET /groups/{group_id}/members/{member_id}/photocards":
+            return label, "GET", f"{API}/groups/{g['id']}/members/{m['id']}/photocards", {}
+        if label == "GET /search":
+            return label, "GET", f"{API}/search", {"params": {"q": self._query(), "pc_limit": 40}}
+        if label == "GET /search (page 2+)":
+            params = {"q": self._query(), "pc_limit": 40, "pc_offset": 40 * self.rng.randint(1, 5)}
+            return label, "GET", f"{API}/search", {"params": params}
+        if label == "GET /search/suggest":
+            return label, "GET", f"{API}/search/suggest", {"params": {"q": self._query()[:3]}}
+        if label == "GET /submissions (auth)":
+            return label, "GET", f"{API}/submissions", {"headers": self._auth()}
+        if label == "POST /photocards (auth)":
+            body = {
+                "memberName": m["name"], "groupName": g["name"], "album": self.rng.choice(self.albums),
+                "version": "Version A", "year": 2024, "type": "album",
+                "imageUrl": f"https://example.com/{secrets.token_hex(6)}.jpg",
+            }
+            return label, "POST", f"{API}/photocards", {"headers": self._auth(), "json": body}
+        raise ValueError(f"Unknown route label {label!r}")
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))]
+
+
+def summarize(samples: Dict[str, List[Tuple[float, int]]], elapsed: float) -> dict:
+    routes = {}
+    total = 0
+    for label, values in sorted(samples.items()):
+        latencies = sorted(v[0] for v in values)
+        statuses: Dict[str, int] = {}
+        for _, status in values:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        total += len(values)
+        routes[label] = {
+            "requests": len(values),
+            "rps": round(len(values) / elapsed, 1),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+            "p90_ms": round(_percentile(latencies, 90) * 1000, 3),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+            "status": statuses,
+        }
+    return {"elapsed_s": round(elapsed, 2), "requests": total, "rps": round(total / elapsed, 1), "routes": routes}
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: TrafficMix,
+    weights: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+    clients: int,
+) -> dict:
+    labels = list(weights)
+    weights_list = [weights[label] for label in labels]
+    samples: Dict[str, List[Tuple[float, int]]] = {label: [] for label in labels}
+    sent = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal sent
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            label, method, url, kwargs = mix.build(mix.rng.choices(labels, weights_list)[0])
+            if clients:
+                n = mix.rng.randrange(clients)
+                ip = {"X-Forwarded-For": f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}"}
+                kwargs = {**kwargs, "headers": {**kwargs.get("headers", {}), **ip}}
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                await response.aread()
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples[label].append((time.perf_counter() - start, status))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize({k: v for k, v in samples.items() if v}, time.perf_counter() - start)
+
+
+def _server_env(args: argparse.Namespace, data_path: Path, secret: str) -> Dict[str, str]:
+    return {
+        "CATALOG_DATA_PATH": str(data_path),
+        "CATALOG_SNAPSHOT_PATH": "",
+        "SUPABASE_JWT_SECRET": secret,
+        "RATE_LIMIT_REQUESTS": str(args.rate_limit),
+        "DEBUG": "false",
+        "ENVIRONMENT": "development",
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@asynccontextmanager
+async def _asgi_client(env: Dict[str, str]) -> AsyncIterator[httpx.AsyncClient]:
+    os.environ.update(env)
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+    from app.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            yield client
+
+
+@asynccontextmanager
+async def _subprocess_client(cmd: List[str], env: Dict[str, str], port: int, limit: int) -> AsyncIterator[httpx.AsyncClient]:
+    proc = subprocess.Popen(cmd, cwd=_SERVER_DIR, env={**os.environ, **env}, stdout=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+    try:
+        async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get(f"{API}/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Server exited with {proc.returncode}")
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("Server did not become healthy")
+            yield client
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _parse_mix(spec: Optional[str]) -> Dict[str, int]:
+    if not spec:
+        return dict(DEFAULT_MIX)
+    weights = {}
+    for part in spec.split(","):
+        label, _, weight = part.rpartition("=")
+        if label not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown route label {label!r}; choose from: {', '.join(DEFAULT_MIX)}")
+        weights[label] = int(weight)
+    return weights
+
+
+async def _main_async(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    secret = args.jwt_secret or secrets.token_hex(32)
+    with tempfile.TemporaryDirectory(prefix="katalog-load-") as tmp:
+        catalog = generate_catalog(args.catalog_size, args.seed)
+        data_path = Path(tmp) / "data.json"
+        data_path.write_text(json.dumps(catalog, ensure_ascii=False), encoding="utf-8")
+        env = _server_env(args, data_path, secret)
+        mix = TrafficMix(catalog, secret, rng)
+        if args.transport == "asgi":
+            client_cm: Callable = lambda: _asgi_client(env)
+        elif args.transport == "url":
+            client_cm = lambda: httpx.AsyncClient(base_url=args.url, timeout=30)
+        else:
+            port = _free_port()
+            if args.transport == "uvicorn":
+                cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+            else:
+                cmd = [sys.executable, "-m", "app.serve", "--port", str(port), "--workers", str(args.workers)]
+            client_cm = lambda: _subprocess_client(cmd, env, port, args.concurrency)
+        async with client_cm() as client:
+            report = await run_load(
+                client, mix, _parse_mix(args.mix), args.concurrency, args.duration, args.requests, args.clients
+            )
+    report["config"] = {
+        "transport": args.transport,
+        "concurrency": args.concurrency,
+        "catalog_size": args.catalog_size,
+        "rate_limit": args.rate_limit,
+        "workers": args.workers if args.transport == "serve" else None,
+    }
+    return report
+
+
+def _print(report: dict) -> None:
+    print(f"{report['requests']} requests in {report['elapsed_s']} s = {report['rps']} req/s")
+    print(f"{'route':55} {'n':>7} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}  status")
+    for label, r in report["routes"].items():
+        status = " ".join(f"{k}:{v}" for k, v in sorted(r["status"].items()))
+        print(f"{label:55} {r['requests']:>7} {r['rps']:>8} {r['p50_ms']:>9} {r['p90_ms']:>9} {r['p99_ms']:>9}  {status}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the Katalog API")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn", "serve", "url"], default="asgi")
+    parser.add_argument("--url", help="Base URL for --transport url")
+    parser.add_argument("--workers", type=int, default=2, help="Workers for --transport serve")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--catalog-size", type=int, default=10_000, help="Synthetic photocards to serve")
+    parser.add_argument("--rate-limit", type=int, default=0, help="RATE_LIMIT_REQUESTS for the server (0 = off)")
+    parser.add_argument("--clients", type=int, default=0, help="Spread requests over N client IPs")
+    parser.add_argument("--mix", help='Route weights, e.g. "GET /search=5,GET /groups=1"')
+    parser.add_argument("--jwt-secret", help="HS256 secret (default: random; must match the server for --url)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.transport == "url" and not args.url:
+        parser.error("--transport url needs --url")
+    report = asyncio.run(_main_async(args))
+    _print(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
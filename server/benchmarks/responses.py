@@ -0,0 +1,140 @@
+"""
+Response serialization benchmark for GET /photocards and /search/all.
+
+For the payload of each route (synthetic catalog, benchmarks/generate.py) times three ways to turn
+the route's models into a JSON body:
+
+- fastapi_jsonable: validate against response_model, dump to dicts, json.dumps (FastAPI's generic path:
+  older releases, or any route with a custom response_class)
+- fastapi_dump_json: validate, then Pydantic dump_json (FastAPI's fast path on recent releases)
+- model_json_response: ModelJSONResponse (app/core/responses.py), serialize only
+
+then the whole request through the ASGI app (httpx, in process). CPU time per call (process_time):
+
+    python -m benchmarks.responses --size 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.generate import write_catalog
+from benchmarks.run import _summary
+
+_MIN_SECONDS = 1.0
+
+
+def _time_cpu(fn: Callable[[], object]) -> dict:
+    fn()  # warm-up
+    samples: List[float] = []
+    deadline = time.perf_counter() + _MIN_SECONDS
+    while len(samples) < 5 or time.perf_counter() < deadline:
+        start = time.process_time()
+        fn()
+        samples.append(time.process_time() - start)
+    return _summary(samples)
+
+
+async def _time_cpu_async(fn) -> dict:
+    await fn()
+    samples: List[float] = []
+    deadline = time.perf_counter() + _MIN_SECONDS
+    while len(samples) < 5 or time.perf_counter() < deadline:
+        start = time.process_time()
+        await fn()
+        samples.append(time.process_time() - start)
+    return _summary(samples)
+
+
+def _serializers(model, content) -> dict:
+    from pydantic import TypeAdapter
+
+    from app.core.responses import ModelJSONResponse
+
+    adapter = TypeAdapter(model)
+
+    def fastapi_jsonable() -> bytes:
+        value = adapter.validate_python(content, from_attributes=True)
+        return json.dumps(adapter.dump_python(value, mode="json", by_alias=True), ensure_ascii=False).encode()
+
+    def fastapi_dump_json() -> bytes:
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+    def model_json_response() -> bytes:
+        return ModelJSONResponse(content, model=model).body
+
+    return {
+        "fastapi_jsonable": fastapi_jsonable,
+        "fastapi_dump_json": fastapi_dump_json,
+        "model_json_response": model_json_response,
+    }
+
+
+async def _bench(size: int, workdir: Path) -> List[dict]:
+    os.environ["CATALOG_DATA_PATH"] = str(write_catalog(workdir / f"catalog-{size}.json", size))
+    os.environ["CATALOG_SNAPSHOT_PATH"] = ""
+    os.environ["MONGODB_URI"] = ""
+    os.environ["RATE_LIMIT_REQUESTS"] = "0"
+    os.environ["IMAGE_META_WORKERS"] = "0"
+    import httpx
+
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+    from app.main import create_app
+    from app.schemas.photocard import PhotocardSchema
+    from app.schemas.search import SearchResultSchema
+    from app.services import data_loader as dl
+
+    dl.load_data()
+    search = await dl.search_catalog_async("", pc_limit=40, pc_offset=0)
+    payloads = {
+        "/photocards": (list[PhotocardSchema], dl.get_photocards()),
+        "/search/all": (
+            SearchResultSchema,
+            SearchResultSchema.model_construct(
+                groups=search["groups"],
+                members=search["members"],
+                photocards=search["photocards"],
+                total_photocards=search["total_photocards"],
+            ),
+        ),
+    }
+    results = []
+
+    def record(route: str, case: str, stats: dict) -> None:
+        results.append({"size": size, "route": route, "case": case, **stats})
+        print(f"  {route:12} {case:22} cpu p50 {stats['p50_us'] / 1000:10.2f} ms  p95 {stats['p95_us'] / 1000:10.2f} ms")
+
+    for route, (model, content) in payloads.items():
+        for case, fn in _serializers(model, content).items():
+            record(route, case, _time_cpu(fn))
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route in payloads:
+            record(route, "asgi_request", await _time_cpu_async(lambda: client.get(f"/api/v1{route}")))
+    dl._catalog = None
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--size", type=int, default=20_000, help="Synthetic photocards")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+    import logging
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(_bench(args.size, Path(tmp)))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+data_loader benchmarks against the in-memory store and (optionally) MongoDB.
+
+For each catalog size a synthetic data.json is generated (benchmarks/generate.py) and every case is
+timed; results are written as JSON and checked against regression thresholds:
+
+    python -m benchmarks.run --sizes 1000,10000,100000 --output bench.json
+    python -m benchmarks.run --sizes 10000 --baseline bench.json          # fail on >25% p50 regression
+    MONGODB_URI=mongodb://localhost:27017 python -m benchmarks.run --mongodb --sizes 10000
+
+MongoDB runs use a throwaway database (katalog_bench_<pid>) that is dropped afterwards.
+Exit status is 1 when a threshold or baseline check fails.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from benchmarks.generate import write_catalog
+
+_DIR = Path(__file__).resolve().parent
+DEFAULT_THRESHOLDS = _DIR / "thresholds.json"
+_MIN_SECONDS = 0.3
+_MAX_ITERATIONS = 2000
+_MONGODB_URI = os.environ.get("MONGODB_URI", "")
+
+
+def _configure(data_path: Path, snapshot_path: Path, mongodb: bool, db_name: str) -> None:
+    """Point settings at the generated catalog (settings are cached, so clear the cache)."""
+    os.environ["CATALOG_DATA_PATH"] = str(data_path)
+    os.environ["CATALOG_SNAPSHOT_PATH"] = str(snapshot_path)
+    os.environ["MONGODB_DATABASE_NAME"] = db_name
+    os.environ["MONGODB_COMMAND_MONITORING"] = "false"
+    os.environ["MONGODB_URI"] = _MONGODB_URI if mongodb else ""
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+
+
+def _summary(samples: List[float]) -> dict:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * (len(samples) - 1) + 0.5))]
+    return {
+        "iterations": len(samples),
+        "min_us": round(samples[0] * 1e6, 1),
+        "p50_us": round(statistics.median(samples) * 1e6, 1),
+        "p95_us": round(p95 * 1e6, 1),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+    }
+
+
+async def _time_async(fn: Callable[[], Awaitable[object]], max_iterations: int = _MAX_ITERATIONS) -> dict:
+    await fn()  # warm-up
+    samples: List[float] = []
+    deadline = time.perf_counter() + _MIN_SECONDS
+    while len(samples) < max_iterations and (len(samples) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def _time_sync(fn: Callable[[], object], repeats: int) -> dict:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+async def _seed_mongodb(raw: dict) -> None:
+    """Bulk-load the generated catalog the way seed_mongodb_if_empty lays it out (groupId = ObjectId)."""
+    from bson import ObjectId
+
+    from app.core.db import GROUPS_COLLECTION, PHOTOCARDS_COLLECTION, get_database
+    from app.schemas.photocard import PhotocardSchema
+    from app.services.data_loader import _group_from_raw
+
+    db = get_database()
+    groups = [_group_from_raw(g).model_dump(by_alias=True) for g in raw["groups"]]
+    result = await db[GROUPS_COLLECTION].insert_many(groups)
+    ids = {g["id"]: oid for g, oid in zip(groups, result.inserted_ids)}
+    batch = []
+    for p in raw["photocards"]:
+        doc = PhotocardSchema.model_validate(p).model_dump(by_alias=True, exclude={"thumbnail_url"})
+        doc["groupId"] = ObjectId(ids[doc["groupId"]]) if doc["groupId"] in ids else doc["groupId"]
+        batch.append(doc)
+        if len(batch) == 5000:
+            await db[PHOTOCARDS_COLLECTION].insert_many(batch)
+            batch = []
+    if batch:
+        await db[PHOTOCARDS_COLLECTION].insert_many(batch)
+
+
+async def _bench_size(size: int, mongodb: bool, workdir: Path, seed: int) -> List[dict]:
+    from app.services import data_loader as dl
+
+    backend = "mongodb" if mongodb else "memory"
+    data_path = write_catalog(workdir / f"catalog-{size}.json", size, seed)
+    snapshot_path = workdir / f"catalog-{size}.snapshot"
+    _configure(data_path, snapshot_path, mongodb, f"katalog_bench_{os.getpid()}")
+    raw = json.loads(data_path.read_text(encoding="utf-8"))
+    results: List[dict] = []
+
+    def record(case: str, stats: dict) -> None:
+        results.append({"backend": backend, "size": size, "case": case, **stats})
+        print(f"  {backend:8} {size:>8} {case:28} p50 {stats['p50_us']:>12.1f} us  p95 {stats['p95_us']:>12.1f} us")
+
+    if mongodb:
+        from app.core.db import close_mongodb, connect_mongodb, get_database
+
+        await connect_mongodb()
+        try:
+            await _seed_mongodb(raw)
+            record("load_catalog_from_mongodb", _summary([await _timed(dl.load_catalog_from_mongodb)]))
+            await _run_read_cases(dl, record)
+            email = "bench@example.com"
+            # Distinct image per call so each is a new submission, not a duplicate of the first
+            n = itertools.count()
+            record("insert_submission_async", await _time_async(lambda: dl.insert_submission_async(
+                "Bench", raw["groups"][0]["name"], "Bench Album", "Version A", 2024, "album",
+                f"https://example.com/x-{next(n)}.jpg", email, None, status="pending",
+            ), max_iterations=200))
+        finally:
+            await get_database().client.drop_database(get_database().name)
+            await close_mongodb()
+            dl._catalog = None
+    else:
+        snapshot_path.unlink(missing_ok=True)
+        repeats = 3 if size >= 100_000 else 5
+        record("load_data_json", _time_sync(dl.load_data, repeats))
+        dl.build_catalog_snapshot()
+        record("load_data_snapshot", _time_sync(dl.load_data, repeats))
+        await _run_read_cases(dl, record)
+        # No insert_submission_async row: submissions need MongoDB
+        dl._catalog = None
+    return results
+
+
+async def _timed(fn: Callable[[], Awaitable[object]]) -> float:
+    start = time.perf_counter()
+    await fn()
+    return time.perf_counter() - start
+
+
+async def _run_read_cases(dl, record: Callable[[str, dict], None]) -> None:
+    groups = await dl.get_groups_async()
+    rng = random.Random(0)
+    ids = [g.id for g in groups]
+    record("get_group_by_id_async", await _time_async(lambda: dl.get_group_by_id_async(rng.choice(ids))))
+
+    catalog = dl._current_catalog()
+    biggest = max(ids, key=lambda gid: len(catalog.group_photocards.get(gid, ())))
+    total = len(catalog.group_photocards.get(biggest, ()))
+    record("by_group_paginated_first", await _time_async(
+        lambda: dl.get_photocards_by_group_paginated_async(biggest, limit=40, offset=0)))
+    record("by_group_paginated_deep", await _time_async(
+        lambda: dl.get_photocards_by_group_paginated_async(biggest, limit=40, offset=max(0, total - 40))))
+
+    hit = groups[0].name[:3].lower()
+
+    async def uncached(q: str) -> dict:
+        dl._search_cache.clear()
+        return await dl.search_catalog_async(q, pc_limit=40)
+
+    record("search_hit", await _time_async(lambda: uncached(hit)))
+    record("search_hit_cached_page", await _time_async(
+        lambda: dl.search_catalog_async(hit, pc_limit=40, pc_offset=40)))
+    record("search_hangul", await _time_async(lambda: uncached(groups[0].korean_name[:1])))
+    record("search_miss", await _time_async(lambda: uncached("zzqxv")))
+    record("search_fuzzy", await _time_async(lambda: _fuzzy(dl, groups[0].name.lower()[:-1] + "x")))
+    record("search_empty", await _time_async(lambda: uncached("")))
+
+
+async def _fuzzy(dl, q: str) -> dict:
+    dl._search_cache.clear()
+    return await dl.search_catalog_async(q, pc_limit=40, fuzzy=True)
+
+
+def check(results: List[dict], thresholds: dict, baseline: Optional[List[dict]], max_regression: float) -> List[str]:
+    """Return failure messages for p50 limits (thresholds.json) and regressions against a baseline run."""
+    failures = []
+    limits = thresholds.get("p50_us_max", {})
+    for r in results:
+        limit = limits.get(f"{r['backend']}/{r['case']}/{r['size']}")
+        if limit is not None and r["p50_us"] > limit:
+            failures.append(f"{r['backend']}/{r['case']}/{r['size']}: p50 {r['p50_us']} us > limit {limit} us")
+    if baseline:
+        base = {(b["backend"], b["case"], b["size"]): b for b in baseline}
+        for r in results:
+            b = base.get((r["backend"], r["case"], r["size"]))
+            if b is None or not b["p50_us"]:
+                continue
+            ratio = r["p50_us"] / b["p50_us"] - 1
+            if ratio > max_regression:
+                failures.append(
+                    f"{r['backend']}/{r['case']}/{r['size']}: p50 {b['p50_us']} -> {r['p50_us']} us "
+                    f"(+{ratio:.0%} > {max_regression:.0%})"
+                )
+    return failures
+
+
+async def _main_async(args: argparse.Namespace) -> int:
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results: List[dict] = []
+    with tempfile.TemporaryDirectory(prefix="katalog-bench-") as tmp:
+        for size in sizes:
+            print(f"catalog size {size}")
+            results.extend(await _bench_size(size, False, Path(tmp), args.seed))
+            if args.mongodb:
+                results.extend(await _bench_size(size, True, Path(tmp), args.seed))
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.output}")
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds and args.thresholds.exists() else {}
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else None
+    max_regression = args.max_regression if args.max_regression is not None else thresholds.get("max_regression", 0.25)
+    failures = check(results, thresholds, baseline, max_regression)
+    for f in failures:
+        print(f"FAIL {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark data_loader")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated photocard counts")
+    parser.add_argument("--mongodb", action="store_true", help="Also run against MONGODB_URI")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--baseline", type=Path, help="Previous results JSON to compare p50s against")
+    parser.add_argument("--max-regression", type=float, help="Allowed p50 slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.mongodb and not os.environ.get("MONGODB_URI"):
+        parser.error("--mongodb needs MONGODB_URI")
+    sys.exit(asyncio.run(_main_async(args)))
+
+
+if __name__ == "__main__":
+    main()